@@ -1,6 +1,6 @@
 import { NextRequest, NextResponse } from "next/server";
 
-import { getBackendUrl, getForwardHeaders } from "@/lib/config";
+import { getBackendUrl, getCacheHeaders, getForwardHeaders } from "@/lib/config";
 
 const PYTHON_API_URL = getBackendUrl();
 
@@ -23,6 +23,11 @@ export async function POST(request: NextRequest) {
 
         console.log(`[Proxy] Response status: ${response.status}`);
 
+        // Client already holds this chart (If-None-Match matched the ETag)
+        if (response.status === 304) {
+            return new NextResponse(null, { status: 304, headers: getCacheHeaders(response) });
+        }
+
         if (!response.ok) {
             // Handle redirects explicitly
             if (response.status >= 300 && response.status < 400) {
@@ -43,7 +48,7 @@ export async function POST(request: NextRequest) {
 
         const data = await response.json();
 
-        return NextResponse.json(data);
+        return NextResponse.json(data, { headers: getCacheHeaders(response) });
     } catch (error) {
         console.error("Chart API error:", error);
         return NextResponse.json(
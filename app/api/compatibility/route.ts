@@ -1,6 +1,6 @@
 import { NextRequest, NextResponse } from 'next/server';
 
-import { getBackendUrl, getForwardHeaders } from "@/lib/config";
+import { getBackendUrl, getCacheHeaders, getForwardHeaders } from "@/lib/config";
 
 const PYTHON_API_URL = getBackendUrl();
 
@@ -23,6 +23,11 @@ export async function POST(req: NextRequest) {
             body: JSON.stringify(body),
         });
 
+        // Client already holds this result (If-None-Match matched the ETag)
+        if (response.status === 304) {
+            return new NextResponse(null, { status: 304, headers: getCacheHeaders(response) });
+        }
+
         if (!response.ok) {
             const errorData = await response.json().catch(() => ({}));
             return NextResponse.json(
@@ -32,7 +37,7 @@ export async function POST(req: NextRequest) {
         }
 
         const result = await response.json();
-        return NextResponse.json(result);
+        return NextResponse.json(result, { headers: getCacheHeaders(response) });
 
     } catch (error) {
         console.error('Compatibility API error:', error);
@@ -0,0 +1,71 @@
+"""
+Benchmark: single-chart path vs batch chart engine
+Run from the repo root: python -m backend.bench_chart [N]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.schemas import BirthInput
+from backend.chart import _to_utc_dt, calculate_vedic_chart, calculate_vedic_charts
+
+TIMEZONES = ["Asia/Kolkata", "Asia/Kathmandu", "Europe/London", "America/New_York"]
+
+
+def random_births(n: int, seed: int = 42):
+    """n random births; local times skipped or repeated by a DST change are redrawn."""
+    rng = random.Random(seed)
+    births = []
+    while len(births) < n:
+        b = BirthInput(
+            date=f"{rng.randint(1930, 2020)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            time=f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            tz=rng.choice(TIMEZONES),
+            lat=round(rng.uniform(-45.0, 60.0), 4),
+            lon=round(rng.uniform(-120.0, 150.0), 4),
+            name=f"bench-{len(births)}",
+        )
+        try:
+            _to_utc_dt(b)
+        except ValueError:
+            continue
+        births.append(b)
+    return births
+
+
+def main(n: int = 5000):
+    births = random_births(n)
+
+    t0 = time.perf_counter()
+    for b in births:
+        calculate_vedic_chart(b)
+    single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = calculate_vedic_charts(births)
+    columnar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in batch.charts():
+        pass
+    materialize = time.perf_counter() - t0
+
+    # fast mode: ephemeris table + vectorized Ascendant (falls back to swe without the table)
+    t0 = time.perf_counter()
+    calculate_vedic_charts(births, use_table=True)
+    fast = time.perf_counter() - t0
+
+    print(f"\n=== CHART ENGINE BENCHMARK (n={n}) ===\n")
+    print(f"single  calculate_vedic_chart : {single / n * 1e6:8.1f} us/chart  ({single:.2f}s)")
+    print(f"batch   columnar arrays       : {columnar / n * 1e6:8.1f} us/chart  ({columnar:.2f}s)")
+    print(f"batch   + VedicChart objects  : {(columnar + materialize) / n * 1e6:8.1f} us/chart")
+    print(f"batch   use_table fast mode   : {fast / n * 1e6:8.1f} us/chart  ({fast:.2f}s)")
+    print(f"speedup (columnar)            : {single / columnar:8.2f}x")
+    print(f"speedup (fast mode)           : {single / fast:8.2f}x\n")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
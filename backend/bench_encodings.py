@@ -0,0 +1,93 @@
+"""
+Benchmark: response encodings for /chart and /compatibility bodies
+Payload size (raw and gzipped) and encode/decode time for the JSON path
+FastAPI used before (jsonable_encoder + JSONResponse), the direct JSON path,
+MessagePack, and the columnar chart layout of each (the to_dict serializers
+that build these bodies are benchmarked in bench_serialize).
+Run from the repo root: python -m backend.bench_encodings [N]
+"""
+import gc
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from backend.bench_chart import random_births
+from backend.chart import calculate_vedic_chart
+from backend.encoding import MSGPACK_ENABLED, Representation, msgpack
+from backend.scoring import score_pair
+from backend.vargas import COMPATIBILITY_VARGAS, DEFAULT_VARGAS, chart_vargas
+
+
+def _chart_body(chart, vargas):
+    body = chart.to_dict()
+    body["vargas"] = chart_vargas(chart, vargas)
+    return body
+
+
+def _bodies(n: int):
+    charts = [calculate_vedic_chart(b) for b in random_births(2 * n)]
+    chart_bodies = [_chart_body(c, DEFAULT_VARGAS) for c in charts[:n]]
+    compat_bodies = []
+    for a, b in zip(charts[:n], charts[n:]):
+        scores = score_pair(a, b)
+        compat_bodies.append({
+            "charts": {"partnerA": _chart_body(a, COMPATIBILITY_VARGAS), "partnerB": _chart_body(b, COMPATIBILITY_VARGAS)},
+            "compatibility": scores.compatibility.to_dict(),
+            "guna": scores.guna.to_dict(),
+        })
+    return chart_bodies, compat_bodies
+
+
+def _time(fn, items):
+    # Cyclic GC over the large live corpus would dominate otherwise
+    gc.collect()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        out = [fn(x) for x in items]
+        return out, (time.perf_counter() - t0) / len(items) * 1e6
+    finally:
+        gc.enable()
+
+
+def _report(label: str, bodies):
+    encodings = [("json (FastAPI default)", lambda b: JSONResponse(jsonable_encoder(b)).body, json.loads)]
+    for columnar in (False, True):
+        layout = " columnar" if columnar else ""
+        rep = Representation(columnar=columnar)
+        encodings.append((f"json{layout}", rep.encode, json.loads))
+        if MSGPACK_ENABLED:
+            rep = Representation(use_msgpack=True, columnar=columnar)
+            encodings.append((f"msgpack{layout}", rep.encode, msgpack.unpackb))
+
+    print(f"\n{label} (n={len(bodies)})")
+    print(f"  {'encoding':24s} {'bytes':>8s} {'gzip':>8s} {'encode us':>10s} {'decode us':>10s}")
+    base = None
+    for name, encode, decode in encodings:
+        payloads, enc_us = _time(encode, bodies)
+        _, dec_us = _time(decode, payloads)
+        size = sum(len(p) for p in payloads) / len(payloads)
+        gz = sum(len(gzip.compress(p, 6)) for p in payloads[:200]) / min(len(payloads), 200)
+        base = base or size
+        print(f"  {name:24s} {size:8.0f} {gz:8.0f} {enc_us:10.1f} {dec_us:10.1f}   ({size / base:.0%} of JSON)")
+
+
+def main(n: int = 2000):
+    chart_bodies, compat_bodies = _bodies(n)
+    print("\n=== SERIALIZATION BENCHMARK ===")
+    if not MSGPACK_ENABLED:
+        print("(msgpack not installed: MessagePack rows skipped)")
+    _report("/chart body", chart_bodies)
+    _report("/compatibility body", compat_bodies)
+    print()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
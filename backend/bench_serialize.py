@@ -0,0 +1,79 @@
+"""
+Benchmark: hand-written to_dict() serializers vs the dataclasses.asdict path
+Checks both produce the same JSON, then times them.
+Run from the repo root: python -m backend.bench_serialize [N]
+"""
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.bench_chart import random_births
+from backend.chart import calculate_vedic_charts
+from backend.guna import calculate_guna_milan
+from backend.match import compatibility_indicators
+
+
+def legacy_chart_dict(chart):
+    """VedicChart.to_dict() as it was built on asdict()."""
+    return {
+        "name": chart.name,
+        "utc_time": chart.utc_time,
+        "ayanamsa": {
+            "type": chart.ayanamsa_type,
+            "value_deg": chart.ayanamsa_value_deg,
+        },
+        "house_system": chart.house_system,
+        "ascendant": asdict(chart.ascendant),
+        "moon": {
+            "nakshatra": chart.moon_nakshatra,
+            "pada": chart.moon_pada,
+        },
+        "planets": [asdict(p) for p in chart.planets],
+        "dasha": chart.dasha.to_dict(),
+    }
+
+
+def _timed(fn, items):
+    t0 = time.perf_counter()
+    for item in items:
+        fn(item)
+    return time.perf_counter() - t0
+
+
+def main(n: int = 5000):
+    charts = list(calculate_vedic_charts(random_births(n)).charts())
+    pairs = list(zip(charts[::2], charts[1::2]))
+    compat = [compatibility_indicators(a, b) for a, b in pairs]
+    guna = [calculate_guna_milan(a, b) for a, b in pairs]
+    for c in charts:
+        c.dasha  # warm the memoized timelines so both paths time only serialization
+
+    for objs, new, old in (
+        (charts, lambda c: c.to_dict(), legacy_chart_dict),
+        (compat, lambda r: r.to_dict(), asdict),
+        (guna, lambda r: r.to_dict(), asdict),
+    ):
+        for obj in objs:
+            assert json.dumps(new(obj)) == json.dumps(old(obj)), "serializers disagree"
+
+    print(f"\n=== SERIALIZATION BENCHMARK (n={n} charts, {len(pairs)} pairs) ===\n")
+    for label, objs, new, old in (
+        ("VedicChart         ", charts, lambda c: c.to_dict(), legacy_chart_dict),
+        ("CompatibilityResult", compat, lambda r: r.to_dict(), asdict),
+        ("GunaResult         ", guna, lambda r: r.to_dict(), asdict),
+    ):
+        t_old = _timed(old, objs)
+        t_new = _timed(new, objs)
+        print(
+            f"{label}  asdict {t_old / len(objs) * 1e6:7.1f} us   "
+            f"to_dict {t_new / len(objs) * 1e6:7.1f} us   ({t_old / t_new:5.1f}x)"
+        )
+    print("✓ identical JSON for every object\n")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
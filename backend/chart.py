@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from zoneinfo import ZoneInfo
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import swisseph as swe
 
-from .schemas import BirthInput, PlanetPosition, Ascendant, VedicChart
+from .schemas import BirthInput, PlanetPosition, Ascendant, VedicChart, ChartFeatures
+from .ephemeris_table import EphemerisTable, get_ephemeris_table
+from .ascendant import ascendant_tropical
+from .timezones import get_zone, local_to_utc
 
 
 SIGNS = [
@@ -36,30 +39,49 @@ PLANETS = [
     ("Rahu", swe.MEAN_NODE),  # change to swe.TRUE_NODE if desired
 ]
 
+# Classical sign rulers by sign index
+SIGN_RULERS = (
+    "Mars", "Venus", "Mercury", "Moon", "Sun", "Mercury",
+    "Venus", "Mars", "Jupiter", "Saturn", "Saturn", "Jupiter",
+)
 
-def _parse_local_dt(b: BirthInput) -> datetime:
+# Common simplified Manglik positions of Mars from Lagna
+MANGLIK_HOUSES = (1, 2, 4, 7, 8, 12)
+
+# Bump whenever a change can alter computed chart values; caches key on it
+ENGINE_VERSION = "2.0.0"
+
+AYANAMSA = "lahiri"
+
+# Column order of the batch engine arrays (Ketu appended after Rahu)
+PLANET_COLUMNS = tuple(n for n, _ in PLANETS) + ("Ketu",)
+
+
+def _parse_local_naive(b: BirthInput) -> datetime:
     """
     Strict parse for date/time.
     Raises ValueError with clear message.
     """
     try:
         # enforce seconds = 00
-        local_naive = datetime.fromisoformat(f"{b.date}T{b.time}:00")
+        return datetime.fromisoformat(f"{b.date}T{b.time}:00")
     except ValueError as e:
         raise ValueError(
             f"Invalid date/time format. Expected date=YYYY-MM-DD and time=HH:MM. Got date={b.date}, time={b.time}"
         ) from e
 
-    try:
-        tz = ZoneInfo(b.tz)
-    except Exception as e:
-        raise ValueError(f"Invalid timezone '{b.tz}'. Expected IANA tz like 'Asia/Kolkata'.") from e
 
-    return local_naive.replace(tzinfo=tz)
+def _parse_local_dt(b: BirthInput) -> datetime:
+    """Aware local datetime (fold applied for DST-ambiguous wall times)."""
+    return _to_utc_dt(b).astimezone(get_zone(b.tz))
 
 
 def _to_utc_dt(b: BirthInput) -> datetime:
-    return _parse_local_dt(b).astimezone(ZoneInfo("UTC"))
+    """
+    Raises ValueError (AmbiguousLocalTimeError / NonexistentLocalTimeError
+    for DST folds and gaps) instead of guessing an offset.
+    """
+    return local_to_utc(_parse_local_naive(b), b.tz, fold=b.fold)
 
 
 def _julian_day_ut(dt_utc: datetime) -> float:
@@ -79,9 +101,9 @@ def _whole_sign_house(asc_sign_idx: int, planet_sign_idx: int) -> int:
     return ((planet_sign_idx - asc_sign_idx) % 12) + 1
 
 
-def _moon_nakshatra_and_pada(moon_lon_sidereal: float) -> Tuple[str, int]:
+def _nakshatra_index_and_pada(moon_lon_sidereal: float) -> Tuple[int, int]:
     """
-    Returns (nakshatra_name, pada_1_to_4).
+    Returns (nakshatra_index_0_to_26, pada_1_to_4).
     Clamps pada to 1..4 to avoid floating boundary issues.
     """
     span = 13.0 + 20.0 / 60.0  # 13.333333333333...
@@ -98,9 +120,74 @@ def _moon_nakshatra_and_pada(moon_lon_sidereal: float) -> Tuple[str, int]:
     if pada > 4:
         pada = 4
 
+    return idx, pada
+
+
+def _moon_nakshatra_and_pada(moon_lon_sidereal: float) -> Tuple[str, int]:
+    """
+    Returns (nakshatra_name, pada_1_to_4).
+    """
+    idx, pada = _nakshatra_index_and_pada(moon_lon_sidereal)
     return NAKSHATRAS[idx], pada
 
 
+def _make_features(
+    asc_sign_idx: int, signs: Dict[str, int], houses: Dict[str, int], nak_idx: int, pada: int
+) -> ChartFeatures:
+    for name in ("Moon", "Mercury", "Venus", "Mars", "Saturn"):
+        if name not in signs:
+            raise ValueError(f"{name} position not found in chart")
+    return ChartFeatures(
+        asc_sign=asc_sign_idx,
+        moon_sign=signs["Moon"],
+        moon_nakshatra=nak_idx,
+        moon_pada=pada,
+        mercury_sign=signs["Mercury"],
+        venus_sign=signs["Venus"],
+        mars_sign=signs["Mars"],
+        saturn_house=houses["Saturn"],
+        mars_house=houses["Mars"],
+        seventh_lord_house=houses.get(SIGN_RULERS[(asc_sign_idx + 6) % 12], 0),
+        manglik=houses["Mars"] in MANGLIK_HOUSES,
+    )
+
+
+def _planets_features(asc_sign_idx: int, planets: List[PlanetPosition], nak_idx: int, pada: int) -> ChartFeatures:
+    return _make_features(
+        asc_sign_idx,
+        {p.name: p.sign_index for p in planets},
+        {p.name: p.house_whole_sign for p in planets},
+        nak_idx,
+        pada,
+    )
+
+
+def features_for_chart(chart: VedicChart) -> ChartFeatures:
+    """The chart's ChartFeatures (derived here for charts built without them)."""
+    if chart.features is not None:
+        return chart.features
+    if chart.moon_nakshatra not in NAKSHATRAS:
+        raise ValueError(f"Unknown Moon nakshatra '{chart.moon_nakshatra}'")
+    return _planets_features(
+        chart.ascendant.sign_index, chart.planets, NAKSHATRAS.index(chart.moon_nakshatra), chart.moon_pada
+    )
+
+
+def features_for_chart_dict(chart_data: Dict[str, Any]) -> Optional[ChartFeatures]:
+    """ChartFeatures of a serialized chart (VedicChart.to_dict()); None if it lacks the fields."""
+    try:
+        planets = chart_data["planets"]
+        return _make_features(
+            int(chart_data["ascendant"]["sign_index"]),
+            {p["name"]: int(p["sign_index"]) for p in planets},
+            {p["name"]: int(p["house_whole_sign"]) for p in planets},
+            NAKSHATRAS.index(chart_data["moon"]["nakshatra"]),
+            int(chart_data["moon"]["pada"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
 def _calc_lon_speed_ut(jd_ut: float, pid: int, flags: int) -> Tuple[float, float]:
     """
     Normalize pyswisseph calc_ut output across versions.
@@ -118,10 +205,9 @@ def _calc_lon_speed_ut(jd_ut: float, pid: int, flags: int) -> Tuple[float, float
     return lon, speed_lon
 
 
-def _compute_ascendant(jd_ut: float, lat: float, lon: float, ayan: float) -> Ascendant:
+def _ascendant_tropical(jd_ut: float, lat: float, lon: float) -> float:
     """
     Swiss Ephemeris returns tropical Ascendant from houses/houses_ex.
-    Convert to sidereal by subtracting ayanamsa (common approach).
     """
     # houses_ex exists in most builds; fall back to houses otherwise
     ascmc = None
@@ -130,7 +216,13 @@ def _compute_ascendant(jd_ut: float, lat: float, lon: float, ayan: float) -> Asc
     except Exception:
         cusps, ascmc = swe.houses(jd_ut, lat, lon, b'P')
 
-    asc_trop = float(ascmc[0]) % 360.0
+    return float(ascmc[0]) % 360.0
+
+
+def _make_ascendant(asc_trop: float, ayan: float) -> Ascendant:
+    """
+    Convert to sidereal by subtracting ayanamsa (common approach).
+    """
     asc_sid = (asc_trop - ayan) % 360.0
     idx = _sign_idx(asc_sid)
 
@@ -143,22 +235,88 @@ def _compute_ascendant(jd_ut: float, lat: float, lon: float, ayan: float) -> Asc
     )
 
 
+def _compute_ascendant(jd_ut: float, lat: float, lon: float, ayan: float) -> Ascendant:
+    return _make_ascendant(_ascendant_tropical(jd_ut, lat, lon), ayan)
+
+
+def _validate_lat_lon(b: BirthInput) -> None:
+    if not (-90.0 <= b.lat <= 90.0):
+        raise ValueError(f"Latitude out of range: {b.lat}")
+    if not (-180.0 <= b.lon <= 180.0):
+        raise ValueError(f"Longitude out of range: {b.lon}")
+
+
+def _calc_flags(high_precision: bool) -> int:
+    base = swe.FLG_SWIEPH if high_precision else swe.FLG_MOSEPH
+    return int(base | swe.FLG_SIDEREAL | swe.FLG_SPEED)
+
+
+def _planets_spec(use_true_node: bool) -> List[Tuple[str, int]]:
+    planets_spec = list(PLANETS)
+    if use_true_node:
+        planets_spec = [(n, swe.TRUE_NODE if n == "Rahu" else pid) for (n, pid) in planets_spec]
+    return planets_spec
+
+
+def _calc_planet(jd_ut: float, pid: int, flags: int) -> Tuple[float, float]:
+    """
+    Sidereal (lon 0..360, speed) with MOSEPH fallback when SWIEPH files are missing.
+    """
+    try:
+        lon_sid, speed_lon = _calc_lon_speed_ut(jd_ut, pid, flags)
+    except Exception:
+        # If SWIEPH fails due to missing ephemeris files, fall back to MOSEPH
+        fallback_flags = int(swe.FLG_MOSEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED)
+        lon_sid, speed_lon = _calc_lon_speed_ut(jd_ut, pid, fallback_flags)
+    return lon_sid % 360.0, speed_lon
+
+
+def _table_for(use_table: bool, high_precision: bool) -> Optional[EphemerisTable]:
+    """
+    The precomputed table backs the Moshier path only; None means "call swe".
+    """
+    if not use_table or high_precision:
+        return None
+    return get_ephemeris_table()
+
+
+def _table_columns(table: EphemerisTable, planets_spec: List[Tuple[str, int]]) -> np.ndarray:
+    return np.array([
+        table.column("RahuTrue" if pid == swe.TRUE_NODE else name)
+        for name, pid in planets_spec
+    ])
+
+
+def _planet_position(name: str, lon_sid: float, speed_lon: float, asc_sign_idx: int) -> PlanetPosition:
+    sidx = _sign_idx(lon_sid)
+    return PlanetPosition(
+        name=name,
+        lon=round(lon_sid, 6),
+        sign=SIGNS[sidx],
+        sign_index=sidx,
+        degree_in_sign=round(_deg_in_sign(lon_sid), 2),
+        house_whole_sign=_whole_sign_house(asc_sign_idx, sidx),
+        retrograde=bool(speed_lon < 0),
+    )
+
+
 def calculate_vedic_chart(
     b: BirthInput,
     high_precision: bool = False,
     ephe_path: Optional[str] = None,
     use_true_node: bool = False,
+    use_table: bool = False,
 ) -> VedicChart:
     """
     Deterministic Vedic chart calc:
     - Lahiri sidereal mode
     - Planet longitudes are sidereal (FLG_SIDEREAL)
     - Houses are Whole Sign Houses based on sidereal Ascendant sign
+    - use_table: fast mode (Moshier path only): planets interpolated from the
+      precomputed ephemeris table, Ascendant from the analytic formula in
+      ascendant.py; see those modules for the error bounds
     """
-    if not (-90.0 <= b.lat <= 90.0):
-        raise ValueError(f"Latitude out of range: {b.lat}")
-    if not (-180.0 <= b.lon <= 180.0):
-        raise ValueError(f"Longitude out of range: {b.lon}")
+    _validate_lat_lon(b)
 
     if ephe_path:
         swe.set_ephe_path(ephe_path)
@@ -166,86 +324,248 @@ def calculate_vedic_chart(
     swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
 
     dt_utc = _to_utc_dt(b)
+    return _chart_at(b.name, dt_utc, b.lat, b.lon, high_precision, use_true_node, use_table)
+
+
+def _ascendant_trop_for(jd_ut: float, lat: float, lon: float, fast: bool) -> float:
+    """Tropical Ascendant via houses() or, in fast mode, the analytic formula."""
+    if fast:
+        return float(ascendant_tropical(jd_ut, lat, lon))
+    return _ascendant_tropical(jd_ut, lat, lon)
+
+
+def _chart_at(
+    name: str,
+    dt_utc: datetime,
+    lat: float,
+    lon: float,
+    high_precision: bool,
+    use_true_node: bool,
+    use_table: bool,
+) -> VedicChart:
+    """
+    Chart for an exact UTC instant (sidereal mode already set by the caller).
+    """
     jd = _julian_day_ut(dt_utc)
 
     # flags
-    base = swe.FLG_SWIEPH if high_precision else swe.FLG_MOSEPH
-    flags = int(base | swe.FLG_SIDEREAL | swe.FLG_SPEED)
+    flags = _calc_flags(high_precision)
 
     ayan = float(swe.get_ayanamsa_ut(jd))
 
-    asc = _compute_ascendant(jd, b.lat, b.lon, ayan)
+    fast = use_table and not high_precision
+    asc = _make_ascendant(_ascendant_trop_for(jd, lat, lon, fast), ayan)
     asc_sign_idx = asc.sign_index
 
     # optionally swap node type
-    planets_spec = list(PLANETS)
-    if use_true_node:
-        planets_spec = [(n, swe.TRUE_NODE if n == "Rahu" else pid) for (n, pid) in planets_spec]
+    planets_spec = _planets_spec(use_true_node)
+
+    table = _table_for(use_table, high_precision)
+    if table is not None and table.covers(jd):
+        t_lon, t_speed = table.lookup(np.array([jd]), _table_columns(table, planets_spec))
+        positions = list(zip(t_lon[0].tolist(), t_speed[0].tolist()))
+    else:
+        positions = [_calc_planet(jd, pid, flags) for _, pid in planets_spec]
 
     planets_out: List[PlanetPosition] = []
     rahu_lon = None
     rahu_speed = None
 
-    for name, pid in planets_spec:
-        try:
-            lon_sid, speed_lon = _calc_lon_speed_ut(jd, pid, flags)
-        except Exception:
-            # If SWIEPH fails due to missing ephemeris files, fall back to MOSEPH
-            fallback_flags = int(swe.FLG_MOSEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED)
-            lon_sid, speed_lon = _calc_lon_speed_ut(jd, pid, fallback_flags)
-
-        lon_sid = lon_sid % 360.0
-        sidx = _sign_idx(lon_sid)
-
-        if name == "Rahu":
+    for (pname, _), (lon_sid, speed_lon) in zip(planets_spec, positions):
+        if pname == "Rahu":
             rahu_lon = lon_sid
             rahu_speed = speed_lon
 
-        planets_out.append(
-            PlanetPosition(
-                name=name,
-                lon=round(lon_sid, 6),
-                sign=SIGNS[sidx],
-                sign_index=sidx,
-                degree_in_sign=round(_deg_in_sign(lon_sid), 2),
-                house_whole_sign=_whole_sign_house(asc_sign_idx, sidx),
-                retrograde=bool(speed_lon < 0),
-            )
-        )
+        planets_out.append(_planet_position(pname, lon_sid, speed_lon, asc_sign_idx))
 
-    # Ketu computed from Rahu
+    # Ketu computed from Rahu (retrograde consistent with Rahu)
     if rahu_lon is not None:
         ketu_lon = (rahu_lon + 180.0) % 360.0
-        ketu_sidx = _sign_idx(ketu_lon)
-        ketu_retro = bool((rahu_speed or 0.0) < 0)  # consistent with Rahu
-
-        planets_out.append(
-            PlanetPosition(
-                name="Ketu",
-                lon=round(ketu_lon, 6),
-                sign=SIGNS[ketu_sidx],
-                sign_index=ketu_sidx,
-                degree_in_sign=round(_deg_in_sign(ketu_lon), 2),
-                house_whole_sign=_whole_sign_house(asc_sign_idx, ketu_sidx),
-                retrograde=ketu_retro,
-            )
-        )
+        planets_out.append(_planet_position("Ketu", ketu_lon, rahu_speed or 0.0, asc_sign_idx))
 
     # Moon nakshatra/pada
     moon = next((p for p in planets_out if p.name == "Moon"), None)
     if moon is None:
         raise RuntimeError("Moon not computed. Unexpected.")
 
-    moon_nak, moon_pada = _moon_nakshatra_and_pada(moon.lon)
+    nak_idx, moon_pada = _nakshatra_index_and_pada(moon.lon)
 
     return VedicChart(
-        name=b.name,
+        name=name,
         utc_time=dt_utc.isoformat(),
-        ayanamsa_type="lahiri",
+        ayanamsa_type=AYANAMSA,
         ayanamsa_value_deg=round(ayan, 6),
         house_system="whole_sign",
         ascendant=asc,
-        moon_nakshatra=moon_nak,
+        moon_nakshatra=NAKSHATRAS[nak_idx],
         moon_pada=moon_pada,
         planets=planets_out,
+        features=_planets_features(asc_sign_idx, planets_out, nak_idx, moon_pada),
+    )
+
+
+# ============================================================================
+# BATCH ENGINE
+# ============================================================================
+
+@dataclass(frozen=True)
+class ChartBatch:
+    """
+    Columnar result of calculate_vedic_charts.
+    Row i corresponds to births[i]; planet columns follow PLANET_COLUMNS.
+    Angles are unrounded sidereal degrees; VedicChart objects are only
+    built on demand via chart(i) / charts().
+    """
+    names: List[str]
+    utc_times: List[str]
+    jd_ut: np.ndarray            # (n,) float64
+    ayanamsa: np.ndarray         # (n,) float64
+    asc_lon_tropical: np.ndarray  # (n,) float64
+    asc_lon: np.ndarray          # (n,) float64 sidereal
+    asc_sign: np.ndarray         # (n,) int8 0..11
+    lon: np.ndarray              # (n, 9) float64 sidereal
+    speed: np.ndarray            # (n, 9) float64 deg/day
+    sign: np.ndarray             # (n, 9) int8 0..11
+    house: np.ndarray            # (n, 9) int8 1..12 (WHS)
+    moon_nakshatra: np.ndarray   # (n,) int8 0..26
+    moon_pada: np.ndarray        # (n,) int8 1..4
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def column(self, planet: str) -> int:
+        return PLANET_COLUMNS.index(planet)
+
+    def chart(self, i: int) -> VedicChart:
+        """
+        Materialize row i as the VedicChart calculate_vedic_chart would return.
+        """
+        asc_sign_idx = int(self.asc_sign[i])
+        lons = self.lon[i].tolist()
+        speeds = self.speed[i].tolist()
+        planets = [
+            _planet_position(name, lons[j], speeds[j], asc_sign_idx)
+            for j, name in enumerate(PLANET_COLUMNS)
+        ]
+        return VedicChart(
+            name=self.names[i],
+            utc_time=self.utc_times[i],
+            ayanamsa_type=AYANAMSA,
+            ayanamsa_value_deg=round(float(self.ayanamsa[i]), 6),
+            house_system="whole_sign",
+            ascendant=_make_ascendant(float(self.asc_lon_tropical[i]), float(self.ayanamsa[i])),
+            moon_nakshatra=NAKSHATRAS[int(self.moon_nakshatra[i])],
+            moon_pada=int(self.moon_pada[i]),
+            planets=planets,
+            features=_planets_features(asc_sign_idx, planets, int(self.moon_nakshatra[i]), int(self.moon_pada[i])),
+        )
+
+    def charts(self) -> Iterator[VedicChart]:
+        for i in range(len(self)):
+            yield self.chart(i)
+
+
+def calculate_vedic_charts(
+    births: Sequence[BirthInput],
+    high_precision: bool = False,
+    ephe_path: Optional[str] = None,
+    use_true_node: bool = False,
+    use_table: bool = False,
+) -> ChartBatch:
+    """
+    Batch form of calculate_vedic_chart for bulk/offline jobs.
+    Sidereal mode, flags and planet spec are set up once for the whole
+    sequence; zones come from the timezone service cache. With use_table (fast mode), Ascendants for all rows come
+    from one vectorized call and every row inside the table range is
+    interpolated in one lookup. Raises ValueError naming the offending row index.
+    """
+    n = len(births)
+
+    if ephe_path:
+        swe.set_ephe_path(ephe_path)
+
+    swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
+
+    flags = _calc_flags(high_precision)
+    planets_spec = _planets_spec(use_true_node)
+    n_calc = len(planets_spec)
+    moon_col = PLANET_COLUMNS.index("Moon")
+    rahu_col = PLANET_COLUMNS.index("Rahu")
+    ketu_col = PLANET_COLUMNS.index("Ketu")
+
+    names: List[str] = []
+    utc_times: List[str] = []
+    jd_ut = np.empty(n, dtype=np.float64)
+    ayanamsa = np.empty(n, dtype=np.float64)
+    asc_trop = np.empty(n, dtype=np.float64)
+    lon = np.empty((n, len(PLANET_COLUMNS)), dtype=np.float64)
+    speed = np.empty((n, len(PLANET_COLUMNS)), dtype=np.float64)
+    moon_nakshatra = np.empty(n, dtype=np.int8)
+    moon_pada = np.empty(n, dtype=np.int8)
+    lat = np.empty(n, dtype=np.float64)
+    geo_lon = np.empty(n, dtype=np.float64)
+    fast = use_table and not high_precision
+
+    for i, b in enumerate(births):
+        try:
+            _validate_lat_lon(b)
+            dt_utc = _to_utc_dt(b)
+        except ValueError as e:
+            raise ValueError(f"births[{i}]: {e}") from e
+
+        jd = _julian_day_ut(dt_utc)
+        names.append(b.name)
+        utc_times.append(dt_utc.isoformat())
+        jd_ut[i] = jd
+        ayanamsa[i] = swe.get_ayanamsa_ut(jd)
+        lat[i] = b.lat
+        geo_lon[i] = b.lon
+        if not fast:
+            asc_trop[i] = _ascendant_tropical(jd, b.lat, b.lon)
+
+    if fast:
+        asc_trop[:] = ascendant_tropical(jd_ut, lat, geo_lon)
+
+    table = _table_for(use_table, high_precision)
+    if table is not None:
+        covered = (jd_ut >= table.jd_start) & (jd_ut < table.jd_end)
+        t_lon, t_speed = table.lookup(jd_ut[covered], _table_columns(table, planets_spec))
+        lon[covered, :n_calc] = t_lon
+        speed[covered, :n_calc] = t_speed
+    else:
+        covered = np.zeros(n, dtype=bool)
+
+    for i in np.flatnonzero(~covered):
+        jd = float(jd_ut[i])
+        row_lon = lon[i]
+        row_speed = speed[i]
+        for j in range(n_calc):
+            row_lon[j], row_speed[j] = _calc_planet(jd, planets_spec[j][1], flags)
+
+    for i, moon_lon in enumerate(lon[:, moon_col].tolist()):
+        moon_nakshatra[i], moon_pada[i] = _nakshatra_index_and_pada(round(moon_lon, 6))
+
+    # Ketu computed from Rahu (retrograde consistent with Rahu)
+    lon[:, ketu_col] = (lon[:, rahu_col] + 180.0) % 360.0
+    speed[:, ketu_col] = speed[:, rahu_col]
+
+    asc_lon = (asc_trop - ayanamsa) % 360.0
+    asc_sign = (asc_lon // 30.0).astype(np.int8)
+    sign = (lon // 30.0).astype(np.int8)
+    house = ((sign - asc_sign[:, None]) % 12 + 1).astype(np.int8)
+
+    return ChartBatch(
+        names=names,
+        utc_times=utc_times,
+        jd_ut=jd_ut,
+        ayanamsa=ayanamsa,
+        asc_lon_tropical=asc_trop,
+        asc_lon=asc_lon,
+        asc_sign=asc_sign,
+        lon=lon,
+        speed=speed,
+        sign=sign,
+        house=house,
+        moon_nakshatra=moon_nakshatra,
+        moon_pada=moon_pada,
     )
@@ -0,0 +1,144 @@
+"""
+In-process chart cache
+Bounded LRU + TTL cache in front of calculate_vedic_chart, keyed on the
+normalized calculation inputs (never on the display name).
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .schemas import BirthInput, VedicChart
+from .chart import ENGINE_VERSION, AYANAMSA, _to_utc_dt, _validate_lat_lon, calculate_vedic_chart
+
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "2048"))
+CHART_CACHE_TTL = float(os.getenv("CHART_CACHE_TTL", "3600"))
+
+
+def chart_cache_key(
+    b: BirthInput,
+    high_precision: bool = False,
+    ephe_path: Optional[str] = None,
+    use_true_node: bool = False,
+    use_table: bool = False,
+) -> Tuple[Hashable, ...]:
+    """
+    Content address of a chart calculation.
+    Local date/time + tz are collapsed to the UTC instant, so equivalent
+    inputs share one entry; name is deliberately excluded.
+    """
+    _validate_lat_lon(b)
+    return (
+        ENGINE_VERSION,
+        _to_utc_dt(b).isoformat(),
+        float(b.lat),
+        float(b.lon),
+        bool(high_precision),
+        bool(use_true_node),
+        # table mode only applies to the Moshier path
+        bool(use_table and not high_precision),
+        ephe_path or "",
+        AYANAMSA,
+    )
+
+
+class ChartCache:
+    """
+    Thread-safe LRU cache with per-entry TTL.
+    maxsize <= 0 disables caching (every lookup is a miss).
+    """
+
+    def __init__(self, maxsize: int = CHART_CACHE_SIZE, ttl_seconds: float = CHART_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, Tuple[float, VedicChart]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[VedicChart]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, chart = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return chart
+
+    def put(self, key: Hashable, chart: VedicChart) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, chart)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+chart_cache = ChartCache()
+
+
+def cached_vedic_chart(
+    b: BirthInput,
+    high_precision: bool = False,
+    ephe_path: Optional[str] = None,
+    use_true_node: bool = False,
+    use_table: bool = False,
+    cache: Optional[ChartCache] = None,
+) -> VedicChart:
+    """
+    Drop-in replacement for calculate_vedic_chart backed by the chart cache.
+    Cached charts are stored nameless and re-labelled with b.name on return.
+    """
+    cache = cache if cache is not None else chart_cache
+    key = chart_cache_key(
+        b, high_precision=high_precision, ephe_path=ephe_path, use_true_node=use_true_node, use_table=use_table
+    )
+
+    chart = cache.get(key)
+    if chart is None:
+        chart = calculate_vedic_chart(
+            b, high_precision=high_precision, ephe_path=ephe_path, use_true_node=use_true_node, use_table=use_table
+        )
+        cache.put(key, replace(chart, name=""))
+
+    return _relabel(chart, b.name)
+
+
+def _relabel(chart: VedicChart, name: str) -> VedicChart:
+    return chart if chart.name == name else replace(chart, name=name)
@@ -0,0 +1,275 @@
+"""
+Chart engine executor
+Runs Swiss Ephemeris work in a pool of worker processes so that pyswisseph's
+global state (ephemeris path, sidereal mode) never leaks across requests and
+chart math can use more than one core without blocking the event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import swisseph as swe
+
+from .schemas import BirthInput, VedicChart
+from .chart import calculate_vedic_chart
+from .chart_cache import ChartCache, _relabel, chart_cache, chart_cache_key
+from .singleflight import chart_flights
+
+# 0 disables the pool: charts are computed in-process on the blocking thread pool.
+# Defaults to 0 on Vercel, where every cold start would otherwise spawn workers.
+CHART_ENGINE_WORKERS = int(os.getenv("CHART_ENGINE_WORKERS", "0" if os.getenv("VERCEL") else "2"))
+CHART_EPHE_PATH = os.getenv("SE_EPHE_PATH") or None
+
+
+@dataclass(frozen=True)
+class EngineConfig:
+    """Swiss Ephemeris configuration a worker process is pinned to."""
+    ephe_path: Optional[str] = None
+    sid_mode: int = swe.SIDM_LAHIRI
+    use_true_node: bool = False
+
+
+# Set once per worker process by _init_worker
+_WORKER_CONFIG: Optional[EngineConfig] = None
+
+
+# Inline mode (workers=0) runs calls on executor threads shared by both
+# engines, so the config travels with each call instead
+_INLINE = threading.local()
+
+
+def _apply_config(config: EngineConfig) -> None:
+    if config.ephe_path:
+        swe.set_ephe_path(config.ephe_path)
+    swe.set_sid_mode(config.sid_mode, 0, 0)
+
+
+def _init_worker(config: EngineConfig) -> None:
+    global _WORKER_CONFIG
+    _WORKER_CONFIG = config
+    _apply_config(config)
+
+
+def _inline_call(config: EngineConfig, fn: Callable[..., Any], *args: Any) -> Any:
+    _apply_config(config)
+    _INLINE.config = config
+    try:
+        return fn(*args)
+    finally:
+        _INLINE.config = None
+
+
+def _worker_chart(b: BirthInput, high_precision: bool, use_table: bool = False) -> VedicChart:
+    config = getattr(_INLINE, "config", None) or _WORKER_CONFIG or EngineConfig()
+    return calculate_vedic_chart(
+        b,
+        high_precision=high_precision,
+        use_true_node=config.use_true_node,
+        use_table=use_table,
+    )
+
+
+def _worker_call(fn: Callable[..., Any], *args: Any) -> Any:
+    return fn(*args)
+
+
+def _warmup_birth() -> BirthInput:
+    return BirthInput(date="2000-01-01", time="12:00", tz="UTC", lat=0.0, lon=0.0, name="warmup")
+
+
+class ChartEngine:
+    """
+    Process pool pinned to one EngineConfig.
+    Tracks queue depth (submitted but not finished) for /health.
+    """
+
+    def __init__(self, config: EngineConfig, workers: int = CHART_ENGINE_WORKERS):
+        self.config = config
+        self.workers = max(0, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.max_pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=mp.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.config,),
+                )
+            return self._pool
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace `broken`, unless a concurrent caller already has."""
+        with self._lock:
+            if self._pool is not broken:
+                return
+            self._pool = None
+            self.restarts += 1
+        # Its futures have already failed; nothing healthy is cancelled
+        broken.shutdown(wait=False)
+
+    def _on_done(self, fut: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+            if fut.cancelled() or fut.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        Submit a picklable module-level function to the pool.
+        With workers=0 the call runs inline and a completed Future is returned.
+        """
+        return self._submit(fn, *args)[1]
+
+    def _begin(self) -> None:
+        with self._lock:
+            self.pending += 1
+            self.submitted += 1
+            self.max_pending = max(self.max_pending, self.pending)
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Tuple[Optional[ProcessPoolExecutor], Future]:
+        """submit(), also returning the pool the call went to (None when inline)."""
+        self._begin()
+        if self.workers == 0:
+            fut: Future = Future()
+            try:
+                fut.set_result(_inline_call(self.config, fn, *args))
+            except Exception as e:
+                fut.set_exception(e)
+            self._on_done(fut)
+            return None, fut
+
+        pool = self._get_pool()
+        try:
+            fut = pool.submit(_worker_call, fn, *args)
+        except BrokenProcessPool:
+            self._restart(pool)
+            pool = self._get_pool()
+            fut = pool.submit(_worker_call, fn, *args)
+        fut.add_done_callback(self._on_done)
+        return pool, fut
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Await fn(*args) on the pool without blocking the event loop."""
+        if self.workers == 0:
+            # No pool: run on the loop's bounded default executor (BLOCKING_WORKERS)
+            self._begin()
+            inline = asyncio.get_running_loop().run_in_executor(None, _inline_call, self.config, fn, *args)
+            inline.add_done_callback(self._on_done)
+            return await inline
+
+        pool, fut = self._submit(fn, *args)
+        try:
+            return await asyncio.wrap_future(fut)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); every call in flight on that pool fails
+            # together, and only the first of them rebuilds it. Retry once.
+            self._restart(pool)
+            return await asyncio.wrap_future(self._submit(fn, *args)[1])
+
+    async def chart(self, b: BirthInput, high_precision: bool = False, use_table: bool = False) -> VedicChart:
+        return await self.run(_worker_chart, b, high_precision, use_table)
+
+    def warmup(self) -> None:
+        """Spawn every worker and run one chart in each."""
+        if self.workers == 0:
+            return
+        futures = [self.submit(_worker_chart, _warmup_birth(), False) for _ in range(self.workers)]
+        for fut in futures:
+            fut.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "use_true_node": self.config.use_true_node,
+            "queue_depth": self.pending,
+            "max_queue_depth": self.max_pending,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "restarts": self.restarts,
+        }
+
+
+# One engine per node type; ephemeris path and sidereal mode are process-wide
+_engines: Dict[bool, ChartEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_chart_engine(use_true_node: bool = False) -> ChartEngine:
+    with _engines_lock:
+        engine = _engines.get(use_true_node)
+        if engine is None:
+            engine = _engines[use_true_node] = ChartEngine(
+                EngineConfig(ephe_path=CHART_EPHE_PATH, use_true_node=use_true_node)
+            )
+        return engine
+
+
+def warmup_engines() -> None:
+    # Only the mean-node engine is on the hot path; the true-node pool starts lazily
+    get_chart_engine(False).warmup()
+
+
+def shutdown_engines() -> None:
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.shutdown()
+        _engines.clear()
+
+
+def engine_stats() -> Dict[str, Any]:
+    with _engines_lock:
+        return {("true_node" if k else "mean_node"): e.stats() for k, e in _engines.items()}
+
+
+async def compute_chart(
+    b: BirthInput,
+    high_precision: bool = False,
+    use_true_node: bool = False,
+    use_table: bool = False,
+    cache: Optional[ChartCache] = None,
+) -> VedicChart:
+    """
+    Async chart entry point for request handlers: chart cache first,
+    then the pinned engine for this node type (one call per chart in flight).
+    """
+    cache = cache if cache is not None else chart_cache
+    key = chart_cache_key(
+        b, high_precision=high_precision, ephe_path=CHART_EPHE_PATH, use_true_node=use_true_node, use_table=use_table
+    )
+
+    chart = cache.get(key)
+    if chart is None:
+        async def miss() -> VedicChart:
+            computed = replace(await get_chart_engine(use_true_node).chart(b, high_precision, use_table), name="")
+            cache.put(key, computed)
+            return computed
+
+        # Concurrent misses for the same chart share one engine call
+        chart = await chart_flights.run(key, miss)
+
+    return _relabel(chart, b.name)
@@ -0,0 +1,316 @@
+"""
+Cohort compatibility matrix
+Scores every (row, column) pair of two cohorts with the compatibility
+indicators kernel and the Guna Milan table, and writes the scores into an N x M x k float32
+.npy file that stays memory-mapped. The matrix is tiled into blocks which
+worker processes fill in place, so memory stays bounded by
+workers x block size whatever the cohort size. A per-block done-map
+next to the matrix lets an interrupted run resume where it stopped.
+
+Output directory layout:
+    matrix.npy   float32 (n_rows, n_cols, len(COHORT_FIELDS)); np.load(..., mmap_mode="r")
+    done.npy     uint8 (row blocks, col blocks); 1 once a block is flushed
+    meta.json    shape, block size, fields and a fingerprint of the inputs
+
+CLI (run from the repo root):
+    python -m backend.cohort run --rows boys.csv [--cols girls.csv] --out DIR [--block 256] [--workers N]
+    python -m backend.cohort top --out DIR --row 0 [--field guna] [-k 10]
+Cohort files are CSV (header name,date,time,tz,lat,lon[,fold]) or a JSON list
+of objects with the same keys. Without --cols the cohort is scored against itself.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .schemas import BirthInput, VedicChart
+from .chart import ENGINE_VERSION, calculate_vedic_charts
+from .match import chart_features, compatibility_kernel
+from .guna import GUNA_TOTALS, calculate_guna_milan, chart_pada_index
+
+# Score planes of the matrix (last axis)
+COHORT_FIELDS = ("overall", "emotional", "communication", "attraction", "stability", "guna")
+DEFAULT_BLOCK = 256
+COHORT_WORKERS = int(os.getenv("COHORT_WORKERS", str(os.cpu_count() or 1)))
+
+_MATRIX_FILE = "matrix.npy"
+_DONE_FILE = "done.npy"
+_META_FILE = "meta.json"
+
+# Set once per worker process by _init_worker
+_ROWS: List[VedicChart] = []
+_COLS: List[VedicChart] = []
+_FEATURES: Tuple[np.ndarray, np.ndarray] = (np.empty((0, 0), np.int8), np.empty((0, 0), np.int8))
+_PADAS: Tuple[np.ndarray, np.ndarray] = (np.empty(0, np.intp), np.empty(0, np.intp))
+
+
+def _init_worker(rows: List[VedicChart], cols: List[VedicChart]) -> None:
+    global _ROWS, _COLS, _FEATURES, _PADAS
+    _ROWS, _COLS = rows, cols
+    _FEATURES = (_features(rows), _features(cols))
+    _PADAS = (_padas(rows), _padas(cols))
+
+
+def _features(charts: Sequence[VedicChart]) -> np.ndarray:
+    return np.array([chart_features(c) for c in charts], dtype=np.int8).reshape(len(charts), -1)
+
+
+def _padas(charts: Sequence[VedicChart]) -> np.ndarray:
+    """Moon pada index per chart, -1 where the guna table can't be used."""
+    return np.array([-1 if (p := chart_pada_index(c)) is None else p for c in charts], dtype=np.intp)
+
+
+def score_block(
+    rows: Sequence[VedicChart],
+    cols: Sequence[VedicChart],
+    row_features: Optional[np.ndarray] = None,
+    col_features: Optional[np.ndarray] = None,
+    row_padas: Optional[np.ndarray] = None,
+    col_padas: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """(len(rows), len(cols), len(COHORT_FIELDS)) float32 scores; rows take partner A / the boy's side."""
+    row_features = _features(rows) if row_features is None else row_features
+    col_features = _features(cols) if col_features is None else col_features
+    row_padas = _padas(rows) if row_padas is None else row_padas
+    col_padas = _padas(cols) if col_padas is None else col_padas
+    out = np.empty((len(rows), len(cols), len(COHORT_FIELDS)), dtype=np.float32)
+
+    k = compatibility_kernel(row_features[:, None, :], col_features[None, :, :])
+    for f, scores in enumerate((k.overall, k.emotional, k.communication, k.attraction, k.stability)):
+        out[:, :, f] = scores
+
+    # Guna: one table gather; pairs the table can't index take the direct path
+    out[:, :, 5] = GUNA_TOTALS[np.ix_(np.maximum(row_padas, 0), np.maximum(col_padas, 0))]
+    for i in np.flatnonzero(row_padas < 0).tolist():
+        out[i, :, 5] = [calculate_guna_milan(rows[i], b).total_points for b in cols]
+    for j in np.flatnonzero(col_padas < 0).tolist():
+        out[:, j, 5] = [calculate_guna_milan(a, cols[j]).total_points for a in rows]
+    return out
+
+
+def _fill_block(path: str, r0: int, r1: int, c0: int, c1: int) -> Tuple[int, int]:
+    """Worker task: score one tile and write it straight into the memory-mapped matrix."""
+    block = score_block(
+        _ROWS[r0:r1], _COLS[c0:c1],
+        _FEATURES[0][r0:r1], _FEATURES[1][c0:c1],
+        _PADAS[0][r0:r1], _PADAS[1][c0:c1],
+    )
+    matrix = np.load(path, mmap_mode="r+")
+    matrix[r0:r1, c0:c1] = block
+    matrix.flush()
+    del matrix
+    return r0, c0
+
+
+def _fingerprint(rows: Sequence[BirthInput], cols: Sequence[BirthInput]) -> str:
+    h = hashlib.sha256(ENGINE_VERSION.encode())
+    for cohort in (rows, cols):
+        h.update(b"|")
+        for b in cohort:
+            h.update(repr(astuple(b)).encode())
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class CohortMatrix:
+    """A finished (or partial) run on disk."""
+    out_dir: Path
+    shape: Tuple[int, int]
+    block: int
+    fields: Tuple[str, ...]
+
+    @classmethod
+    def open(cls, out_dir: Path) -> "CohortMatrix":
+        out_dir = Path(out_dir)
+        meta = json.loads((out_dir / _META_FILE).read_text())
+        return cls(out_dir, tuple(meta["shape"]), meta["block"], tuple(meta["fields"]))
+
+    def matrix(self, mode: str = "r") -> np.memmap:
+        return np.load(self.out_dir / _MATRIX_FILE, mmap_mode=mode)
+
+    def done(self) -> np.ndarray:
+        return np.load(self.out_dir / _DONE_FILE)
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.done().all())
+
+    def field(self, name: str) -> np.ndarray:
+        """(n_rows, n_cols) memory-mapped view of one score plane."""
+        if name not in self.fields:
+            raise ValueError(f"Unknown field '{name}'. Expected one of {', '.join(self.fields)}")
+        return self.matrix()[:, :, self.fields.index(name)]
+
+    def top(self, row: int, field: str = "guna", k: int = 10) -> List[Tuple[int, float]]:
+        """Best k columns for one row (ties by lowest column index)."""
+        if not 0 <= row < self.shape[0]:
+            raise ValueError(f"row must be in 0..{self.shape[0] - 1}")
+        scores = np.asarray(self.field(field)[row])
+        order = np.lexsort((np.arange(len(scores)), -scores))[:k]
+        return [(int(j), float(scores[j])) for j in order]
+
+
+def _open_run(out_dir: Path, shape: Tuple[int, int], block: int, fingerprint: str, resume: bool) -> np.memmap:
+    """Create the output files, or reopen them when resuming a run over the same inputs."""
+    meta = {"shape": list(shape), "block": block, "fields": list(COHORT_FIELDS), "fingerprint": fingerprint}
+    grid = (-(-shape[0] // block), -(-shape[1] // block))
+    matrix_path, done_path, meta_path = out_dir / _MATRIX_FILE, out_dir / _DONE_FILE, out_dir / _META_FILE
+
+    if resume and meta_path.exists() and matrix_path.exists() and done_path.exists():
+        if json.loads(meta_path.read_text()) != meta:
+            raise ValueError(f"{out_dir} holds a different cohort run; use a new --out or resume=False")
+        return np.load(done_path, mmap_mode="r+")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    np.lib.format.open_memmap(matrix_path, mode="w+", dtype=np.float32, shape=shape + (len(COHORT_FIELDS),)).flush()
+    done = np.lib.format.open_memmap(done_path, mode="w+", dtype=np.uint8, shape=grid)
+    done.flush()
+    meta_path.write_text(json.dumps(meta))
+    return done
+
+
+def compute_cohort_matrix(
+    rows: Sequence[BirthInput],
+    cols: Optional[Sequence[BirthInput]],
+    out_dir: Path,
+    block: int = DEFAULT_BLOCK,
+    workers: int = COHORT_WORKERS,
+    resume: bool = True,
+    progress: bool = False,
+) -> CohortMatrix:
+    """
+    Fill out_dir with the rows x cols score matrix (cols=None: rows vs rows).
+    Charts are computed once up front; blocks already marked done are skipped
+    when resuming. workers=0 scores blocks inline in this process.
+    """
+    if block <= 0:
+        raise ValueError("block must be positive")
+    cols = rows if cols is None else cols
+    if not rows or not cols:
+        raise ValueError("Both cohorts must contain at least one birth")
+
+    out_dir = Path(out_dir)
+    shape = (len(rows), len(cols))
+    done = _open_run(out_dir, shape, block, _fingerprint(rows, cols), resume)
+    todo = [(bi, bj) for bi, bj in np.argwhere(done == 0).tolist()]
+    total_blocks = done.size
+
+    if todo:
+        row_charts = list(calculate_vedic_charts(rows).charts())
+        col_charts = row_charts if cols is rows else list(calculate_vedic_charts(cols).charts())
+        path = str(out_dir / _MATRIX_FILE)
+
+        def task(bi: int, bj: int) -> Tuple[str, int, int, int, int]:
+            r0, c0 = bi * block, bj * block
+            return path, r0, min(r0 + block, shape[0]), c0, min(c0 + block, shape[1])
+
+        def mark(r0: int, c0: int) -> None:
+            done[r0 // block, c0 // block] = 1
+            done.flush()
+            if progress:
+                print(f"  block {int(done.sum())}/{total_blocks}", file=sys.stderr)
+
+        if workers == 0:
+            _init_worker(row_charts, col_charts)
+            for bi, bj in todo:
+                mark(*_fill_block(*task(bi, bj)))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(row_charts, col_charts),
+            ) as pool:
+                # Keep a bounded number of blocks in flight
+                pending: set[Future] = set()
+                queue = iter(todo)
+                for bi, bj in queue:
+                    pending.add(pool.submit(_fill_block, *task(bi, bj)))
+                    if len(pending) >= 2 * workers:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for fut in finished:
+                            mark(*fut.result())
+                for fut in pending:
+                    mark(*fut.result())
+
+    del done
+    return CohortMatrix.open(out_dir)
+
+
+def load_cohort(path: Path) -> List[BirthInput]:
+    """Read a cohort file (CSV with a header row, or a JSON list of objects)."""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        records = json.loads(path.read_text())
+    else:
+        with open(path, newline="") as f:
+            records = list(csv.DictReader(f))
+
+    births = []
+    for i, r in enumerate(records):
+        try:
+            fold = r.get("fold")
+            births.append(BirthInput(
+                name=str(r.get("name") or ""),
+                date=str(r["date"]),
+                time=str(r["time"]),
+                tz=str(r.get("tz") or "Asia/Kolkata"),
+                lat=float(r["lat"]),
+                lon=float(r["lon"]),
+                fold=None if fold in (None, "") else int(fold),
+            ))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path.name} record {i}: {e}") from e
+    return births
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cohort compatibility matrix (indicators + Guna)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="compute (or resume) a matrix")
+    p_run.add_argument("--rows", type=Path, required=True, help="cohort on the partner A / boy side")
+    p_run.add_argument("--cols", type=Path, help="cohort on the partner B / girl side (default: --rows)")
+    p_run.add_argument("--out", type=Path, required=True)
+    p_run.add_argument("--block", type=int, default=DEFAULT_BLOCK)
+    p_run.add_argument("--workers", type=int, default=COHORT_WORKERS)
+    p_run.add_argument("--restart", action="store_true", help="discard a previous run in --out")
+
+    p_top = sub.add_parser("top", help="best matches for one row")
+    p_top.add_argument("--out", type=Path, required=True)
+    p_top.add_argument("--row", type=int, required=True)
+    p_top.add_argument("--field", default="guna", choices=COHORT_FIELDS)
+    p_top.add_argument("-k", type=int, default=10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        rows = load_cohort(args.rows)
+        cols = load_cohort(args.cols) if args.cols else None
+        result = compute_cohort_matrix(
+            rows, cols, args.out, block=args.block, workers=args.workers, resume=not args.restart, progress=True
+        )
+        print(f"✓ {result.shape[0]} x {result.shape[1]} matrix in {args.out / _MATRIX_FILE}")
+        return 0
+
+    result = CohortMatrix.open(args.out)
+    if not result.complete:
+        print("⚠ matrix is incomplete; unfinished blocks read as 0", file=sys.stderr)
+    for j, score in result.top(args.row, args.field, args.k):
+        print(f"{j:8d}  {score:6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Vimshottari dasha engine
+Mahadasha / antardasha / pratyantardasha timeline from the natal Moon
+longitude, stored as flat arrays of start instants (UT Julian days) and lord
+indexes, so "which period contains date X" is one bisection per level.
+
+Convention: 1 dasha year = 365.25 days; the timeline covers the full
+120-year cycle starting at the beginning of the birth mahadasha.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .timezones import UTC
+
+# Vimshottari sequence; nakshatra i is ruled by DASHA_LORDS[i % 9]
+DASHA_LORDS = ("Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury")
+DASHA_YEARS = (7, 20, 6, 10, 7, 18, 16, 19, 17)
+CYCLE_YEARS = 120
+YEAR_DAYS = 365.25
+LEVELS = ("mahadasha", "antardasha", "pratyantardasha")
+
+_NAKSHATRA_SPAN = 360.0 / 27.0
+_YEARS = np.array(DASHA_YEARS, dtype=np.float64)
+_J2000 = 2451545.0
+_J2000_DT = datetime(2000, 1, 1, 12, tzinfo=UTC)
+
+
+def _dt_to_jd(dt: datetime) -> float:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return _J2000 + (dt - _J2000_DT) / timedelta(days=1)
+
+
+def _jd_to_dt(jd: float) -> datetime:
+    return _J2000_DT + timedelta(days=jd - _J2000)
+
+
+@dataclass(frozen=True)
+class DashaPeriod:
+    level: str
+    lord: str
+    start: datetime
+    end: datetime
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "level": self.level,
+            "lord": self.lord,
+            "start": self.start.date().isoformat(),
+            "end": self.end.date().isoformat(),
+        }
+
+
+class DashaTimeline:
+    """
+    Flat per-level arrays (9, 81 and 729 periods):
+    starts[k][i] = UT Julian day period i of level k begins, lords[k][i] = index
+    into DASHA_LORDS. Period i ends where period i+1 starts; the last ends at `end`.
+    """
+
+    __slots__ = ("birth_jd", "balance_years", "starts", "lords", "end", "_summary")
+
+    def __init__(self, birth_jd: float, moon_lon: float):
+        nak = int((moon_lon % 360.0) // _NAKSHATRA_SPAN)
+        elapsed = (moon_lon % _NAKSHATRA_SPAN) / _NAKSHATRA_SPAN
+        first = nak % 9
+
+        self.birth_jd = birth_jd
+        self.balance_years = float(DASHA_YEARS[first] * (1.0 - elapsed))
+        cycle_start = birth_jd - DASHA_YEARS[first] * elapsed * YEAR_DAYS
+
+        # Level k lords are the sub-sequences starting at each parent lord
+        seq = (first + np.arange(9)) % 9
+        lords = [seq]
+        years = [_YEARS[seq]]
+        for _ in range(2):
+            sub = (lords[-1][:, None] + np.arange(9)) % 9
+            years.append((years[-1][:, None] * _YEARS[sub] / CYCLE_YEARS).ravel())
+            lords.append(sub.ravel())
+
+        self.lords = tuple(l.astype(np.int8) for l in lords)
+        self.starts = tuple(
+            cycle_start + np.concatenate(([0.0], np.cumsum(y)[:-1])) * YEAR_DAYS for y in years
+        )
+        self.end = cycle_start + CYCLE_YEARS * YEAR_DAYS
+        self._summary: Optional[Dict[str, Any]] = None
+
+    def _period(self, level: int, i: int) -> DashaPeriod:
+        starts = self.starts[level]
+        end = starts[i + 1] if i + 1 < len(starts) else self.end
+        return DashaPeriod(
+            level=LEVELS[level],
+            lord=DASHA_LORDS[self.lords[level][i]],
+            start=_jd_to_dt(float(starts[i])),
+            end=_jd_to_dt(float(end)),
+        )
+
+    def index_at(self, when: Union[datetime, float]) -> Optional[Tuple[int, int, int]]:
+        """Period indexes (maha, antar, pratyantar) containing `when`, or None outside the cycle."""
+        jd = _dt_to_jd(when) if isinstance(when, datetime) else float(when)
+        if not (self.starts[0][0] <= jd < self.end):
+            return None
+        return tuple(int(np.searchsorted(s, jd, side="right")) - 1 for s in self.starts)
+
+    def periods_at(self, when: Union[datetime, float]) -> List[DashaPeriod]:
+        """[mahadasha, antardasha, pratyantardasha] running at `when` (empty outside the cycle)."""
+        idx = self.index_at(when)
+        if idx is None:
+            return []
+        return [self._period(level, i) for level, i in enumerate(idx)]
+
+    def mahadashas(self) -> List[DashaPeriod]:
+        return [self._period(0, i) for i in range(9)]
+
+    def antardashas(self, maha_index: int) -> List[DashaPeriod]:
+        return [self._period(1, maha_index * 9 + j) for j in range(9)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Compact summary: birth balance and the mahadasha sequence.
+        Built once per timeline; the returned dict is shared, treat it as read-only.
+        """
+        if self._summary is None:
+            self._summary = {
+                "system": "vimshottari",
+                "balance_at_birth_years": round(self.balance_years, 4),
+                "mahadashas": [p.to_dict() for p in self.mahadashas()],
+            }
+        return self._summary
+
+
+@lru_cache(maxsize=4096)
+def vimshottari(birth_utc: str, moon_lon: float) -> DashaTimeline:
+    """Memoized timeline for a chart (birth UTC ISO string, sidereal Moon longitude)."""
+    return DashaTimeline(_dt_to_jd(datetime.fromisoformat(birth_utc)), moon_lon)
+
+
+def dasha_for_chart_dict(chart: Dict[str, Any]) -> Optional[DashaTimeline]:
+    """Timeline from a serialized chart (VedicChart.to_dict()); None if the Moon is missing."""
+    moon = next((p for p in chart.get("planets", []) if p.get("name") == "Moon"), None)
+    if moon is None or not chart.get("utc_time"):
+        return None
+    return vimshottari(chart["utc_time"], float(moon["lon"]))
@@ -4,21 +4,25 @@ Handles all database operations for charts, conversations, and logging.
 """
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import Dict, Any, Optional, List
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Optional, List
 from datetime import datetime
 import uuid
 
 from dotenv import load_dotenv
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from .schemas import ChartFeatures
+
 # Load environment variables from parent directory (root)
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
 # Import Supabase client
 try:
-    from supabase import create_client, Client
+    from supabase import AsyncClient, Client, acreate_client, create_client
     
     SUPABASE_URL = os.getenv("SUPABASE_URL")
     SUPABASE_KEY = os.getenv("SUPABASE_KEY")
@@ -36,23 +40,60 @@ except ImportError:
     SUPABASE_ENABLED = False
     print("⚠ Supabase not installed (pip install supabase)")
 
+# Async client for the async functions below, so request handlers never block
+# on database I/O. The sync `supabase` client stays for scripts and sync helpers.
+_async_supabase: Optional[AsyncClient] = None
+_async_supabase_lock = asyncio.Lock()
+
+
+async def get_async_supabase() -> AsyncClient:
+    """Shared async client, created on first use."""
+    global _async_supabase
+    if _async_supabase is None:
+        # Concurrent first requests must not each create (and leak) a client
+        async with _async_supabase_lock:
+            if _async_supabase is None:
+                _async_supabase = await acreate_client(SUPABASE_URL, SUPABASE_KEY)
+    return _async_supabase
+
 
 # ============================================================================
 # BIRTH CHARTS
 # ============================================================================
 
+# Set once an insert shows birth_charts predates the feature columns
+_FEATURE_COLUMNS_MISSING = False
+
+
+def _is_missing_column(e: Exception) -> bool:
+    """PostgREST (PGRST204) or Postgres (42703) error for a column the table doesn't have."""
+    return getattr(e, "code", None) in ("PGRST204", "42703")
+
+
 async def save_birth_chart(
     chart_data: Dict[str, Any],
     session_id: str,
     user_id: Optional[str] = None,
     ip_address: Optional[str] = None,
-    user_agent: Optional[str] = None
+    user_agent: Optional[str] = None,
+    features: Optional[ChartFeatures] = None,
 ) -> Optional[str]:
-    """Save a calculated birth chart to database."""
+    """
+    Save a calculated birth chart to database.
+    features (chart.features) is stored as typed columns; when omitted it is
+    derived from chart_data. Databases without the feature columns (the
+    supabase_schema.sql ALTER not applied yet) get the chart without them.
+    """
+    global _FEATURE_COLUMNS_MISSING
     if not SUPABASE_ENABLED:
         return None
     
     try:
+        from .chart import features_for_chart_dict
+        from .match_index import candidate_index
+
+        features = features or features_for_chart_dict(chart_data)
+
         # Extract birth info from chart
         name = chart_data.get("name", "")
         
@@ -68,14 +109,135 @@ async def save_birth_chart(
             "user_agent": user_agent,
             "created_at": datetime.utcnow().isoformat()
         }
+        if features is not None and not _FEATURE_COLUMNS_MISSING:
+            birth_data.update(features.to_dict())
         
-        result = supabase.table("birth_charts").insert(birth_data).execute()
-        return result.data[0]["id"] if result.data else None
+        db = await get_async_supabase()
+        try:
+            result = await db.table("birth_charts").insert(birth_data).execute()
+        except Exception as e:
+            if _FEATURE_COLUMNS_MISSING or features is None or not _is_missing_column(e):
+                raise
+            _FEATURE_COLUMNS_MISSING = True
+            print(f"⚠ birth_charts has no feature columns (apply supabase_schema.sql); saving charts without them: {e}")
+            for column in CHART_FEATURE_COLUMNS:
+                birth_data.pop(column, None)
+            result = await db.table("birth_charts").insert(birth_data).execute()
+        chart_id = result.data[0]["id"] if result.data else None
+        if chart_id and features is not None:
+            candidate_index.add(str(chart_id), features.moon_pada_index)
+        return chart_id
     except Exception as e:
         print(f"Error saving birth chart: {e}")
         return None
 
 
+async def delete_birth_chart(chart_id: str) -> bool:
+    """Delete a stored birth chart and drop it from the matchmaking index."""
+    from .match_index import candidate_index
+    candidate_index.remove(chart_id)
+    if not SUPABASE_ENABLED:
+        return False
+    
+    try:
+        db = await get_async_supabase()
+        result = await db.table("birth_charts").delete().eq("id", chart_id).execute()
+        return bool(result.data)
+    except Exception as e:
+        print(f"Error deleting birth chart: {e}")
+        return False
+
+
+# Typed ChartFeatures columns of birth_charts (moon_pada_index is generated)
+CHART_FEATURE_COLUMNS = (
+    "asc_sign", "moon_sign", "moon_nakshatra", "moon_pada", "moon_pada_index",
+    "mercury_sign", "venus_sign", "mars_sign", "saturn_house", "mars_house",
+    "seventh_lord_house", "manglik",
+)
+
+
+def _with_moons(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add "moon" (chart_data->moon) to rows whose feature columns aren't filled yet."""
+    missing = [row["id"] for row in rows if row.get("moon_pada_index") is None and "moon" not in row]
+    if missing:
+        result = supabase.table("birth_charts").select("id, moon:chart_data->moon").in_("id", missing).execute()
+        moons = {r["id"]: r.get("moon") for r in result.data or []}
+        for row in rows:
+            if row["id"] in moons:
+                row["moon"] = moons[row["id"]]
+    return rows
+
+
+def iter_chart_features(page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Yield {"id", <CHART_FEATURE_COLUMNS>} for every stored chart, paging
+    through birth_charts without reading chart_data. Rows saved before the
+    feature columns existed (not backfilled yet) have them None and carry
+    "moon" (chart_data->moon) instead, so they can still be indexed.
+    Database errors propagate: a partial load must not pass for a full one.
+    """
+    if not SUPABASE_ENABLED:
+        return
+    
+    global _FEATURE_COLUMNS_MISSING
+    last_id = None
+    while True:
+        # Without the feature columns (schema not migrated) only the Moon is read
+        columns = "id, moon:chart_data->moon" if _FEATURE_COLUMNS_MISSING else ", ".join(("id",) + CHART_FEATURE_COLUMNS)
+        try:
+            # Keyset pagination: rows inserted meanwhile can't shift later pages
+            query = supabase.table("birth_charts").select(columns).order("id").limit(page_size)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = _with_moons(query.execute().data or [])
+        except Exception as e:
+            if not _FEATURE_COLUMNS_MISSING and _is_missing_column(e):
+                _FEATURE_COLUMNS_MISSING = True
+                continue
+            raise
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+def backfill_chart_features(page_size: int = 500) -> int:
+    """Fill the feature columns of older rows from their chart_data. Returns rows updated."""
+    if not SUPABASE_ENABLED:
+        return 0
+    
+    from .chart import features_for_chart_dict
+
+    updated = 0
+    last_id = None
+    while True:
+        try:
+            # Keyset pagination: rows whose chart_data can't be parsed stay null
+            # and must not be fetched again
+            query = (
+                supabase.table("birth_charts")
+                .select("id, chart_data")
+                .is_("moon_nakshatra", "null")
+                .order("id")
+                .limit(page_size)
+            )
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = query.execute().data or []
+            for row in rows:
+                features = features_for_chart_dict(row["chart_data"] or {})
+                if features is None:
+                    continue
+                supabase.table("birth_charts").update(features.to_dict()).eq("id", row["id"]).execute()
+                updated += 1
+        except Exception as e:
+            print(f"Error backfilling chart features: {e}")
+            return updated
+        if len(rows) < page_size:
+            return updated
+        last_id = rows[-1]["id"]
+
+
 # ============================================================================
 # COMPATIBILITY QUERIES
 # ============================================================================
@@ -107,7 +269,8 @@ async def save_compatibility_query(
             "created_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("compatibility_queries").insert(query_data).execute()
+        db = await get_async_supabase()
+        result = await db.table("compatibility_queries").insert(query_data).execute()
         return result.data[0]["id"] if result.data else None
     except Exception as e:
         print(f"Error saving compatibility query: {e}")
@@ -140,7 +303,8 @@ async def create_conversation(
             "created_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("chat_conversations").insert(conversation_data).execute()
+        db = await get_async_supabase()
+        result = await db.table("chat_conversations").insert(conversation_data).execute()
         return result.data[0]["id"] if result.data else None
     except Exception as e:
         print(f"Error creating conversation: {e}")
@@ -173,7 +337,8 @@ async def save_chat_message(
             "created_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("chat_messages").insert(message_data).execute()
+        db = await get_async_supabase()
+        result = await db.table("chat_messages").insert(message_data).execute()
         return result.data[0]["id"] if result.data else None
     except Exception as e:
         print(f"Error saving chat message: {e}")
@@ -216,7 +381,8 @@ async def log_api_call(
             "created_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("api_logs").insert(log_data).execute()
+        db = await get_async_supabase()
+        result = await db.table("api_logs").insert(log_data).execute()
         return result.data[0]["id"] if result.data else None
     except Exception as e:
         print(f"Error logging API call: {e}")
@@ -249,7 +415,8 @@ async def save_feedback(
             "created_at": datetime.utcnow().isoformat()
         }
         
-        result = supabase.table("feedback").insert(feedback_data).execute()
+        db = await get_async_supabase()
+        result = await db.table("feedback").insert(feedback_data).execute()
         return result.data[0]["id"] if result.data else None
     except Exception as e:
         print(f"Error saving feedback: {e}")
@@ -284,3 +451,12 @@ def get_popular_questions(limit: int = 20) -> List[Dict[str, Any]]:
     except Exception as e:
         print(f"Error fetching popular questions: {e}")
         return []
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] != ["backfill"]:
+        print("Usage: python -m backend.database backfill")
+        sys.exit(2)
+    print(f"✓ Backfilled chart features for {backfill_chart_features()} birth charts")
@@ -0,0 +1,125 @@
+"""
+Response encodings
+JSON stays the default. A client sending Accept: application/msgpack gets
+the same document as MessagePack, and ?layout=columnar replaces the chart's
+record lists (planets, mahadashas) with parallel arrays keyed by field name.
+Both are opt-in per request, so existing JSON clients see identical bytes.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgpack
+    MSGPACK_ENABLED = True
+except ImportError:
+    msgpack = None
+    MSGPACK_ENABLED = False
+    print("⚠ msgpack not installed (pip install msgpack); MessagePack requests get JSON")
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+MSGPACK = "application/msgpack"
+_MSGPACK_TYPES = {MSGPACK, "application/x-msgpack", "application/vnd.msgpack"}
+LAYOUTS = ("nested", "columnar")
+
+
+def columnar_records(rows: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """[{"name": "Sun", "lon": 30.4}, ...] -> {"name": ["Sun", ...], "lon": [30.4, ...]}"""
+    keys: Dict[str, None] = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    return {k: [row.get(k) for row in rows] for k in keys}
+
+
+def columnar_chart(chart: Dict[str, Any]) -> Dict[str, Any]:
+    """A chart dict (VedicChart.to_dict shape) with its record lists as parallel arrays."""
+    out = dict(chart, layout="columnar")
+    if isinstance(out.get("planets"), list):
+        out["planets"] = columnar_records(out["planets"])
+    dasha = out.get("dasha")
+    if isinstance(dasha, dict) and isinstance(dasha.get("mahadashas"), list):
+        out["dasha"] = dict(dasha, mahadashas=columnar_records(dasha["mahadashas"]))
+    return out
+
+
+def columnar_body(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Columnar layout for any response carrying charts: a chart, {"chart": ...} or {"charts": {...}}."""
+    if "planets" in body:
+        return columnar_chart(body)
+    out = dict(body)
+    if isinstance(out.get("chart"), dict):
+        out["chart"] = columnar_chart(out["chart"])
+    if isinstance(out.get("charts"), dict):
+        out["charts"] = {k: columnar_chart(v) for k, v in out["charts"].items()}
+    return out
+
+
+def _accept_q(accept: str) -> Dict[str, float]:
+    """Media type -> quality from an Accept header."""
+    q: Dict[str, float] = {}
+    for part in accept.split(","):
+        media, *params = [p.strip() for p in part.split(";")]
+        weight = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    weight = float(param[2:])
+                except ValueError:
+                    weight = 0.0
+        if media:
+            q[media.lower()] = max(weight, q.get(media.lower(), 0.0))
+    return q
+
+
+@dataclass(frozen=True)
+class Representation:
+    """How a response body is written: MessagePack or JSON, nested or columnar charts."""
+    use_msgpack: bool = False
+    columnar: bool = False
+
+    @property
+    def media_type(self) -> str:
+        return MSGPACK if self.use_msgpack else JSON
+
+    @property
+    def etag_suffix(self) -> str:
+        # The default representation keeps the bare ETag
+        return ("-mp" if self.use_msgpack else "") + ("-col" if self.columnar else "")
+
+    def body(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return columnar_body(body) if self.columnar else body
+
+    def encode(self, body: Dict[str, Any]) -> bytes:
+        """One document; JSON bytes match FastAPI's JSONResponse."""
+        body = self.body(body)
+        if self.use_msgpack:
+            return msgpack.packb(body, use_bin_type=True)
+        return json.dumps(body, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+    def encode_item(self, item: Dict[str, Any]) -> bytes:
+        """One element of a streamed batch: an NDJSON line, or a MessagePack map (streams concatenate them)."""
+        item = self.body(item)
+        if self.use_msgpack:
+            return msgpack.packb(item, use_bin_type=True)
+        return json.dumps(item, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    @property
+    def stream_media_type(self) -> str:
+        return MSGPACK if self.use_msgpack else NDJSON
+
+
+def negotiate(accept: Optional[str], layout: Optional[str] = None) -> Representation:
+    """
+    Representation for an Accept header and ?layout= value. MessagePack wins
+    when the client names it with at least the quality it gives JSON;
+    wildcards alone keep JSON.
+    """
+    if layout is not None and layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Expected one of {list(LAYOUTS)}")
+    q = _accept_q(accept or "")
+    q_msgpack = max((q.get(t, 0.0) for t in _MSGPACK_TYPES), default=0.0)
+    wants_msgpack = MSGPACK_ENABLED and q_msgpack > 0 and q_msgpack >= q.get(JSON, 0.0)
+    return Representation(use_msgpack=wants_msgpack, columnar=layout == "columnar")
@@ -0,0 +1,342 @@
+"""
+Transit event finder
+Sign ingresses, nakshatra ingresses and stations (retrograde / direct) of the
+grahas inside a date range, streamed lazily in time order.
+
+Each body's range is split into stretches of monotonic motion: Sun, Moon and
+the mean node never reverse, the other planets are bracketed by sampling their
+speed at a step shorter than their shortest retrograde/direct phase and
+root-finding the station where the speed changes sign. Inside a monotonic
+stretch every boundary crossed follows from the endpoint longitudes and is
+located by bracketed root-finding on swe.calc_ut, so short Moon transits are
+never stepped over.
+
+The true node reverses direction many times a day, so it gets no station
+events; its ingresses are bracketed on a 1-day longitude grid.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import swisseph as swe
+
+from .chart import (
+    NAKSHATRAS,
+    PLANET_COLUMNS,
+    SIGNS,
+    _calc_flags,
+    _calc_planet,
+    _julian_day_ut,
+    _planets_spec,
+)
+from .timezones import UTC
+
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+EVENT_KINDS = ("sign_ingress", "nakshatra_ingress", "station_retrograde", "station_direct")
+
+# Speed sample step (days) for bodies that turn retrograde; each is under half
+# the shortest retrograde or direct phase (Mercury ~20 d, Venus ~41 d, Mars ~60 d,
+# Jupiter ~118 d, Saturn ~134 d over 1900-1930)
+STATION_STEP_DAYS: Dict[str, float] = {
+    "Mercury": 5.0,
+    "Venus": 10.0,
+    "Mars": 15.0,
+    "Jupiter": 30.0,
+    "Saturn": 30.0,
+}
+_TRUE_NODE_STEP_DAYS = 1.0
+
+# Events are produced (and yielded) one chunk at a time; the Moon moves < 180 deg per chunk
+_CHUNK_DAYS = 7.0
+# Root-finding stops once the bracket is narrower than this
+_ROOT_TOLERANCE_DAYS = 0.5 / 86400.0
+_MAX_ITERATIONS = 60
+
+_J2000 = 2451545.0
+_J2000_DT = datetime(2000, 1, 1, 12, tzinfo=UTC)
+
+
+@dataclass(frozen=True)
+class TransitEvent:
+    """One ingress or station at an exact instant (first second on the new side)."""
+    utc_time: str
+    jd_ut: float
+    kind: str        # one of EVENT_KINDS
+    body: str
+    from_value: str  # sign / nakshatra left, or "direct" / "retrograde"
+    to_value: str
+    longitude: float  # sidereal longitude at the event
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "utc_time": self.utc_time,
+            "kind": self.kind,
+            "body": self.body,
+            "from": self.from_value,
+            "to": self.to_value,
+            "longitude": round(self.longitude, 6),
+        }
+
+
+def _jd_to_dt(jd_ut: float, ceil: bool = False) -> datetime:
+    """UT Julian day -> aware UTC datetime, rounded (or ceiled) to the second."""
+    dt = _J2000_DT + timedelta(days=jd_ut - _J2000)
+    step = (dt.microsecond > 0) if ceil else round(dt.microsecond / 1e6)
+    return dt.replace(microsecond=0) + timedelta(seconds=step)
+
+
+def _wrap180(x: float) -> float:
+    return (x + 180.0) % 360.0 - 180.0
+
+
+def _boundaries_crossed(lon_a: float, delta: float, span: float) -> List[int]:
+    """
+    Indexes k of boundaries k*span crossed when moving from lon_a by delta
+    (lon_a unwrapped, delta may be negative).
+    """
+    if delta > 0:
+        return list(range(math.floor(lon_a / span) + 1, math.floor((lon_a + delta) / span) + 1))
+    if delta < 0:
+        return list(range(math.floor(lon_a / span), math.floor((lon_a + delta) / span), -1))
+    return []
+
+
+def _find_root(g: Callable[[float], float], a: float, b: float, ga: float, gb: float) -> float:
+    """
+    Instant in [a, b] where g changes sign (Illinois regula falsi, falls back
+    to bisection), given g(a)=ga and g(b)=gb. Returns the first instant on
+    the far side.
+    """
+    if ga == 0.0:
+        return a
+    side_a = ga > 0
+    last = 0
+    for _ in range(_MAX_ITERATIONS):
+        if b - a < _ROOT_TOLERANCE_DAYS or ga == gb:
+            break
+        t = b - gb * (b - a) / (gb - ga)
+        if not (a < t < b):
+            t = 0.5 * (a + b)
+        gt = g(t)
+        if (gt > 0) == side_a:
+            a, ga = t, gt
+            if last == -1:
+                gb *= 0.5
+            last = -1
+        else:
+            b, gb = t, gt
+            if last == 1:
+                ga *= 0.5
+            last = 1
+    return b
+
+
+def _find_crossing(
+    f: Callable[[float], float], target: float, a: float, b: float, fa: float, fb: float
+) -> float:
+    """Instant in [a, b] where angle f crosses target, given f(a)=fa and f(b)=fb."""
+    return _find_root(
+        lambda t: _wrap180(f(t) - target), a, b, _wrap180(fa - target), _wrap180(fb - target)
+    )
+
+
+def _to_jd(dt: datetime) -> float:
+    """Aware datetime (naive is taken as UTC) -> UT Julian day."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    dt = dt.astimezone(UTC)
+    return _julian_day_ut(dt) + dt.microsecond / 86400e6
+
+
+class _Track:
+    """One body's longitude/speed as functions of jd, with a running sample cursor."""
+
+    def __init__(self, body: str, pid: int, offset: float, flags: int):
+        self.body = body
+        self.pid = pid
+        self.offset = offset
+        self.flags = flags
+        self.station_step = STATION_STEP_DAYS.get(body)
+        self.grid_step = _TRUE_NODE_STEP_DAYS if pid == swe.TRUE_NODE else None
+        self._last: Optional[Tuple[float, float, float]] = None  # (jd, lon, speed)
+
+    def sample(self, jd: float) -> Tuple[float, float]:
+        if self._last is not None and self._last[0] == jd:
+            return self._last[1], self._last[2]
+        lon, speed = _calc_planet(jd, self.pid, self.flags)
+        return (lon + self.offset) % 360.0, speed
+
+    def lon(self, jd: float) -> float:
+        return self.sample(jd)[0]
+
+    def speed(self, jd: float) -> float:
+        return self.sample(jd)[1]
+
+    def segments(self, a: float, b: float) -> Iterator[Tuple[float, float, float, float, Optional[float]]]:
+        """
+        Monotonic stretches covering [a, b] as (t0, lon0, t1, lon1, station_speed_before),
+        where station_speed_before is set when the stretch ends at a station.
+        """
+        lon_a, speed_a = self.sample(a)
+        step = self.station_step or self.grid_step
+        grid = [a]
+        if step:
+            t = (math.floor(a / step) + 1) * step
+            while t < b:
+                grid.append(t)
+                t += step
+        grid.append(b)
+
+        t0, lon0, s0 = a, lon_a, speed_a
+        for t1 in grid[1:]:
+            lon1, s1 = self.sample(t1)
+            if self.station_step and (s0 > 0) != (s1 > 0) and s0 != 0.0:
+                ts = _find_root(self.speed, t0, t1, s0, s1)
+                lon_s, _ = self.sample(ts)
+                yield t0, lon0, ts, lon_s, s0
+                t0, lon0 = ts, lon_s
+            yield t0, lon0, t1, lon1, None
+            t0, lon0, s0 = t1, lon1, s1
+        self._last = (b, lon0, s0)
+
+
+def _events_in_chunk(track: _Track, a: float, b: float, kinds: Sequence[str]) -> List[TransitEvent]:
+    """Events of one body in [a, b]; crossings found here are never re-found in the next chunk."""
+    out: List[TransitEvent] = []
+    spans = []
+    if "sign_ingress" in kinds:
+        spans.append(("sign_ingress", 30.0, SIGNS, 12))
+    if "nakshatra_ingress" in kinds:
+        spans.append(("nakshatra_ingress", NAKSHATRA_SPAN, NAKSHATRAS, 27))
+
+    for t0, lon0, t1, lon1, station_speed in track.segments(a, b):
+        delta = _wrap180(lon1 - lon0)
+        for kind, span, names, n in spans:
+            lo, flo = t0, lon0
+            for k in _boundaries_crossed(lon0, delta, span):
+                new_k, old_k = (k, k - 1) if delta > 0 else (k - 1, k)
+                t = _find_crossing(track.lon, (k * span) % 360.0, lo, t1, flo, lon1)
+                out.append(TransitEvent(
+                    utc_time=_jd_to_dt(t, ceil=True).isoformat(),
+                    jd_ut=t,
+                    kind=kind,
+                    body=track.body,
+                    from_value=names[old_k % n],
+                    to_value=names[new_k % n],
+                    longitude=(k * span) % 360.0,
+                ))
+                lo, flo = t, track.lon(t)
+        if station_speed is not None:
+            going_retro = station_speed > 0
+            out.append(TransitEvent(
+                utc_time=_jd_to_dt(t1, ceil=True).isoformat(),
+                jd_ut=t1,
+                kind="station_retrograde" if going_retro else "station_direct",
+                body=track.body,
+                from_value="direct" if going_retro else "retrograde",
+                to_value="retrograde" if going_retro else "direct",
+                longitude=lon1,
+            ))
+    return out
+
+
+def iter_transit_events(
+    start: datetime,
+    end: datetime,
+    bodies: Optional[Sequence[str]] = None,
+    kinds: Optional[Sequence[str]] = None,
+    high_precision: bool = False,
+    use_true_node: bool = False,
+) -> Iterator[TransitEvent]:
+    """
+    Lazily yield every event in [start, end) in time order.
+    bodies: subset of PLANET_COLUMNS (default all nine); kinds: subset of EVENT_KINDS.
+    Naive datetimes are taken as UTC.
+    """
+    bodies = list(PLANET_COLUMNS) if bodies is None else list(bodies)
+    kinds = list(EVENT_KINDS) if kinds is None else list(kinds)
+    for name in bodies:
+        if name not in PLANET_COLUMNS:
+            raise ValueError(f"Unknown body '{name}'. Expected one of {', '.join(PLANET_COLUMNS)}")
+    for kind in kinds:
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown event kind '{kind}'. Expected one of {', '.join(EVENT_KINDS)}")
+
+    jd_a, jd_b = _to_jd(start), _to_jd(end)
+    if jd_b <= jd_a:
+        return
+
+    swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
+    flags = _calc_flags(high_precision)
+    pids = dict(_planets_spec(use_true_node))
+    pids["Ketu"] = pids["Rahu"]
+    tracks = [_Track(name, pids[name], 180.0 if name == "Ketu" else 0.0, flags) for name in bodies]
+
+    a = jd_a
+    while a < jd_b:
+        b = min(a + _CHUNK_DAYS, jd_b)
+        chunk: List[TransitEvent] = []
+        for track in tracks:
+            chunk.extend(_events_in_chunk(track, a, b, kinds))
+        chunk.sort(key=lambda e: e.jd_ut)
+        yield from chunk
+        a = b
+
+
+def find_ingress(
+    body: str,
+    target: str,
+    start: datetime,
+    end: datetime,
+    high_precision: bool = False,
+    use_true_node: bool = False,
+) -> Optional[TransitEvent]:
+    """
+    First time in [start, end) that body enters target (a sign or nakshatra name),
+    or None if it does not.
+    """
+    if target in SIGNS:
+        kind = "sign_ingress"
+    elif target in NAKSHATRAS:
+        kind = "nakshatra_ingress"
+    else:
+        raise ValueError(f"Unknown sign or nakshatra '{target}'")
+    events = iter_transit_events(start, end, [body], [kind], high_precision, use_true_node)
+    return next((e for e in events if e.to_value == target), None)
+
+
+# Bodies worth mentioning in prompts: the Moon changes sign every ~2.5 days
+_SUMMARY_BODIES = ("Sun", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Rahu", "Ketu")
+
+
+def transit_summary(start: datetime, days: int = 30) -> List[str]:
+    """
+    Human-readable sign ingresses and stations of the slower grahas in
+    [start, start + days), e.g. "Jun 04: Mars enters Leo".
+    """
+    lines = []
+    events = iter_transit_events(
+        start, start + timedelta(days=days), _SUMMARY_BODIES,
+        ("sign_ingress", "station_retrograde", "station_direct"),
+    )
+    for e in events:
+        day = _jd_to_dt(e.jd_ut).strftime("%b %d")
+        if e.kind == "sign_ingress":
+            lines.append(f"{day}: {e.body} enters {e.to_value}")
+        else:
+            lines.append(f"{day}: {e.body} turns {e.to_value} in {SIGNS[int(e.longitude // 30) % 12]}")
+    return lines
+
+
+@lru_cache(maxsize=4)
+def daily_transit_summary(day: str, days: int = 30) -> Tuple[str, ...]:
+    """
+    transit_summary from 00:00 UTC of an ISO date, cached per day: LLM
+    prompts include it on every call and the search takes milliseconds.
+    """
+    return tuple(transit_summary(datetime.fromisoformat(day), days=days))
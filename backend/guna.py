@@ -3,13 +3,17 @@ Ashtakoota (8-fold) Guna Matching
 Traditional Vedic compatibility scoring out of 36 points
 """
 from __future__ import annotations
-from typing import Dict, List, Tuple, Any
-from dataclasses import dataclass, asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple, Any, Optional
+from dataclasses import dataclass
+
+import numpy as np
 
 from .schemas import VedicChart
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GunaResult:
     """Result of Ashtakoota Guna matching"""
     total_points: float
@@ -19,7 +23,14 @@ class GunaResult:
     verdict: str
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Results are cached per pada pair (guna_for_padas), so callers get their own kootas
+        return {
+            "total_points": self.total_points,
+            "max_points": self.max_points,
+            "percentage": self.percentage,
+            "kootas": {name: dict(koota) for name, koota in self.kootas.items()},
+            "verdict": self.verdict,
+        }
 
 
 # Nakshatra data (27 nakshatras)
@@ -238,6 +249,139 @@ def _calc_nadi(nak_a: int, nak_b: int) -> Tuple[float, str]:
     return 8.0, f"Different nadis ({nadi_names[nadi_a]} - {nadi_names[nadi_b]})"
 
 
+# ============================================================================
+# PADA-LEVEL LOOKUP TABLE
+# Every koota depends only on the two Moon signs or the two Moon nakshatras,
+# and both follow from the nakshatra-pada (108 per zodiac: sign = pada // 9,
+# nakshatra = pada // 4). The whole 108 x 108 pairing is built once at import
+# from the koota functions above, so matching is an array lookup.
+# ============================================================================
+
+PADA_COUNT = 108
+KOOTAS = ("varna", "vashya", "tara", "yoni", "graha_maitri", "gana", "bhakoot", "nadi")
+KOOTA_MAX = (1, 2, 3, 4, 5, 6, 7, 8)
+
+_KOOTA_FUNCS = (
+    (_calc_varna, "sign"),
+    (_calc_vashya, "sign"),
+    (_calc_tara, "nakshatra"),
+    (_calc_yoni, "nakshatra"),
+    (_calc_graha_maitri, "sign"),
+    (_calc_gana, "nakshatra"),
+    (_calc_bhakoot, "sign"),
+    (_calc_nadi, "nakshatra"),
+)
+
+
+def _build_guna_tables() -> Tuple[np.ndarray, np.ndarray, Tuple[Tuple[Tuple[float, str], ...], ...]]:
+    """
+    (points (108,108,8) float64, outcome ids (108,108,8) int16, outcomes per koota)
+    where outcomes[k][id] is the (points, description) the koota function returned.
+    """
+    pada = np.arange(PADA_COUNT)
+    index_of = {"sign": pada // 9, "nakshatra": pada // 4}
+
+    points = np.empty((PADA_COUNT, PADA_COUNT, len(KOOTAS)), dtype=np.float64)
+    outcome_ids = np.empty((PADA_COUNT, PADA_COUNT, len(KOOTAS)), dtype=np.int16)
+    outcomes = []
+    for k, (fn, basis) in enumerate(_KOOTA_FUNCS):
+        n = 12 if basis == "sign" else 27
+        small_pts = np.empty((n, n))
+        small_ids = np.empty((n, n), dtype=np.int16)
+        seen: Dict[tuple, int] = {}
+        for a in range(n):
+            for b in range(n):
+                outcome = fn(a, b)
+                small_pts[a, b] = outcome[0]
+                # keyed with the points' type so 1 and 1.0 stay distinct in the JSON
+                small_ids[a, b] = seen.setdefault((type(outcome[0]), *outcome), len(seen))
+        idx = index_of[basis]
+        points[:, :, k] = small_pts[idx[:, None], idx[None, :]]
+        outcome_ids[:, :, k] = small_ids[idx[:, None], idx[None, :]]
+        outcomes.append(tuple(key[1:] for key in seen))
+    points.flags.writeable = False
+    outcome_ids.flags.writeable = False
+    return points, outcome_ids, tuple(outcomes)
+
+
+GUNA_POINTS, GUNA_OUTCOME_IDS, KOOTA_OUTCOMES = _build_guna_tables()
+GUNA_TOTALS = GUNA_POINTS.sum(axis=2)
+GUNA_TOTALS.flags.writeable = False
+
+_NAKSHATRA_INDEX = {name: i for i, name in enumerate(NAKSHATRAS)}
+
+
+def pada_index(nakshatra_index: int, pada: int) -> int:
+    """0..107 for nakshatra 0..26 and pada 1..4."""
+    return nakshatra_index * 4 + pada - 1
+
+
+def chart_pada_index(chart: VedicChart) -> Optional[int]:
+    """
+    Moon pada index of a chart, or None when it can't be used for the table
+    (Moon missing, unknown nakshatra, or Moon sign inconsistent with the pada
+    at a floating-point boundary).
+    """
+    moon = next((p for p in chart.planets if p.name == "Moon"), None)
+    if moon is None or chart.moon_nakshatra not in _NAKSHATRA_INDEX or not 1 <= chart.moon_pada <= 4:
+        return None
+    p = pada_index(_NAKSHATRA_INDEX[chart.moon_nakshatra], chart.moon_pada)
+    return p if p // 9 == moon.sign_index else None
+
+
+def _verdict(total: float) -> str:
+    if total >= 28:
+        return "Excellent Match"
+    elif total >= 21:
+        return "Good Match"
+    elif total >= 18:
+        return "Average Match"
+    elif total >= 14:
+        return "Below Average"
+    return "Not Recommended"
+
+
+def _make_result(points: List[float], descriptions: List[str]) -> GunaResult:
+    total = sum(points)
+    kootas = {
+        name: {"points": pts, "max": mx, "description": desc}
+        for name, mx, pts, desc in zip(KOOTAS, KOOTA_MAX, points, descriptions)
+    }
+    return GunaResult(
+        total_points=total,
+        max_points=36,
+        percentage=round((total / 36) * 100, 1),
+        kootas=kootas,
+        verdict=_verdict(total),
+    )
+
+
+@lru_cache(maxsize=None)
+def guna_for_padas(pada_a: int, pada_b: int) -> GunaResult:
+    """GunaResult for two Moon pada indexes (boy, girl); at most 108*108 distinct results."""
+    outcomes = [KOOTA_OUTCOMES[k][i] for k, i in enumerate(GUNA_OUTCOME_IDS[pada_a, pada_b].tolist())]
+    return _make_result([pts for pts, _ in outcomes], [desc for _, desc in outcomes])
+
+
+def guna_table_arrays() -> Dict[str, np.ndarray]:
+    """The lookup table as NumPy arrays (indexed [pada_a, pada_b, koota])."""
+    return {
+        "points": GUNA_POINTS,
+        "totals": GUNA_TOTALS,
+        "outcome_ids": GUNA_OUTCOME_IDS,
+        "koota_max": np.array(KOOTA_MAX, dtype=np.int8),
+    }
+
+
+def save_guna_table(path: Path) -> Path:
+    """Write the lookup table to a .npz file (outcome descriptions as per-koota string arrays)."""
+    arrays = guna_table_arrays()
+    for name, outcomes in zip(KOOTAS, KOOTA_OUTCOMES):
+        arrays[f"descriptions_{name}"] = np.array([desc for _, desc in outcomes])
+    np.savez_compressed(path, **arrays)
+    return Path(path)
+
+
 def calculate_guna_milan(chart_a: VedicChart, chart_b: VedicChart) -> GunaResult:
     """
     Calculate Ashtakoota Guna matching between two charts.
@@ -249,6 +393,15 @@ def calculate_guna_milan(chart_a: VedicChart, chart_b: VedicChart) -> GunaResult
     Returns:
         GunaResult with 36-point breakdown
     """
+    pada_a = chart_pada_index(chart_a)
+    pada_b = chart_pada_index(chart_b)
+    if pada_a is not None and pada_b is not None:
+        return guna_for_padas(pada_a, pada_b)
+    return _calculate_guna_milan_direct(chart_a, chart_b)
+
+
+def _calculate_guna_milan_direct(chart_a: VedicChart, chart_b: VedicChart) -> GunaResult:
+    """Koota-by-koota evaluation (used to build the table and for charts it can't index)."""
     # Get Moon sign indices
     moon_a = next((p for p in chart_a.planets if p.name == "Moon"), None)
     moon_b = next((p for p in chart_b.planets if p.name == "Moon"), None)
@@ -264,45 +417,106 @@ def calculate_guna_milan(chart_a: VedicChart, chart_b: VedicChart) -> GunaResult
     nak_b = _get_nakshatra_index(chart_b.moon_nakshatra)
     
     # Calculate all 8 kootas
-    varna_pts, varna_desc = _calc_varna(sign_a, sign_b)
-    vashya_pts, vashya_desc = _calc_vashya(sign_a, sign_b)
-    tara_pts, tara_desc = _calc_tara(nak_a, nak_b)
-    yoni_pts, yoni_desc = _calc_yoni(nak_a, nak_b)
-    maitri_pts, maitri_desc = _calc_graha_maitri(sign_a, sign_b)
-    gana_pts, gana_desc = _calc_gana(nak_a, nak_b)
-    bhakoot_pts, bhakoot_desc = _calc_bhakoot(sign_a, sign_b)
-    nadi_pts, nadi_desc = _calc_nadi(nak_a, nak_b)
-    
-    total = varna_pts + vashya_pts + tara_pts + yoni_pts + maitri_pts + gana_pts + bhakoot_pts + nadi_pts
-    percentage = round((total / 36) * 100, 1)
-    
-    # Verdict based on score
-    if total >= 28:
-        verdict = "Excellent Match"
-    elif total >= 21:
-        verdict = "Good Match"
-    elif total >= 18:
-        verdict = "Average Match"
-    elif total >= 14:
-        verdict = "Below Average"
-    else:
-        verdict = "Not Recommended"
-    
-    kootas = {
-        "varna": {"points": varna_pts, "max": 1, "description": varna_desc},
-        "vashya": {"points": vashya_pts, "max": 2, "description": vashya_desc},
-        "tara": {"points": tara_pts, "max": 3, "description": tara_desc},
-        "yoni": {"points": yoni_pts, "max": 4, "description": yoni_desc},
-        "graha_maitri": {"points": maitri_pts, "max": 5, "description": maitri_desc},
-        "gana": {"points": gana_pts, "max": 6, "description": gana_desc},
-        "bhakoot": {"points": bhakoot_pts, "max": 7, "description": bhakoot_desc},
-        "nadi": {"points": nadi_pts, "max": 8, "description": nadi_desc},
-    }
-    
-    return GunaResult(
-        total_points=total,
-        max_points=36,
-        percentage=percentage,
-        kootas=kootas,
-        verdict=verdict,
-    )
+    results = [
+        fn(sign_a, sign_b) if basis == "sign" else fn(nak_a, nak_b)
+        for fn, basis in _KOOTA_FUNCS
+    ]
+    return _make_result([pts for pts, _ in results], [desc for _, desc in results])
+
+
+# ============================================================================
+# ONE-TO-MANY MATCHING
+# ============================================================================
+
+@dataclass(frozen=True, slots=True)
+class GunaMatch:
+    """One winner of match_one_to_many: candidate position + its full result."""
+    index: int
+    total_points: float
+    result: GunaResult
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"index": self.index, "total_points": self.total_points, "guna": self.result.to_dict()}
+
+
+def _sign_nakshatra_pada() -> np.ndarray:
+    """(Moon sign, nakshatra) -> first pada of that nakshatra lying in that sign, -1 if impossible."""
+    table = np.full((12, 27), -1, dtype=np.int16)
+    for p in range(PADA_COUNT - 1, -1, -1):
+        table[p // 9, p // 4] = p
+    return table
+
+
+_SIGN_NAKSHATRA_PADA = _sign_nakshatra_pada()
+
+
+def moon_pada(chart: VedicChart) -> int:
+    """Moon pada index used for table lookups (falls back to the nakshatra/pada fields)."""
+    p = chart_pada_index(chart)
+    if p is not None:
+        return p
+    if chart.moon_nakshatra not in _NAKSHATRA_INDEX:
+        raise ValueError(f"Unknown Moon nakshatra '{chart.moon_nakshatra}'")
+    return pada_index(_NAKSHATRA_INDEX[chart.moon_nakshatra], min(max(chart.moon_pada, 1), 4))
+
+
+def candidate_padas(candidates: np.ndarray) -> np.ndarray:
+    """
+    Normalize candidates to pada indexes: either a 1-D array of pada indexes
+    (0..107) or an (n, 2) array of (Moon sign index, Moon nakshatra index).
+    """
+    arr = np.asarray(candidates)
+    if arr.ndim == 2 and arr.shape[1] == 2:
+        padas = _SIGN_NAKSHATRA_PADA[arr[:, 0], arr[:, 1]]
+        if (padas < 0).any():
+            bad = int(np.flatnonzero(padas < 0)[0])
+            raise ValueError(f"candidates[{bad}]: nakshatra {int(arr[bad, 1])} does not fall in sign {int(arr[bad, 0])}")
+        return padas.astype(np.intp)
+    if arr.ndim != 1:
+        raise ValueError("candidates must be pada indexes (n,) or (sign, nakshatra) pairs (n, 2)")
+    if arr.size and (arr.min() < 0 or arr.max() >= PADA_COUNT):
+        raise ValueError(f"pada indexes must be in 0..{PADA_COUNT - 1}")
+    return arr.astype(np.intp)
+
+
+def chart_padas(charts: List[VedicChart]) -> np.ndarray:
+    """Compact candidate array (pada indexes) for a list of charts."""
+    return np.fromiter((moon_pada(c) for c in charts), dtype=np.intp, count=len(charts))
+
+
+def match_one_to_many(
+    chart: VedicChart,
+    candidates: np.ndarray,
+    k: int = 10,
+    min_points: float = 0.0,
+    as_boy: bool = True,
+) -> List[GunaMatch]:
+    """
+    Score one chart against many candidates and return the top-k (ties by
+    lowest candidate index), best first, skipping totals below min_points.
+    candidates: see candidate_padas(). as_boy: chart takes the boy's side
+    of calculate_guna_milan (Varna and Tara are directional).
+    Only the winners get a GunaResult.
+    """
+    if k <= 0:
+        return []
+    p = moon_pada(chart)
+    padas = candidate_padas(candidates)
+    totals = GUNA_TOTALS[p, padas] if as_boy else GUNA_TOTALS[padas, p]
+
+    eligible = np.flatnonzero(totals >= min_points)
+    scores = totals[eligible]
+    if len(eligible) > k:
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = eligible[scores > kth]
+        tied = eligible[scores == kth][: k - len(above)]
+        eligible = np.concatenate([above, tied])
+        scores = totals[eligible]
+    order = np.lexsort((eligible, -scores))
+
+    matches = []
+    for i in eligible[order].tolist():
+        pa, pb = (p, int(padas[i])) if as_boy else (int(padas[i]), p)
+        result = guna_for_padas(pa, pb)
+        matches.append(GunaMatch(index=i, total_points=result.total_points, result=result))
+    return matches
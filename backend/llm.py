@@ -61,10 +61,19 @@ ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-opus-4-5")
 
 # Helper function for temporal context
 def get_current_astrological_context() -> str:
-    """Returns current date/year for astrological context in prompts."""
+    """Returns current date/year plus upcoming transits for astrological context in prompts."""
     from datetime import datetime
     now = datetime.utcnow()
-    return f"Current Date: {now.strftime('%B %d, %Y')} (Year {now.year})"
+    context = f"Current Date: {now.strftime('%B %d, %Y')} (Year {now.year})"
+    try:
+        # Cached per UTC day, shared with llm_langchain
+        from .events import daily_transit_summary
+        lines = daily_transit_summary(now.date().isoformat(), days=30)
+    except Exception:
+        lines = []
+    if lines:
+        context += "\nUpcoming Transits (next 30 days):\n" + "\n".join(f"- {line}" for line in lines)
+    return context
 
 
 # System prompts for different contexts - CONCISE for chat experience
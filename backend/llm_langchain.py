@@ -5,9 +5,11 @@ Anthropic Claude via LangChain-Anthropic integration.
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Sequence
 from datetime import datetime
 
 # Load environment variables from parent directory (root)
@@ -127,9 +129,26 @@ else:
 # ============================================================================
 
 def get_current_astrological_context() -> str:
-    """Returns current date/year for astrological context in prompts."""
+    """Returns current date/year plus upcoming transits for astrological context in prompts."""
     now = datetime.utcnow()
-    return f"Current Date: {now.strftime('%B %d, %Y')} (Year {now.year})"
+    return f"Current Date: {now.strftime('%B %d, %Y')} (Year {now.year})" + _transit_lines(now)
+
+
+def _transit_lines(now: datetime) -> str:
+    """Upcoming ingresses/stations (next 30 days); empty if the ephemeris is unavailable."""
+    return _transit_lines_for_day(now.date().isoformat())
+
+
+def _transit_lines_for_day(day: str) -> str:
+    # One ephemeris search per UTC day instead of one per LLM call
+    try:
+        from .events import daily_transit_summary
+        lines = daily_transit_summary(day, days=30)
+    except Exception:
+        return ""
+    if not lines:
+        return ""
+    return "\nUpcoming Transits (next 30 days):\n" + "\n".join(f"- {line}" for line in lines)
 
 
 # ============================================================================
@@ -254,6 +273,14 @@ Here are things worth exploring about your chart:
 Remember: Be PERSONAL and SPECIFIC. Use their actual planetary positions. Keep it under 300 words total.""")
 ])
 
+# Compatibility insight sections in reading order: key -> (header, what to write)
+COMPATIBILITY_INSIGHT_SECTIONS = {
+    "energy": ("💑 Relationship Energy", "1-2 sentences about overall compatibility and what the Guna Milan score means for them"),
+    "strengths": ("✨ Key Strengths", "1-2 sentences about the strongest aspects — mention their best Guna scores"),
+    "watch_out": ("⚠️ Watch Out", "1-2 sentences about challenging aspects — mention specific doshas if present (Manglik, Nadi, Bhakoot)"),
+    "remedies": ("💎 Remedies", "2-3 specific remedies — gemstone for each partner, a mantra, or a specific practice"),
+}
+
 # Compatibility insights prompt template
 compatibility_insights_prompt = ChatPromptTemplate.from_messages([
     ("system", SYSTEM_PROMPT_MATCH),
@@ -263,15 +290,23 @@ compatibility_insights_prompt = ChatPromptTemplate.from_messages([
 
 Provide structured cosmic insights for this couple. Keep each section to 1-2 sentences:
 
-💑 Relationship Energy: [1-2 sentences about overall compatibility and what the Guna Milan score means for them]
+""" + "\n\n".join(f"{header}: [{brief}]" for header, brief in COMPATIBILITY_INSIGHT_SECTIONS.values()) + """
+
+Keep total response under 150 words. Use plain text, no markdown. Be specific about their scores.""")
+])
 
-✨ Key Strengths: [1-2 sentences about the strongest aspects — mention their best Guna scores]
+# One compatibility insight section on its own, so sections can be generated concurrently
+compatibility_section_prompt = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_PROMPT_MATCH),
+    ("system", "{temporal_context}"),
+    ("human", """Analysis:
+{compat_context}
 
-⚠️ Watch Out: [1-2 sentences about challenging aspects — mention specific doshas if present (Manglik, Nadi, Bhakoot)]
+Write only this section of the couple's cosmic insights, starting with its header:
 
-💎 Remedies: [2-3 specific remedies — gemstone for each partner, a mantra, or a specific practice]
+{section}
 
-Keep total response under 150 words. Use plain text, no markdown. Be specific about their scores.""")
+Keep it under 60 words. Use plain text, no markdown. Be specific about their scores.""")
 ])
 
 # ============================================================================
@@ -285,6 +320,35 @@ compatibility_chain = compatibility_chat_prompt | llm | StrOutputParser()
 # Insights chains (with higher token limit)
 chart_insights_chain = chart_insights_prompt | llm_insights | StrOutputParser()
 compatibility_insights_chain = compatibility_insights_prompt | llm_insights | StrOutputParser()
+compatibility_section_chain = compatibility_section_prompt | llm_insights | StrOutputParser()
+
+
+def _prompt_text(prompt: ChatPromptTemplate) -> str:
+    return "\n".join(
+        getattr(getattr(m, "prompt", None), "template", None) or getattr(m, "variable_name", "") for m in prompt.messages
+    )
+
+
+# Fingerprint of the model and prompts behind generated text (env overrides
+# included); part of the coalescing key for the LLM endpoints
+_MODEL_ID = next(
+    (str(v) for v in (getattr(llm_insights, a, None) for a in ("model", "deployment_name", "model_name")) if v), ""
+)
+PROMPT_VERSION = hashlib.sha256(
+    "\x00".join(
+        [LLM_PROVIDER, _MODEL_ID]
+        + [
+            _prompt_text(p)
+            for p in (
+                traits_chat_prompt,
+                compatibility_chat_prompt,
+                chart_insights_prompt,
+                compatibility_insights_prompt,
+                compatibility_section_prompt,
+            )
+        ]
+    ).encode("utf-8")
+).hexdigest()[:16]
 
 
 # ============================================================================
@@ -329,6 +393,14 @@ Moon Nakshatra: {moon_nakshatra} (Pada {moon_pada})"""
                 p_sign = p_data.get("sign", "Unknown")
                 context += f"\n{planet.capitalize()}: {p_sign}"
     
+    # Divisional charts, when the chart carries them
+    for key, varga in chart.get("vargas", {}).items():
+        placements = ", ".join(f"{p} {sign}" for p, sign in varga.get("planets", {}).items())
+        context += f"\n\n{varga.get('name', key)} ({key}): Ascendant {varga.get('ascendant', 'Unknown')}; {placements}"
+
+    # Vimshottari dasha running now (computed, so the model doesn't have to guess)
+    context += _format_current_dasha(chart)
+
     # Ayanamsa info
     ayanamsa = chart.get("ayanamsa", {})
     if ayanamsa:
@@ -341,6 +413,29 @@ Moon Nakshatra: {moon_nakshatra} (Pada {moon_pada})"""
     return context
 
 
+def _format_current_dasha(chart: Dict[str, Any]) -> str:
+    """Current maha/antar/pratyantar dasha and the next antardasha, or "" if unavailable."""
+    try:
+        from .dasha import dasha_for_chart_dict
+        timeline = dasha_for_chart_dict(chart)
+        now = datetime.utcnow()
+        periods = timeline.periods_at(now) if timeline else []
+    except Exception:
+        return ""
+    if not periods:
+        return ""
+
+    maha, antar, pratyantar = periods
+    text = "\n\nCurrent Vimshottari Dasha:"
+    text += f"\n  Mahadasha: {maha.lord} ({maha.start:%b %Y} – {maha.end:%b %Y})"
+    text += f"\n  Antardasha: {antar.lord} ({antar.start:%b %Y} – {antar.end:%b %Y})"
+    text += f"\n  Pratyantardasha: {pratyantar.lord} (until {pratyantar.end:%d %b %Y})"
+    upcoming = timeline.periods_at(antar.end)
+    if upcoming:
+        text += f"\n  Next: {upcoming[0].lord}–{upcoming[1].lord} from {antar.end:%b %Y}"
+    return text
+
+
 def format_compatibility_context(result: Dict[str, Any], insights: Optional[str] = None) -> str:
     """Format compatibility result for LLM context — includes full partner details and Guna kootas."""
     compat = result.get("compatibility", {})
@@ -396,6 +491,17 @@ Guna Milan: {guna_score}/36 ({guna_verdict})"""
                 if desc:
                     context += f" — {desc}"
     
+    # Navamsa (D9) placements, when the charts carry them
+    for p_name, p_chart in ((a_name, partner_a), (b_name, partner_b)):
+        d9 = p_chart.get("vargas", {}).get("D9")
+        if d9:
+            planets = d9.get("planets", {})
+            context += (
+                f"\n{p_name}'s Navamsa (D9): Ascendant {d9.get('ascendant', 'Unknown')}, "
+                f"Venus {planets.get('Venus', 'Unknown')}, Moon {planets.get('Moon', 'Unknown')}, "
+                f"Mars {planets.get('Mars', 'Unknown')}"
+            )
+
     # Signals and explainers
     signals = compat.get("signals", [])
     if signals:
@@ -415,6 +521,59 @@ Guna Milan: {guna_score}/36 ({guna_verdict})"""
 # ============================================================================
 # MAIN API FUNCTIONS
 # ============================================================================
+# Each call has a sync form (scripts) and an async form (API handlers). The
+# async forms build the prompt inputs (dasha, transits) on the default
+# executor and await the chain's ainvoke, so the event loop never blocks.
+# The astream_* forms yield the completion text chunk by chunk as the model
+# produces it (for SSE); unlike the others they raise on failure.
+
+_UNAVAILABLE = "I apologize, but I'm unable to provide insights at this moment. Error: {error}"
+
+
+def _history_messages(history: Optional[List[Dict[str, str]]]) -> List[Any]:
+    """Last MAX_CHAT_MESSAGES turns as LangChain messages."""
+    chat_history = []
+    for msg in (history or [])[-MAX_CHAT_MESSAGES:]:
+        if msg["role"] == "user":
+            chat_history.append(HumanMessage(content=msg["content"]))
+        elif msg["role"] == "assistant":
+            chat_history.append(AIMessage(content=msg["content"]))
+    return chat_history
+
+
+def _chart_chat_inputs(chart, question, history, insights) -> Dict[str, Any]:
+    return {
+        "temporal_context": get_current_astrological_context(),
+        "chart_context": format_chart_context(chart, insights=insights),
+        "chat_history": _history_messages(history),
+        "question": question,
+    }
+
+
+def _compat_chat_inputs(result, question, history, insights) -> Dict[str, Any]:
+    return {
+        "temporal_context": get_current_astrological_context(),
+        "compat_context": format_compatibility_context(result, insights=insights),
+        "chat_history": _history_messages(history),
+        "question": question,
+    }
+
+
+def _chart_insights_inputs(chart: Dict[str, Any]) -> Dict[str, Any]:
+    temporal_context = get_current_astrological_context()
+    return {
+        "temporal_context": temporal_context,
+        "chart_context": format_chart_context(chart),
+        "current_year": temporal_context.split("(Year ")[1].split(")")[0],
+    }
+
+
+def _compat_insights_inputs(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "temporal_context": get_current_astrological_context(),
+        "compat_context": format_compatibility_context(result),
+    }
+
 
 def chat_about_chart(
     chart: Dict[str, Any],
@@ -423,31 +582,24 @@ def chat_about_chart(
     insights: Optional[str] = None
 ) -> str:
     """Generate LLM response about a birth chart using LangChain."""
-    if history is None:
-        history = []
-    
-    # Convert history to LangChain message format
-    chat_history = []
-    # Keep last N messages for context (configurable)
-    history_limit = MAX_CHAT_MESSAGES
-    for msg in history[-history_limit:]:
-        if msg["role"] == "user":
-            chat_history.append(HumanMessage(content=msg["content"]))
-        elif msg["role"] == "assistant":
-            chat_history.append(AIMessage(content=msg["content"]))
-    
     try:
-        # Invoke chain with LangChain — pass insights into context
-        response = traits_chain.invoke({
-            "temporal_context": get_current_astrological_context(),
-            "chart_context": format_chart_context(chart, insights=insights),
-            "chat_history": chat_history,
-            "question": question
-        })
-        return response
-        
+        return traits_chain.invoke(_chart_chat_inputs(chart, question, history, insights))
+    except Exception as e:
+        return _UNAVAILABLE.format(error=str(e))
+
+
+async def achat_about_chart(
+    chart: Dict[str, Any],
+    question: str,
+    history: List[Dict[str, str]] = None,
+    insights: Optional[str] = None
+) -> str:
+    """Async chat_about_chart."""
+    try:
+        inputs = await asyncio.to_thread(_chart_chat_inputs, chart, question, history, insights)
+        return await traits_chain.ainvoke(inputs)
     except Exception as e:
-        return f"I apologize, but I'm unable to provide insights at this moment. Error: {str(e)}"
+        return _UNAVAILABLE.format(error=str(e))
 
 
 def chat_about_compatibility(
@@ -457,46 +609,39 @@ def chat_about_compatibility(
     insights: Optional[str] = None
 ) -> str:
     """Generate LLM response about compatibility using LangChain."""
-    if history is None:
-        history = []
-    
-    # Convert history to LangChain message format
-    chat_history = []
-    # Keep last N messages for context (configurable)
-    history_limit = MAX_CHAT_MESSAGES
-    for msg in history[-history_limit:]:
-        if msg["role"] == "user":
-            chat_history.append(HumanMessage(content=msg["content"]))
-        elif msg["role"] == "assistant":
-            chat_history.append(AIMessage(content=msg["content"]))
-    
     try:
-        # Invoke chain with LangChain — pass insights into context
-        response = compatibility_chain.invoke({
-            "temporal_context": get_current_astrological_context(),
-            "compat_context": format_compatibility_context(result, insights=insights),
-            "chat_history": chat_history,
-            "question": question
-        })
-        return response
-        
+        return compatibility_chain.invoke(_compat_chat_inputs(result, question, history, insights))
+    except Exception as e:
+        return _UNAVAILABLE.format(error=str(e))
+
+
+async def achat_about_compatibility(
+    result: Dict[str, Any],
+    question: str,
+    history: List[Dict[str, str]] = None,
+    insights: Optional[str] = None
+) -> str:
+    """Async chat_about_compatibility."""
+    try:
+        inputs = await asyncio.to_thread(_compat_chat_inputs, result, question, history, insights)
+        return await compatibility_chain.ainvoke(inputs)
     except Exception as e:
-        return f"I apologize, but I'm unable to provide insights at this moment. Error: {str(e)}"
+        return _UNAVAILABLE.format(error=str(e))
 
 
 def generate_chart_insights(chart: Dict[str, Any]) -> str:
     """Generate automatic insights for a chart using LangChain."""
-    temporal_context = get_current_astrological_context()
-    current_year = temporal_context.split("(Year ")[1].split(")")[0]
-    
     try:
-        response = chart_insights_chain.invoke({
-            "temporal_context": temporal_context,
-            "chart_context": format_chart_context(chart),
-            "current_year": current_year
-        })
-        return response
-        
+        return chart_insights_chain.invoke(_chart_insights_inputs(chart))
+    except Exception as e:
+        return None
+
+
+async def agenerate_chart_insights(chart: Dict[str, Any]) -> str:
+    """Async generate_chart_insights."""
+    try:
+        inputs = await asyncio.to_thread(_chart_insights_inputs, chart)
+        return await chart_insights_chain.ainvoke(inputs)
     except Exception as e:
         return None
 
@@ -504,11 +649,75 @@ def generate_chart_insights(chart: Dict[str, Any]) -> str:
 def generate_compatibility_insights(result: Dict[str, Any]) -> str:
     """Generate automatic insights for compatibility using LangChain."""
     try:
-        response = compatibility_insights_chain.invoke({
-            "temporal_context": get_current_astrological_context(),
-            "compat_context": format_compatibility_context(result),
-        })
-        return response
-        
+        return compatibility_insights_chain.invoke(_compat_insights_inputs(result))
+    except Exception as e:
+        return None
+
+
+def insight_sections(sections: Sequence[str]) -> List[str]:
+    """Requested compatibility insight sections, deduplicated, in reading order."""
+    unknown = [name for name in sections if name not in COMPATIBILITY_INSIGHT_SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown insight sections {unknown}. Expected any of {list(COMPATIBILITY_INSIGHT_SECTIONS)}")
+    return [name for name in COMPATIBILITY_INSIGHT_SECTIONS if name in sections]
+
+
+async def agenerate_compatibility_insights(result: Dict[str, Any], sections: Optional[Sequence[str]] = None) -> str:
+    """
+    Async generate_compatibility_insights. With `sections`, each section is
+    its own LLM call, all in flight at once, merged in reading order: the
+    latency is that of the slowest section rather than one long completion.
+    """
+    names = insight_sections(sections) if sections else None
+    try:
+        inputs = await asyncio.to_thread(_compat_insights_inputs, result)
+        if not names:
+            return await compatibility_insights_chain.ainvoke(inputs)
+        texts = await asyncio.gather(
+            *(
+                compatibility_section_chain.ainvoke({**inputs, "section": "{}: [{}]".format(*COMPATIBILITY_INSIGHT_SECTIONS[name])})
+                for name in names
+            ),
+            return_exceptions=True,
+        )
+        # A failed section is left out rather than failing the whole reading
+        return "\n\n".join(t.strip() for t in texts if isinstance(t, str) and t.strip()) or None
     except Exception as e:
         return None
+
+
+async def _astream(chain, build_inputs: Callable[..., Dict[str, Any]], *args: Any) -> AsyncIterator[str]:
+    inputs = await asyncio.to_thread(build_inputs, *args)
+    async for chunk in chain.astream(inputs):
+        if chunk:
+            yield chunk
+
+
+def astream_chat_about_chart(
+    chart: Dict[str, Any],
+    question: str,
+    history: List[Dict[str, str]] = None,
+    insights: Optional[str] = None
+) -> AsyncIterator[str]:
+    """Streaming chat_about_chart."""
+    return _astream(traits_chain, _chart_chat_inputs, chart, question, history, insights)
+
+
+def astream_chat_about_compatibility(
+    result: Dict[str, Any],
+    question: str,
+    history: List[Dict[str, str]] = None,
+    insights: Optional[str] = None
+) -> AsyncIterator[str]:
+    """Streaming chat_about_compatibility."""
+    return _astream(compatibility_chain, _compat_chat_inputs, result, question, history, insights)
+
+
+def astream_chart_insights(chart: Dict[str, Any]) -> AsyncIterator[str]:
+    """Streaming generate_chart_insights."""
+    return _astream(chart_insights_chain, _chart_insights_inputs, chart)
+
+
+def astream_compatibility_insights(result: Dict[str, Any]) -> AsyncIterator[str]:
+    """Streaming generate_compatibility_insights."""
+    return _astream(compatibility_insights_chain, _compat_insights_inputs, result)
@@ -0,0 +1,127 @@
+"""
+Load test: /chart latency under concurrent /chat/chart traffic
+Measures /chart latency twice: alone, then while `--chat` clients keep
+/chat/chart requests (each waiting on the LLM) in flight. Reports
+p50/p95/p99 for both runs. With non-blocking handlers the two should be
+close; a handler that blocks the event loop on an LLM call shows up as
+/chart p99 jumping to the LLM latency.
+
+Run against a running server (pip install httpx):
+    python -m backend.load_test [--url http://localhost:8000] [--chat 20] [--charts 400] [--concurrency 8]
+Exits non-zero if /chart p99 under load exceeds --max-p99-ms.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+try:
+    import httpx
+except ImportError:
+    print("❌ httpx is required for the load test (pip install httpx)")
+    sys.exit(2)
+
+API = "/api/py"
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))]
+
+
+def _random_birth(rng: random.Random) -> Dict[str, Any]:
+    # Random births so most requests miss the chart cache and reach the engine
+    return {
+        "name": "load",
+        "date": f"{rng.randint(1950, 2010)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "time": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+        "tz": "Asia/Kolkata",
+        "lat": round(rng.uniform(8.0, 32.0), 4),
+        "lon": round(rng.uniform(68.0, 92.0), 4),
+    }
+
+
+async def _chart_run(client: httpx.AsyncClient, n: int, concurrency: int, seed: int) -> List[float]:
+    """Latencies (ms) of n /chart requests issued by `concurrency` clients."""
+    rng = random.Random(seed)
+    queue = [_random_birth(rng) for _ in range(n)]
+    latencies: List[float] = []
+
+    async def worker():
+        while queue:
+            birth = queue.pop()
+            t0 = time.perf_counter()
+            r = await client.post(f"{API}/chart", json={"birth": birth})
+            latencies.append((time.perf_counter() - t0) * 1000)
+            r.raise_for_status()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def _chat_load(client: httpx.AsyncClient, chart: Dict[str, Any], stop: asyncio.Event, stats: Dict[str, Any]):
+    """One chat client: keep a /chat/chart request in flight until stopped."""
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            r = await client.post(
+                f"{API}/chat/chart",
+                json={"chart": chart, "question": "What does my Moon placement say about me?"},
+            )
+            stats["status"][r.status_code] = stats["status"].get(r.status_code, 0) + 1
+        except httpx.HTTPError as e:
+            stats["errors"].append(type(e).__name__)
+        stats["latencies"].append((time.perf_counter() - t0) * 1000)
+
+
+def _report(label: str, latencies: List[float]) -> float:
+    p99 = _percentile(latencies, 99)
+    print(
+        f"{label:28s} n={len(latencies):5d}  p50 {_percentile(latencies, 50):7.1f} ms  "
+        f"p95 {_percentile(latencies, 95):7.1f} ms  p99 {p99:7.1f} ms  max {max(latencies):7.1f} ms"
+    )
+    return p99
+
+
+async def main(args) -> int:
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.chat + args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+        r = await client.post(f"{API}/chart", json={"birth": _random_birth(random.Random(0))})
+        r.raise_for_status()
+        chart = r.json()
+
+        print(f"\n=== LOAD TEST {args.url} ({args.chat} chat clients, /chart x{args.charts} @ {args.concurrency}) ===\n")
+        await _chart_run(client, min(args.charts, 50), args.concurrency, seed=99)  # warm up
+        _report("/chart alone", await _chart_run(client, args.charts, args.concurrency, seed=1))
+
+        stop = asyncio.Event()
+        stats: Dict[str, Any] = {"status": {}, "errors": [], "latencies": []}
+        chatters = [asyncio.create_task(_chat_load(client, chart, stop, stats)) for _ in range(args.chat)]
+        await asyncio.sleep(args.ramp)  # let the chat requests reach the LLM
+        under_load = await _chart_run(client, args.charts, args.concurrency, seed=2)
+        stop.set()
+        await asyncio.gather(*chatters)
+
+        p99 = _report("/chart with chat load", under_load)
+        if stats["latencies"]:
+            _report("/chat/chart", stats["latencies"])
+        print(f"chat status codes: {stats['status']}" + (f", transport errors: {len(stats['errors'])}" if stats["errors"] else ""))
+
+    ok = p99 <= args.max_p99_ms
+    print(f"\n{'✓' if ok else '✗'} /chart p99 under load {p99:.1f} ms (limit {args.max_p99_ms:.0f} ms)\n")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/chart latency under concurrent /chat/chart load")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--chat", type=int, default=20, help="concurrent /chat/chart clients")
+    parser.add_argument("--charts", type=int, default=400, help="/chart requests per run")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent /chart clients")
+    parser.add_argument("--ramp", type=float, default=1.0, help="seconds of chat load before measuring")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--max-p99-ms", type=float, default=250.0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -4,26 +4,39 @@ FastAPI server for Vedic astrology calculations using Swiss Ephemeris.
 """
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import itertools
+import json
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
 env_path = Path(__file__).parent / ".env"
 load_dotenv(env_path)
 
-from fastapi import FastAPI, HTTPException, APIRouter
+from fastapi import FastAPI, HTTPException, APIRouter, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-
-from .schemas import BirthInput
-from .chart import calculate_vedic_chart
-from .match import compatibility_indicators
-from .guna import calculate_guna_milan
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+import swisseph as swe
+
+from .schemas import BirthInput, VedicChart
+from .chart_cache import chart_cache
+from .chart import ENGINE_VERSION
+from .chart_engine import CHART_EPHE_PATH, compute_chart, engine_stats, get_chart_engine, shutdown_engines, warmup_engines
+from .rectification import MAX_WINDOW_MINUTES, rectify_birth_time
+from .vargas import COMPATIBILITY_VARGAS, DEFAULT_VARGAS, chart_vargas
+from .timezones import warm_timezones
+from .scoring import score_pair
+from .singleflight import coalescing_stats, request_flights, request_key
+from .encoding import Representation, negotiate
 
 
 app = FastAPI(
@@ -44,6 +57,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "Vary"],
 )
 
 
@@ -55,6 +69,7 @@ class BirthInputRequest(BaseModel):
     tz: str = Field(default="Asia/Kolkata", description="IANA timezone")
     lat: float = Field(..., ge=-90, le=90, description="Latitude")
     lon: float = Field(..., ge=-180, le=180, description="Longitude")
+    fold: Optional[int] = Field(default=None, ge=0, le=1, description="0/1 = earlier/later instant for DST-ambiguous local times")
 
 
 class CompatibilityRequest(BaseModel):
@@ -66,6 +81,41 @@ class ChartRequest(BaseModel):
     birth: BirthInputRequest
     high_precision: bool = False
     use_true_node: bool = False
+    use_table: bool = False  # interpolate from the precomputed ephemeris table
+    vargas: List[int] = Field(default=list(DEFAULT_VARGAS), description="Divisional charts to include, e.g. [9, 10]")
+
+
+class CompatibilityInsightsRequest(CompatibilityRequest):
+    sections: Optional[List[str]] = Field(
+        default=None,
+        description='Generate these insight sections as concurrent LLM calls and merge them, e.g. ["energy", "strengths", "watch_out", "remedies"]',
+    )
+
+
+class RectifyRequest(BaseModel):
+    birth: BirthInputRequest
+    window_minutes: int = Field(default=120, ge=1, le=MAX_WINDOW_MINUTES, description="Sweep +/- this many minutes")
+    high_precision: bool = False
+    use_true_node: bool = False
+
+
+# NDJSON batch endpoints: max items per request, items in flight at once
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "5000"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "16"))
+
+
+class ChartBatchRequest(BaseModel):
+    # Items are validated one by one so a bad entry fails only its own line
+    births: List[Dict[str, Any]] = Field(..., max_length=BATCH_MAX_ITEMS, description="BirthInputRequest objects")
+    high_precision: bool = False
+    use_true_node: bool = False
+    use_table: bool = False
+    vargas: List[int] = Field(default=list(DEFAULT_VARGAS), description="Divisional charts to include, e.g. [9, 10]")
+
+
+class CompatibilityBatchRequest(BaseModel):
+    pairs: List[Dict[str, Any]] = Field(..., max_length=BATCH_MAX_ITEMS, description="CompatibilityRequest objects")
+    include_charts: bool = False
 
 
 # Helper to convert Pydantic to dataclass
@@ -77,9 +127,148 @@ def _to_birth_input(req: BirthInputRequest) -> BirthInput:
         tz=req.tz,
         lat=req.lat,
         lon=req.lon,
+        fold=req.fold,
+    )
+
+
+def _chart_dict(chart: VedicChart, vargas: Sequence[int] = DEFAULT_VARGAS) -> Dict[str, Any]:
+    """chart.to_dict() plus the requested divisional charts (no extra ephemeris calls)."""
+    response = chart.to_dict()
+    if vargas:
+        response["vargas"] = chart_vargas(chart, vargas)
+    return response
+
+
+async def _partner_charts(req: CompatibilityRequest) -> Tuple[VedicChart, VedicChart]:
+    """Both partners' charts, computed side by side on the chart engine."""
+    return await asyncio.gather(
+        compute_chart(_to_birth_input(req.partnerA)),
+        compute_chart(_to_birth_input(req.partnerB)),
+    )
+
+
+def _error_message(e: ValueError) -> str:
+    """One-line message for a bad batch item (pydantic errors included)."""
+    if isinstance(e, ValidationError):
+        return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+    return str(e)
+
+
+async def _stream_batch(
+    items: Sequence[Any], work: Callable[[Any], Awaitable[Dict[str, Any]]], failure: str, rep: Representation
+) -> AsyncIterator[bytes]:
+    """
+    Run work(item) for every item, BATCH_CONCURRENCY at a time, and yield one
+    NDJSON line (or MessagePack map) per item as it finishes:
+    {"index", "ok": true, ...result} or {"index", "ok": false, "status", "error"}.
+    Items arrive in completion order; a final {"done": true, ...} closes the stream.
+    """
+    t_start = time.time()
+    queue = iter(enumerate(items))
+    pending: Dict[asyncio.Future, int] = {}
+    errors = 0
+    try:
+        while True:
+            for i, item in itertools.islice(queue, BATCH_CONCURRENCY - len(pending)):
+                pending[asyncio.ensure_future(work(item))] = i
+            if not pending:
+                break
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            lines = []
+            for task in done:
+                i = pending.pop(task)
+                try:
+                    line = {"index": i, "ok": True, **task.result()}
+                except ValueError as e:
+                    line = {"index": i, "ok": False, "status": 400, "error": _error_message(e)}
+                except Exception as e:
+                    line = {"index": i, "ok": False, "status": 500, "error": f"{failure}: {str(e)}"}
+                errors += not line["ok"]
+                lines.append(rep.encode_item(line))
+            yield b"".join(lines)
+
+        t_end = time.time()
+        yield rep.encode_item({"done": True, "count": len(items), "errors": errors, "timing": {"batch": round(t_end - t_start, 1)}})
+        print(f"⏱️  Batch: {round(t_end - t_start, 1)}s ({len(items)} items, {errors} errors)")
+    finally:
+        # Client went away mid-stream: drop the work still in flight
+        for task in pending:
+            task.cancel()
+
+
+# Threads for blocking work handlers hand off (asyncio.to_thread / run_in_executor(None, ...))
+BLOCKING_WORKERS = int(os.getenv("BLOCKING_WORKERS", "8"))
+
+
+@app.on_event("startup")
+async def start_chart_engine():
+    """Spawn and warm the chart worker pool and timezone tables before serving traffic."""
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="blocking"))
+    await asyncio.gather(
+        loop.run_in_executor(None, warmup_engines),
+        loop.run_in_executor(None, warm_timezones),
     )
 
 
+@app.on_event("shutdown")
+async def stop_chart_engine():
+    shutdown_engines()
+
+
+# HTTP caching for the deterministic endpoints (/chart, /compatibility). Their
+# response is a pure function of the request body and the deployed build, so the
+# ETag is derived from those alone and a matching If-None-Match gets a 304.
+CACHE_MAX_AGE = int(os.getenv("CACHE_MAX_AGE", "86400"))
+CACHE_CONTROL = f"public, max-age={CACHE_MAX_AGE}, s-maxage={CACHE_MAX_AGE}"
+
+
+def _backend_fingerprint() -> str:
+    """
+    Hash of the backend sources. Charts, scoring (guna, match, dasha, vargas)
+    and serialization all live there, so any deploy that can change a
+    response body changes every ETag, without a version to bump by hand.
+    """
+    h = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        h.update(path.name.encode("utf-8"))
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+RESPONSE_VERSION = f"{ENGINE_VERSION}:{_backend_fingerprint()}:{swe.version}:{CHART_EPHE_PATH or ''}"
+
+
+def _if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (t.strip().removeprefix("W/") for t in header.split(","))
+
+
+async def _cacheable(
+    request: Request, kind: str, body: Dict[str, Any], build: Callable[[], Awaitable[Dict[str, Any]]], label: str
+) -> Response:
+    """
+    Response in the negotiated encoding (JSON unless the client asks for
+    MessagePack / ?layout=columnar) with ETag and Cache-Control, or a bare
+    304 when the client already holds it. Compute time goes in the Server-Timing header rather
+    than the body, so equal requests get byte-identical bodies.
+    """
+    rep = negotiate(request.headers.get("accept"), request.query_params.get("layout"))
+    key = request_key(kind, body, RESPONSE_VERSION)
+    headers = {"ETag": f'"{key[:32]}{rep.etag_suffix}"', "Cache-Control": CACHE_CONTROL, "Vary": "Accept"}
+    if _if_none_match(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    t_start = time.time()
+    result = await request_flights.run(key, build)
+    elapsed = time.time() - t_start
+    print(f"⏱️  {label}: {round(elapsed, 3)}s")
+    headers["Server-Timing"] = f"{kind};dur={elapsed * 1000:.1f}"
+    return Response(rep.encode(result), media_type=rep.media_type, headers=headers)
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -88,68 +277,159 @@ async def health_check():
         "version": "2.0.0",
         "timestamp": datetime.utcnow().isoformat(),
         "engine": "swisseph",
+        "chart_cache": chart_cache.stats(),
+        "chart_engine": engine_stats(),
+        "coalescing": coalescing_stats(),
     }
 
 
+async def _chart_response(req: ChartRequest, request: Request) -> Response:
+    async def build() -> Dict[str, Any]:
+        chart = await compute_chart(
+            _to_birth_input(req.birth),
+            high_precision=req.high_precision,
+            use_true_node=req.use_true_node,
+            use_table=req.use_table,
+        )
+        return _chart_dict(chart, req.vargas)
+
+    try:
+        return await _cacheable(request, "chart", req.model_dump(mode="json"), build, "Chart")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chart calculation failed: {str(e)}")
+
+
 @router.post("/chart")
-async def calculate_chart(req: ChartRequest):
+async def calculate_chart(req: ChartRequest, request: Request):
     """Calculate a single Vedic birth chart (fast, no LLM)."""
+    return await _chart_response(req, request)
+
+
+@router.get("/chart")
+async def calculate_chart_get(
+    request: Request,
+    date: str,
+    time_: str = Query(..., alias="time"),
+    lat: float = Query(...),
+    lon: float = Query(...),
+    tz: str = "Asia/Kolkata",
+    name: str = "",
+    fold: Optional[int] = None,
+    high_precision: bool = False,
+    use_true_node: bool = False,
+    use_table: bool = False,
+    vargas: List[int] = Query(default=list(DEFAULT_VARGAS)),
+):
+    """/chart as a GET with query parameters, so shared caches (the Vercel edge) can store it."""
+    try:
+        req = ChartRequest(
+            birth=BirthInputRequest(name=name, date=date, time=time_, tz=tz, lat=lat, lon=lon, fold=fold),
+            high_precision=high_precision,
+            use_true_node=use_true_node,
+            use_table=use_table,
+            vargas=vargas,
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=_error_message(e))
+    return await _chart_response(req, request)
+
+
+@router.post("/chart/rectify")
+async def rectify_chart(req: RectifyRequest):
+    """Every chart variant (and the exact boundary instants) within +/- window_minutes of the birth time."""
     try:
         t_start = time.time()
         birth = _to_birth_input(req.birth)
-        chart = calculate_vedic_chart(
-            birth,
-            high_precision=req.high_precision,
-            use_true_node=req.use_true_node,
+        result = await get_chart_engine(req.use_true_node).run(
+            rectify_birth_time, birth, req.window_minutes, req.high_precision, req.use_true_node
         )
         t_end = time.time()
-        
-        response = chart.to_dict()
+
+        response = result.to_dict()
         response["timing"] = {"chart": round(t_end - t_start, 1)}
-        print(f"⏱️  Chart: {round(t_end - t_start, 1)}s")
-        
+        print(f"⏱️  Rectify: {round(t_end - t_start, 1)}s ({len(result.variants)} variants)")
+
         return response
-        
+
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Chart calculation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Rectification failed: {str(e)}")
 
 
 @router.post("/compatibility")
-async def calculate_compatibility(req: CompatibilityRequest):
+async def calculate_compatibility(req: CompatibilityRequest, request: Request):
     """Calculate compatibility indicators and Guna matching (fast, no LLM)."""
-    try:
-        t_start = time.time()
-        birth_a = _to_birth_input(req.partnerA)
-        birth_b = _to_birth_input(req.partnerB)
 
-        chart_a = calculate_vedic_chart(birth_a)
-        chart_b = calculate_vedic_chart(birth_b)
+    async def build() -> Dict[str, Any]:
+        chart_a, chart_b = await _partner_charts(req)
 
-        # Calculate both indicator-based and traditional Guna matching
-        indicators = compatibility_indicators(chart_a, chart_b)
-        guna = calculate_guna_milan(chart_a, chart_b)
-        t_end = time.time()
-        
-        result = {
+        # Indicator-based and traditional Guna matching in one pass
+        scores = score_pair(chart_a, chart_b)
+        return {
             "charts": {
-                "partnerA": chart_a.to_dict(),
-                "partnerB": chart_b.to_dict(),
+                "partnerA": _chart_dict(chart_a, COMPATIBILITY_VARGAS),
+                "partnerB": _chart_dict(chart_b, COMPATIBILITY_VARGAS),
             },
-            "compatibility": indicators.to_dict(),
-            "guna": guna.to_dict(),
-            "timing": {"chart": round(t_end - t_start, 1)},
+            "compatibility": scores.compatibility.to_dict(),
+            "guna": scores.guna.to_dict(),
         }
-        print(f"⏱️  Compat: {round(t_end - t_start, 1)}s")
-        
-        return result
-        
+
+    try:
+        return await _cacheable(request, "compatibility", req.model_dump(mode="json"), build, "Compat")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Compatibility calculation failed: {str(e)}")
 
+
+def _batch_response(
+    request: Request, items: Sequence[Any], work: Callable[[Any], Awaitable[Dict[str, Any]]], failure: str
+) -> StreamingResponse:
+    try:
+        rep = negotiate(request.headers.get("accept"), request.query_params.get("layout"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(_stream_batch(items, work, failure, rep), media_type=rep.stream_media_type)
+
+
+@router.post("/charts/batch")
+async def calculate_charts_batch(req: ChartBatchRequest, request: Request):
+    """Many birth charts in one request, streamed back as NDJSON lines (or MessagePack) as each one finishes."""
+
+    async def one(item: Dict[str, Any]) -> Dict[str, Any]:
+        birth = _to_birth_input(BirthInputRequest.model_validate(item))
+        chart = await compute_chart(
+            birth,
+            high_precision=req.high_precision,
+            use_true_node=req.use_true_node,
+            use_table=req.use_table,
+        )
+        return {"chart": _chart_dict(chart, req.vargas)}
+
+    return _batch_response(request, req.births, one, "Chart calculation failed")
+
+
+@router.post("/compatibility/batch")
+async def calculate_compatibility_batch(req: CompatibilityBatchRequest, request: Request):
+    """Many partner pairs in one request, streamed back as NDJSON lines (or MessagePack) as each one finishes."""
+
+    async def one(item: Dict[str, Any]) -> Dict[str, Any]:
+        chart_a, chart_b = await _partner_charts(CompatibilityRequest.model_validate(item))
+        scores = score_pair(chart_a, chart_b)
+        result = {"compatibility": scores.compatibility.to_dict(), "guna": scores.guna.to_dict()}
+        if req.include_charts:
+            result["charts"] = {
+                "partnerA": _chart_dict(chart_a, COMPATIBILITY_VARGAS),
+                "partnerB": _chart_dict(chart_b, COMPATIBILITY_VARGAS),
+            }
+        return result
+
+    return _batch_response(request, req.pairs, one, "Compatibility calculation failed")
+
+
 # LLM Chat Endpoints
 class ChartChatRequest(BaseModel):
     chart: Dict[str, Any]
@@ -170,8 +450,8 @@ async def chat_chart(req: ChartChatRequest):
     """Chat about a birth chart using LLM."""
     try:
         t_start = time.time()
-        from .llm_langchain import chat_about_chart
-        response = chat_about_chart(req.chart, req.question, req.history, insights=req.insights)
+        from .llm_langchain import achat_about_chart
+        response = await achat_about_chart(req.chart, req.question, req.history, insights=req.insights)
         t_end = time.time()
         print(f"⏱️  Chat: {round(t_end - t_start, 1)}s")
         return {"response": response, "timing": round(t_end - t_start, 1)}
@@ -185,8 +465,8 @@ async def chat_chart(req: ChartChatRequest):
 async def chat_compatibility(req: CompatibilityChatRequest):
     """Chat about compatibility using LLM."""
     try:
-        from .llm_langchain import chat_about_compatibility
-        response = chat_about_compatibility(req.result, req.question, req.history, insights=req.insights)
+        from .llm_langchain import achat_about_compatibility
+        response = await achat_about_compatibility(req.result, req.question, req.history, insights=req.insights)
         return {"response": response}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -197,53 +477,165 @@ async def chat_compatibility(req: CompatibilityChatRequest):
 @router.post("/insights/chart")
 async def generate_chart_insights_endpoint(req: ChartRequest):
     """Generate LLM insights for a chart."""
-    try:
+
+    async def build() -> Dict[str, Any]:
         birth = _to_birth_input(req.birth)
-        chart = calculate_vedic_chart(birth)
-        chart_dict = chart.to_dict()
-        
-        from .llm_langchain import generate_chart_insights
-        insights = generate_chart_insights(chart_dict)
-        
+        chart = await compute_chart(birth)
+        chart_dict = _chart_dict(chart, req.vargas)
+        insights = await agenerate_chart_insights(chart_dict)
         return {
             "chart": chart_dict,
             "insights": insights,
         }
+
+    try:
+        from .llm_langchain import PROMPT_VERSION, agenerate_chart_insights
+        key = request_key("insights/chart", req.model_dump(mode="json"), PROMPT_VERSION)
+        return await request_flights.run(key, build)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Insights generation failed: {str(e)}")
 
 
-@router.post("/insights/compatibility")
-async def generate_compatibility_insights_endpoint(req: CompatibilityRequest):
-    """Generate LLM insights for compatibility."""
-    try:
-        birth_a = _to_birth_input(req.partnerA)
-        birth_b = _to_birth_input(req.partnerB)
+async def _compatibility_payload(req: CompatibilityRequest) -> Dict[str, Any]:
+    """Charts, indicators and Guna for a pair: what the insights prompts are built from."""
+    chart_a, chart_b = await _partner_charts(req)
+    scores = score_pair(chart_a, chart_b)
+    return {
+        "charts": {
+            "partnerA": _chart_dict(chart_a, COMPATIBILITY_VARGAS),
+            "partnerB": _chart_dict(chart_b, COMPATIBILITY_VARGAS),
+        },
+        "compatibility": scores.compatibility.to_dict(),
+        "guna": scores.guna.to_dict(),
+    }
 
-        chart_a = calculate_vedic_chart(birth_a)
-        chart_b = calculate_vedic_chart(birth_b)
 
-        indicators = compatibility_indicators(chart_a, chart_b)
-        guna = calculate_guna_milan(chart_a, chart_b)
+@router.post("/insights/compatibility")
+async def generate_compatibility_insights_endpoint(req: CompatibilityInsightsRequest):
+    """Generate LLM insights for compatibility."""
 
-        result = {
-            "charts": {
-                "partnerA": chart_a.to_dict(),
-                "partnerB": chart_b.to_dict(),
-            },
-            "compatibility": indicators.to_dict(),
-            "guna": guna.to_dict(),
-        }
-        
-        from .llm_langchain import generate_compatibility_insights
-        insights = generate_compatibility_insights(result)
-        
+    async def build() -> Dict[str, Any]:
+        result = await _compatibility_payload(req)
+        insights = await agenerate_compatibility_insights(result, sections=req.sections)
         return {
             **result,
             "llm_insights": insights,
         }
+
+    try:
+        from .llm_langchain import PROMPT_VERSION, agenerate_compatibility_insights, insight_sections
+        if req.sections:
+            insight_sections(req.sections)  # reject unknown sections before any work
+        key = request_key("insights/compatibility", req.model_dump(mode="json"), PROMPT_VERSION)
+        return await request_flights.run(key, build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Insights generation failed: {str(e)}")
+
+
+# Streaming (Server-Sent Events) variants of the LLM endpoints
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _stream_sse(
+    t_start: float, tokens: AsyncIterator[str], label: str, payload: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[str]:
+    """
+    SSE body: a `payload` event with the computed chart/guna (insights) or an
+    SSE comment (chat) straight away, one `token` event per completion chunk,
+    then `done` with timing in seconds since the request arrived: first_byte
+    (first event out) and first_token (first model chunk). An LLM failure
+    mid-stream becomes an `error` event.
+    """
+    first_byte = time.time() - t_start
+    yield _sse("payload", payload) if payload is not None else ": stream open\n\n"
+
+    first_token = None
+    try:
+        async for chunk in tokens:
+            if first_token is None:
+                first_token = time.time() - t_start
+            yield _sse("token", {"text": chunk})
+    except Exception as e:
+        yield _sse("error", {"error": f"{label} failed: {str(e)}"})
+        return
+
+    total = time.time() - t_start
+    timing = {
+        "first_byte": round(first_byte, 3),
+        "first_token": round(first_token, 3) if first_token is not None else None,
+        "total": round(total, 3),
+    }
+    print(f"⏱️  {label} stream: first byte {timing['first_byte']}s, first token {timing['first_token']}s, total {timing['total']}s")
+    yield _sse("done", {"timing": timing})
+
+
+def _sse_response(body: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(body, media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post("/chat/chart/stream")
+async def chat_chart_stream(req: ChartChatRequest):
+    """/chat/chart streamed token by token over SSE."""
+    try:
+        t_start = time.time()
+        from .llm_langchain import astream_chat_about_chart
+        tokens = astream_chat_about_chart(req.chart, req.question, req.history, insights=req.insights)
+        return _sse_response(_stream_sse(t_start, tokens, "Chat"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+
+
+@router.post("/chat/compatibility/stream")
+async def chat_compatibility_stream(req: CompatibilityChatRequest):
+    """/chat/compatibility streamed token by token over SSE."""
+    try:
+        t_start = time.time()
+        from .llm_langchain import astream_chat_about_compatibility
+        tokens = astream_chat_about_compatibility(req.result, req.question, req.history, insights=req.insights)
+        return _sse_response(_stream_sse(t_start, tokens, "Chat"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+
+
+@router.post("/insights/chart/stream")
+async def generate_chart_insights_stream(req: ChartRequest):
+    """/insights/chart over SSE: the chart first, then the insights token by token."""
+    try:
+        t_start = time.time()
+        chart = await compute_chart(_to_birth_input(req.birth))
+        chart_dict = _chart_dict(chart, req.vargas)
+
+        from .llm_langchain import astream_chart_insights
+        tokens = astream_chart_insights(chart_dict)
+        return _sse_response(_stream_sse(t_start, tokens, "Insights", payload={"chart": chart_dict}))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Insights generation failed: {str(e)}")
+
+
+@router.post("/insights/compatibility/stream")
+async def generate_compatibility_insights_stream(req: CompatibilityRequest):
+    """/insights/compatibility over SSE: charts, indicators and Guna first, then the insights."""
+    try:
+        t_start = time.time()
+        result = await _compatibility_payload(req)
+
+        from .llm_langchain import astream_compatibility_insights
+        tokens = astream_compatibility_insights(result)
+        return _sse_response(_stream_sse(t_start, tokens, "Insights", payload=result))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
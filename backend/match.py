@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Iterator, List, Sequence, Tuple
 
-from .schemas import VedicChart, CompatibilityResult
+import numpy as np
+
+from .schemas import VedicChart, ChartFeatures, CompatibilityResult
+from .chart import MANGLIK_HOUSES, PLANET_COLUMNS, SIGN_RULERS, ChartBatch, features_for_chart
 
 SIGNS = [
     "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
@@ -10,117 +15,274 @@ SIGNS = [
 ]
 
 # Classical sign rulers (keep it simple + consistent)
-SIGN_RULER = {
-    "Aries": "Mars",
-    "Taurus": "Venus",
-    "Gemini": "Mercury",
-    "Cancer": "Moon",
-    "Leo": "Sun",
-    "Virgo": "Mercury",
-    "Libra": "Venus",
-    "Scorpio": "Mars",
-    "Sagittarius": "Jupiter",
-    "Capricorn": "Saturn",
-    "Aquarius": "Saturn",
-    "Pisces": "Jupiter",
-}
-
-
-def _planet_map(chart: VedicChart) -> Dict[str, Dict[str, Any]]:
-    # chart.planets already has standard structure
-    return {p.name: p.to_dict() for p in chart.planets}
-
-
-def _sign_distance(a: str, b: str) -> int:
-    ia, ib = SIGNS.index(a), SIGNS.index(b)
-    d = (ib - ia) % 12
-    return min(d, 12 - d)
+SIGN_RULER = dict(zip(SIGNS, SIGN_RULERS))
+
+
+# Integer feature vector per chart: everything the indicators look at
+# (the matching ChartFeatures fields, in this order).
+COMPAT_FEATURES = (
+    "asc_sign",
+    "moon_sign",
+    "mercury_sign",
+    "venus_sign",
+    "mars_sign",
+    "saturn_house",
+    "mars_house",
+    "seventh_lord_house",
+)
+(F_ASC, F_MOON, F_MERCURY, F_VENUS, F_MARS, F_SATURN_HOUSE, F_MARS_HOUSE, F_LORD_HOUSE) = range(len(COMPAT_FEATURES))
+
+LABELS = ("Strong indicators", "Mixed indicators", "Challenging indicators")
+
+# Lord of the 7th sign (Whole Sign) for each ascendant sign index
+_SEVENTH_LORD = tuple(SIGN_RULER[SIGNS[(asc + 6) % 12]] for asc in range(12))
+
+# Every score is a table gather, so the vectorized kernel and the per-pair
+# path (_pair_scores) read the same numbers. Distances are 0..6, houses 0..12.
+_DISTANCE = np.array([[min((b - a) % 12, (a - b) % 12) for b in range(12)] for a in range(12)], dtype=np.int8)
+_PRESSURE_HOUSES = (6, 8, 12)
+# Either house of a pair in 6/8/12 (int8 0/1 so it can index other tables)
+_PRESSURE_PAIR = np.array(
+    [[int(ha in _PRESSURE_HOUSES or hb in _PRESSURE_HOUSES) for hb in range(13)] for ha in range(13)], dtype=np.int8
+)
+_MANGLIK_HOUSE = np.isin(np.arange(13), MANGLIK_HOUSES)
+
+
+def _bucket_table(same: int, near: int, mid: int, far: int) -> np.ndarray:
+    """Score by sign distance 0..6: same / 1-2 near / 3-4 mid / 5-6 far."""
+    return np.array([same, near, near, mid, mid, far, far], dtype=np.int16)
+
+
+_EMOTIONAL = _bucket_table(88, 78, 65, 55)
+_COMMUNICATION = _bucket_table(85, 80, 70, 58)
+# Attraction averages both Venus-Mars distances
+_VM = _bucket_table(85, 80, 70, 62).tolist()
+_ATTRACTION = np.array([[int((_VM[d1] + _VM[d2]) / 2) for d2 in range(7)] for d1 in range(7)], dtype=np.int16)
+# Stability: Saturn "pressure zones" (heuristic), indexed by pressure 0/1
+_STABILITY = np.array([78, 62], dtype=np.int16)
+
+
+def _build_overall() -> np.ndarray:
+    """Overall weighted indicator score by (moon_d, mercury_d, vm_d1, vm_d2, saturn pressure)."""
+    table = np.empty((7, 7, 7, 7, 2), dtype=np.int16)
+    for idx in np.ndindex(*table.shape):
+        moon_d, merc_d, vm_d1, vm_d2, pressure = idx
+        table[idx] = round(
+            int(_EMOTIONAL[moon_d]) * 0.35 +
+            int(_COMMUNICATION[merc_d]) * 0.25 +
+            int(_ATTRACTION[vm_d1, vm_d2]) * 0.20 +
+            int(_STABILITY[pressure]) * 0.20
+        )
+    return table
+
+
+_OVERALL = _build_overall()
+# Label index by overall score 0..100
+_LABEL_INDEX = np.array([0 if s >= 78 else 1 if s >= 62 else 2 for s in range(101)], dtype=np.int8)
+
+# Python-list copies for the per-pair path
+_DISTANCE_L = _DISTANCE.tolist()
+_PRESSURE_PAIR_L = _PRESSURE_PAIR.tolist()
+_MANGLIK_HOUSE_L = _MANGLIK_HOUSE.tolist()
+_EMOTIONAL_L = _EMOTIONAL.tolist()
+_COMMUNICATION_L = _COMMUNICATION.tolist()
+_ATTRACTION_L = _ATTRACTION.tolist()
+_STABILITY_L = _STABILITY.tolist()
+_OVERALL_L = _OVERALL.tolist()
+_LABEL_INDEX_L = _LABEL_INDEX.tolist()
+
+# Batches up to this many pairs skip numpy (its per-call overhead dominates)
+_SCALAR_PAIRS = 8
+
+# ChartFeatures -> tuple in COMPAT_FEATURES order
+_feature_values = attrgetter(*COMPAT_FEATURES)
+
+
+def chart_features(chart: VedicChart) -> np.ndarray:
+    """(len(COMPAT_FEATURES),) int8 feature vector of one chart."""
+    return features_matrix([features_for_chart(chart)])[0]
+
+
+def batch_features(batch: ChartBatch) -> np.ndarray:
+    """(n, len(COMPAT_FEATURES)) int8 features straight from ChartBatch columns."""
+    n = len(batch)
+    lord_col = np.array([PLANET_COLUMNS.index(name) for name in _SEVENTH_LORD], dtype=np.intp)
+    asc = batch.asc_sign.astype(np.intp)
+    out = np.empty((n, len(COMPAT_FEATURES)), dtype=np.int8)
+    out[:, F_ASC] = asc
+    for f, name in ((F_MOON, "Moon"), (F_MERCURY, "Mercury"), (F_VENUS, "Venus"), (F_MARS, "Mars")):
+        out[:, f] = batch.sign[:, batch.column(name)]
+    out[:, F_SATURN_HOUSE] = batch.house[:, batch.column("Saturn")]
+    out[:, F_MARS_HOUSE] = batch.house[:, batch.column("Mars")]
+    out[:, F_LORD_HOUSE] = batch.house[np.arange(n), lord_col[asc]]
+    return out
+
+
+@dataclass(frozen=True)
+class CompatibilityArrays:
+    """
+    Output of compatibility_kernel: one array per quantity, all with the
+    broadcast pair shape. Scores are int16, flags bool.
+    """
+    moon_distance: np.ndarray
+    mercury_distance: np.ndarray
+    venus_mars_distances: Tuple[np.ndarray, np.ndarray]   # (Venus A - Mars B, Venus B - Mars A)
+    emotional: np.ndarray
+    communication: np.ndarray
+    attraction: np.ndarray
+    stability: np.ndarray
+    overall: np.ndarray
+    label_index: np.ndarray                               # into LABELS
+    saturn_pressure: np.ndarray
+    manglik: Tuple[np.ndarray, np.ndarray]
+    lord_pressure: np.ndarray
+
+    @property
+    def moon_harmony(self) -> np.ndarray:
+        return self.moon_distance <= 2
+
+    @property
+    def mercury_support(self) -> np.ndarray:
+        return self.mercury_distance <= 2
+
+    @property
+    def venus_mars_pull(self) -> np.ndarray:
+        return self.attraction >= 78
+
+
+def compatibility_kernel(features_a: np.ndarray, features_b: np.ndarray) -> CompatibilityArrays:
+    """
+    Indicator scores for arrays of pairs. features_a / features_b are
+    (..., len(COMPAT_FEATURES)) and broadcast against each other, e.g.
+    (n, 1, k) x (1, m, k) scores a full n x m block in one pass.
+    """
+    a = np.asarray(features_a, dtype=np.intp)
+    b = np.asarray(features_b, dtype=np.intp)
+
+    moon_d = _DISTANCE[a[..., F_MOON], b[..., F_MOON]]
+    merc_d = _DISTANCE[a[..., F_MERCURY], b[..., F_MERCURY]]
+    vm_d1 = _DISTANCE[a[..., F_VENUS], b[..., F_MARS]]
+    vm_d2 = _DISTANCE[b[..., F_VENUS], a[..., F_MARS]]
+    sat_pressure = _PRESSURE_PAIR[a[..., F_SATURN_HOUSE], b[..., F_SATURN_HOUSE]]
+    overall = _OVERALL[moon_d, merc_d, vm_d1, vm_d2, sat_pressure]
+
+    return CompatibilityArrays(
+        moon_distance=moon_d,
+        mercury_distance=merc_d,
+        venus_mars_distances=(vm_d1, vm_d2),
+        emotional=_EMOTIONAL[moon_d],
+        communication=_COMMUNICATION[merc_d],
+        attraction=_ATTRACTION[vm_d1, vm_d2],
+        stability=_STABILITY[sat_pressure],
+        overall=overall,
+        label_index=_LABEL_INDEX[overall],
+        saturn_pressure=sat_pressure.astype(bool),
+        manglik=(_MANGLIK_HOUSE[a[..., F_MARS_HOUSE]], _MANGLIK_HOUSE[b[..., F_MARS_HOUSE]]),
+        lord_pressure=_PRESSURE_PAIR[a[..., F_LORD_HOUSE], b[..., F_LORD_HOUSE]].astype(bool),
+    )
 
 
-def _manglik_from_lagna(mars_house: int) -> bool:
-    # Common simplified Manglik positions from Lagna
-    return mars_house in (1, 2, 4, 7, 8, 12)
+def _pair_scores(a: Sequence[int], b: Sequence[int]) -> Tuple[Any, ...]:
+    """compatibility_kernel for a single pair on plain Python values, in _kernel_rows order."""
+    moon_d = _DISTANCE_L[a[F_MOON]][b[F_MOON]]
+    merc_d = _DISTANCE_L[a[F_MERCURY]][b[F_MERCURY]]
+    vm_d1 = _DISTANCE_L[a[F_VENUS]][b[F_MARS]]
+    vm_d2 = _DISTANCE_L[b[F_VENUS]][a[F_MARS]]
+    sat_pressure = _PRESSURE_PAIR_L[a[F_SATURN_HOUSE]][b[F_SATURN_HOUSE]]
+    overall = _OVERALL_L[moon_d][merc_d][vm_d1][vm_d2][sat_pressure]
+    return (
+        moon_d, merc_d, vm_d1, vm_d2,
+        _EMOTIONAL_L[moon_d],
+        _COMMUNICATION_L[merc_d],
+        _ATTRACTION_L[vm_d1][vm_d2],
+        _STABILITY_L[sat_pressure],
+        overall,
+        _LABEL_INDEX_L[overall],
+        bool(sat_pressure),
+        _MANGLIK_HOUSE_L[a[F_MARS_HOUSE]],
+        _MANGLIK_HOUSE_L[b[F_MARS_HOUSE]],
+        bool(_PRESSURE_PAIR_L[a[F_LORD_HOUSE]][b[F_LORD_HOUSE]]),
+    )
 
 
-def _seventh_house_sign(asc_sign_idx: int) -> str:
-    # Whole Sign Houses: 7th sign from asc
-    return SIGNS[(asc_sign_idx + 6) % 12]
+def features_matrix(features: Sequence[ChartFeatures]) -> np.ndarray:
+    """(n, len(COMPAT_FEATURES)) int8 array from ChartFeatures records."""
+    return np.array([_feature_values(f) for f in features], dtype=np.int8).reshape(len(features), len(COMPAT_FEATURES))
+
+
+def _kernel_rows(k: CompatibilityArrays) -> Iterator[Tuple[Any, ...]]:
+    """Per-pair Python scalars from 1-D kernel output (one tolist() per array)."""
+    return zip(
+        k.moon_distance.tolist(),
+        k.mercury_distance.tolist(),
+        k.venus_mars_distances[0].tolist(),
+        k.venus_mars_distances[1].tolist(),
+        k.emotional.tolist(),
+        k.communication.tolist(),
+        k.attraction.tolist(),
+        k.stability.tolist(),
+        k.overall.tolist(),
+        k.label_index.tolist(),
+        k.saturn_pressure.tolist(),
+        k.manglik[0].tolist(),
+        k.manglik[1].tolist(),
+        k.lord_pressure.tolist(),
+    )
 
 
-def _score_bucket(distance: int, same: int, near: int, mid: int, far: int) -> int:
+def indicator_results(features_a: np.ndarray, features_b: np.ndarray) -> List[CompatibilityResult]:
     """
-    distance: 0..6
+    Batch form of compatibility_indicators: row i of the two
+    (n, len(COMPAT_FEATURES)) feature arrays is pair i. One kernel pass,
+    then the explained result per pair.
     """
-    if distance == 0:
-        return same
-    if distance in (1, 2):
-        return near
-    if distance in (3, 4):
-        return mid
-    return far
+    fa = np.asarray(features_a).reshape(-1, len(COMPAT_FEATURES))
+    fb = np.asarray(features_b).reshape(-1, len(COMPAT_FEATURES))
+    a_rows, b_rows = fa.tolist(), fb.tolist()
+    if len(a_rows) <= _SCALAR_PAIRS:
+        scores = map(_pair_scores, a_rows, b_rows)
+    else:
+        scores = _kernel_rows(compatibility_kernel(fa, fb))
+    return [_explain(a, b, s) for a, b, s in zip(a_rows, b_rows, scores)]
 
 
 def compatibility_indicators(chart_a: VedicChart, chart_b: VedicChart) -> CompatibilityResult:
     """
     Deterministic, explainable matching indicators.
     IMPORTANT: This is NOT Ashtakoota/Guna Milan.
+    Scores come from the kernel tables; see indicator_results for many pairs.
     """
-    pa = _planet_map(chart_a)
-    pb = _planet_map(chart_b)
-
-    # Core placements
-    moon_a, moon_b = pa["Moon"]["sign"], pb["Moon"]["sign"]
-    merc_a, merc_b = pa["Mercury"]["sign"], pb["Mercury"]["sign"]
-    ven_a, ven_b = pa["Venus"]["sign"], pb["Venus"]["sign"]
-    mar_a, mar_b = pa["Mars"]["sign"], pb["Mars"]["sign"]
-
-    sat_a_h, sat_b_h = pa["Saturn"]["house_whole_sign"], pb["Saturn"]["house_whole_sign"]
-    mars_a_h, mars_b_h = pa["Mars"]["house_whole_sign"], pb["Mars"]["house_whole_sign"]
-
-    # Distances
-    moon_d = _sign_distance(moon_a, moon_b)
-    merc_d = _sign_distance(merc_a, merc_b)
-    vm_d1 = _sign_distance(ven_a, mar_b)
-    vm_d2 = _sign_distance(ven_b, mar_a)
-
-    # Scores (heuristic buckets)
-    emotional = _score_bucket(moon_d, same=88, near=78, mid=65, far=55)
-    communication = _score_bucket(merc_d, same=85, near=80, mid=70, far=58)
-    attraction = int((_score_bucket(vm_d1, 85, 80, 70, 62) + _score_bucket(vm_d2, 85, 80, 70, 62)) / 2)
-
-    # Stability: Saturn "pressure zones" (heuristic)
-    sat_pressure = (sat_a_h in (6, 8, 12)) or (sat_b_h in (6, 8, 12))
-    stability = 62 if sat_pressure else 78
-
-    # Two more deterministic, useful flags
-    manglik_a = _manglik_from_lagna(mars_a_h)
-    manglik_b = _manglik_from_lagna(mars_b_h)
+    a = _feature_values(features_for_chart(chart_a))
+    b = _feature_values(features_for_chart(chart_b))
+    return _explain(a, b, _pair_scores(a, b))
+
+
+def _explain(a: Sequence[int], b: Sequence[int], scores: Tuple[Any, ...]) -> CompatibilityResult:
+    """CompatibilityResult for one pair from its feature vectors and kernel scores."""
+    (
+        moon_d, merc_d, vm_d1, vm_d2,
+        emotional, communication, attraction, stability,
+        overall_100, label_index,
+        sat_pressure, manglik_a, manglik_b, lord_pressure,
+    ) = scores
+
+    moon_a, moon_b = SIGNS[a[F_MOON]], SIGNS[b[F_MOON]]
+    merc_a, merc_b = SIGNS[a[F_MERCURY]], SIGNS[b[F_MERCURY]]
+    ven_a, ven_b = SIGNS[a[F_VENUS]], SIGNS[b[F_VENUS]]
+    mar_a, mar_b = SIGNS[a[F_MARS]], SIGNS[b[F_MARS]]
+    sat_a_h, sat_b_h = a[F_SATURN_HOUSE], b[F_SATURN_HOUSE]
+    mars_a_h, mars_b_h = a[F_MARS_HOUSE], b[F_MARS_HOUSE]
 
     # 7th house / lord indicators (Whole Sign)
-    asc_a_idx = chart_a.ascendant.sign_index
-    asc_b_idx = chart_b.ascendant.sign_index
-    seventh_a = _seventh_house_sign(asc_a_idx)
-    seventh_b = _seventh_house_sign(asc_b_idx)
+    seventh_a = SIGNS[(a[F_ASC] + 6) % 12]
+    seventh_b = SIGNS[(b[F_ASC] + 6) % 12]
     lord_a = SIGN_RULER[seventh_a]
     lord_b = SIGN_RULER[seventh_b]
-
-    lord_a_house = pa[lord_a]["house_whole_sign"] if lord_a in pa else None
-    lord_b_house = pb[lord_b]["house_whole_sign"] if lord_b in pb else None
-
-    lord_pressure = False
-    if lord_a_house in (6, 8, 12) or lord_b_house in (6, 8, 12):
-        lord_pressure = True
-
-    # Overall weighted indicator score
-    overall_100 = round(
-        emotional * 0.35 +
-        communication * 0.25 +
-        attraction * 0.20 +
-        stability * 0.20
-    )
+    lord_a_house = a[F_LORD_HOUSE] or None
+    lord_b_house = b[F_LORD_HOUSE] or None
 
     # Label (explicitly "indicator label")
-    label = "Strong indicators" if overall_100 >= 78 else "Mixed indicators" if overall_100 >= 62 else "Challenging indicators"
+    label = LABELS[label_index]
 
     signals: List[str] = []
     explainers: List[str] = []
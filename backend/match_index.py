@@ -0,0 +1,141 @@
+"""
+Inverted index of stored charts by Moon nakshatra-pada
+Stored birth charts are grouped into the 108 pada buckets. A threshold query
+("everyone scoring >= 24 with this person") reads one row of the guna
+pada-pair table to find the qualifying buckets and only touches charts in
+those buckets, so its cost follows the number of matches, not the number of
+stored profiles. Loaded from the typed moon_pada_index column of birth_charts
+(chart_data->moon for rows not backfilled yet) and kept current by
+database.save_birth_chart / delete_birth_chart.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .schemas import VedicChart
+from .guna import GUNA_TOTALS, PADA_COUNT, _NAKSHATRA_INDEX, moon_pada, pada_index
+
+
+def pada_from_chart_dict(chart_data: Dict[str, Any]) -> Optional[int]:
+    """Moon pada index of a stored chart (birth_charts.chart_data), None if it has no Moon data."""
+    moon = chart_data.get("moon") or {}
+    nak = _NAKSHATRA_INDEX.get(moon.get("nakshatra"))
+    pada = moon.get("pada")
+    if nak is None or not isinstance(pada, int) or not 1 <= pada <= 4:
+        return None
+    return pada_index(nak, pada)
+
+
+class PadaIndex:
+    """
+    chart id -> pada, plus 108 insertion-ordered buckets of chart ids.
+    Thread-safe; queries iterate over a snapshot of each bucket.
+    """
+
+    def __init__(self):
+        self._buckets: List[Dict[str, None]] = [{} for _ in range(PADA_COUNT)]
+        self._pada_of: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pada_of)
+
+    def __contains__(self, chart_id: str) -> bool:
+        return chart_id in self._pada_of
+
+    def add(self, chart_id: str, pada: int) -> None:
+        """Insert (or move) a chart."""
+        if not 0 <= pada < PADA_COUNT:
+            raise ValueError(f"pada index must be in 0..{PADA_COUNT - 1}")
+        with self._lock:
+            old = self._pada_of.get(chart_id)
+            if old is not None:
+                self._buckets[old].pop(chart_id, None)
+            self._pada_of[chart_id] = pada
+            self._buckets[pada][chart_id] = None
+
+    def add_chart(self, chart_id: str, chart_data: Dict[str, Any]) -> bool:
+        """Insert a stored chart dict; False if it carries no usable Moon pada."""
+        pada = pada_from_chart_dict(chart_data)
+        if pada is None:
+            return False
+        self.add(chart_id, pada)
+        return True
+
+    def remove(self, chart_id: str) -> bool:
+        with self._lock:
+            pada = self._pada_of.pop(chart_id, None)
+            if pada is None:
+                return False
+            self._buckets[pada].pop(chart_id, None)
+            return True
+
+    def bucket_sizes(self) -> np.ndarray:
+        return np.array([len(b) for b in self._buckets], dtype=np.int64)
+
+    def query(
+        self, pada: int, min_points: float, as_boy: bool = True, exclude: Optional[str] = None
+    ) -> Iterator[Tuple[str, float]]:
+        """
+        Lazily yield (chart_id, total_points) for every indexed chart scoring
+        >= min_points against a person with Moon pada `pada`, best buckets first.
+        as_boy: the person takes the boy's side of the (directional) Guna Milan.
+        """
+        row = GUNA_TOTALS[pada] if as_boy else GUNA_TOTALS[:, pada]
+        buckets = np.flatnonzero(row >= min_points)
+        for b in buckets[np.argsort(-row[buckets], kind="stable")].tolist():
+            with self._lock:
+                ids = list(self._buckets[b])
+            total = float(row[b])
+            for chart_id in ids:
+                if chart_id != exclude:
+                    yield chart_id, total
+
+    def query_chart(
+        self, chart: VedicChart, min_points: float, as_boy: bool = True, exclude: Optional[str] = None
+    ) -> Iterator[Tuple[str, float]]:
+        return self.query(moon_pada(chart), min_points, as_boy, exclude)
+
+    def count_at_least(self, pada: int, min_points: float, as_boy: bool = True) -> int:
+        """Number of matches without materializing them."""
+        row = GUNA_TOTALS[pada] if as_boy else GUNA_TOTALS[:, pada]
+        return int(self.bucket_sizes()[row >= min_points].sum())
+
+    def add_row(self, row: Dict[str, Any]) -> bool:
+        """Insert a birth_charts row: typed moon_pada_index column, else its chart_data (or just its "moon")."""
+        if row.get("moon_pada_index") is not None:
+            self.add(str(row["id"]), int(row["moon_pada_index"]))
+            return True
+        return self.add_chart(str(row["id"]), row.get("chart_data") or {"moon": row.get("moon")})
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "PadaIndex":
+        """Build from birth_charts rows ({"id", "moon_pada_index"}, {"id", "moon"} or {"id", "chart_data"})."""
+        index = cls()
+        for row in rows:
+            index.add_row(row)
+        return index
+
+
+# Process-wide index over birth_charts, loaded on first use
+candidate_index = PadaIndex()
+_loaded = False
+_load_lock = threading.Lock()
+
+
+def get_candidate_index() -> PadaIndex:
+    """
+    The shared index, bulk-loaded from birth_charts the first time (when
+    Supabase is configured). A failed load raises and is retried by the next call.
+    """
+    global _loaded
+    with _load_lock:
+        if not _loaded:
+            from .database import iter_chart_features
+            for row in iter_chart_features():
+                candidate_index.add_row(row)
+            _loaded = True
+    return candidate_index
@@ -0,0 +1,239 @@
+"""
+Birth-time rectification sweep
+Finds every instant inside a +/-N minute window around the given birth time
+where the chart changes in a way users care about (Ascendant sign, Moon
+nakshatra/pada, any planet's sign) and returns the distinct chart variants
+between those instants. Boundaries are located by root-finding on the
+sidereal longitudes, not by stepping minute by minute.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+import swisseph as swe
+
+from .schemas import BirthInput, VedicChart
+from .chart import (
+    NAKSHATRAS,
+    SIGNS,
+    _ascendant_trop_for,
+    _calc_flags,
+    _calc_planet,
+    _chart_at,
+    _julian_day_ut,
+    _planets_spec,
+    _to_utc_dt,
+    _validate_lat_lon,
+)
+from .events import (
+    NAKSHATRA_SPAN,
+    _ROOT_TOLERANCE_DAYS,
+    _boundaries_crossed,
+    _find_crossing,
+    _jd_to_dt,
+    _wrap180,
+)
+from .timezones import get_zone
+
+MAX_WINDOW_MINUTES = 720
+PADA_SPAN = NAKSHATRA_SPAN / 4.0
+
+# Ascendant is sampled at this step to unwrap its (monotonic, uneven) motion
+_ASC_SAMPLE_MINUTES = 15
+
+
+@dataclass(frozen=True)
+class BoundaryEvent:
+    """One change in the chart at an exact instant."""
+    utc_time: str
+    local_time: str
+    kind: str        # "ascendant_sign" | "planet_sign" | "moon_nakshatra" | "moon_pada"
+    body: str
+    from_value: str
+    to_value: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "utc_time": self.utc_time,
+            "local_time": self.local_time,
+            "kind": self.kind,
+            "body": self.body,
+            "from": self.from_value,
+            "to": self.to_value,
+        }
+
+
+@dataclass(frozen=True)
+class ChartVariant:
+    """Chart that holds for every birth time in [start, end)."""
+    start_utc: str
+    end_utc: str
+    start_local: str
+    end_local: str
+    contains_birth_time: bool
+    chart: VedicChart
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start_utc": self.start_utc,
+            "end_utc": self.end_utc,
+            "start_local": self.start_local,
+            "end_local": self.end_local,
+            "contains_birth_time": self.contains_birth_time,
+            "chart": self.chart.to_dict(),
+        }
+
+
+@dataclass(frozen=True)
+class RectificationResult:
+    birth_utc: str
+    window_minutes: int
+    events: List[BoundaryEvent]
+    variants: List[ChartVariant]
+    ephemeris_calls: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "birth_utc": self.birth_utc,
+            "window_minutes": self.window_minutes,
+            "events": [e.to_dict() for e in self.events],
+            "variants": [v.to_dict() for v in self.variants],
+            "ephemeris_calls": self.ephemeris_calls,
+        }
+
+
+def rectify_birth_time(
+    b: BirthInput,
+    window_minutes: int = 120,
+    high_precision: bool = False,
+    use_true_node: bool = False,
+) -> RectificationResult:
+    """
+    Sweep birth times in [t - window, t + window] and return the boundary
+    events plus one chart per interval between consecutive events.
+    """
+    if not (1 <= window_minutes <= MAX_WINDOW_MINUTES):
+        raise ValueError(f"window_minutes must be between 1 and {MAX_WINDOW_MINUTES}")
+    _validate_lat_lon(b)
+
+    swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
+
+    birth_dt = _to_utc_dt(b)
+    jd0 = _julian_day_ut(birth_dt)
+    span_days = window_minutes / 1440.0
+    jd_a, jd_b = jd0 - span_days, jd0 + span_days
+
+    flags = _calc_flags(high_precision)
+    calls = [0]
+    # ayanamsa moves ~0.0001 arcsec per hour; one value for the window is exact enough
+    ayan = float(swe.get_ayanamsa_ut(jd0))
+    calls[0] += 1
+
+    def asc_lon(jd: float) -> float:
+        calls[0] += 1
+        return (_ascendant_trop_for(jd, b.lat, b.lon, False) - ayan) % 360.0
+
+    def planet_lon(pid: int) -> Callable[[float], float]:
+        def f(jd: float) -> float:
+            calls[0] += 1
+            return _calc_planet(jd, pid, flags)[0]
+        return f
+
+    # (kind-tag, body, function, sample instants)
+    n_asc = max(1, math.ceil(2 * window_minutes / _ASC_SAMPLE_MINUTES))
+    tracks: List[Tuple[str, str, Callable[[float], float], List[float]]] = [
+        ("asc", "Ascendant", asc_lon, [jd_a + (jd_b - jd_a) * i / n_asc for i in range(n_asc + 1)]),
+    ]
+    for name, pid in _planets_spec(use_true_node):
+        tracks.append(("moon" if name == "Moon" else "planet", name, planet_lon(pid), [jd_a, jd_b]))
+
+    found: List[Tuple[float, str, str, str, str]] = []
+    for tag, body, f, samples in tracks:
+        span = PADA_SPAN if tag == "moon" else 30.0
+        values = [f(t) for t in samples]
+        for (t0, v0), (t1, v1) in zip(zip(samples, values), zip(samples[1:], values[1:])):
+            delta = _wrap180(v1 - v0)
+            for k in _boundaries_crossed(v0, delta, span):
+                t = _find_crossing(f, (k * span) % 360.0, t0, t1, v0, v1)
+                up = delta > 0
+                found.extend(_events_for(tag, body, k, up, t))
+
+    found.sort(key=lambda e: e[0])
+
+    # Event instants are reported as the first whole second on the new side
+    zone = get_zone(b.tz)
+    events = [
+        BoundaryEvent(
+            utc_time=_jd_to_dt(t, ceil=True).isoformat(),
+            local_time=_jd_to_dt(t, ceil=True).astimezone(zone).isoformat(),
+            kind=kind,
+            body=body,
+            from_value=frm,
+            to_value=to,
+        )
+        for t, kind, body, frm, to in found
+    ]
+
+    # Interval edges: window ends plus every distinct event instant
+    edges = [jd_a]
+    for t, *_ in found:
+        if t - edges[-1] > _ROOT_TOLERANCE_DAYS:
+            edges.append(t)
+    if jd_b - edges[-1] > _ROOT_TOLERANCE_DAYS:
+        edges.append(jd_b)
+    else:
+        edges[-1] = jd_b
+
+    variants: List[ChartVariant] = []
+    for start, end in zip(edges, edges[1:]):
+        mid_dt = _jd_to_dt(0.5 * (start + end))
+        chart = _chart_at(b.name, mid_dt, b.lat, b.lon, high_precision, use_true_node, False)
+        calls[0] += len(chart.planets) + 1  # 8 planets + ayanamsa + houses (Ketu is derived)
+        s_dt = _jd_to_dt(start, ceil=start != jd_a)
+        e_dt = _jd_to_dt(end, ceil=end != jd_b)
+        variants.append(ChartVariant(
+            start_utc=s_dt.isoformat(),
+            end_utc=e_dt.isoformat(),
+            start_local=s_dt.astimezone(zone).isoformat(),
+            end_local=e_dt.astimezone(zone).isoformat(),
+            contains_birth_time=start <= jd0 < end or (end == jd_b and jd0 == jd_b),
+            chart=chart,
+        ))
+
+    return RectificationResult(
+        birth_utc=birth_dt.isoformat(),
+        window_minutes=window_minutes,
+        events=events,
+        variants=variants,
+        ephemeris_calls=calls[0],
+    )
+
+
+def _events_for(tag: str, body: str, k: int, up: bool, t: float) -> List[Tuple[float, str, str, str, str]]:
+    """
+    Events emitted when boundary k of a track is crossed (moving up or down).
+    Moon tracks pada boundaries, which include every nakshatra and sign boundary.
+    """
+    new_k, old_k = (k, k - 1) if up else (k - 1, k)
+    out: List[Tuple[float, str, str, str, str]] = []
+
+    if tag == "asc":
+        out.append((t, "ascendant_sign", body, SIGNS[old_k % 12], SIGNS[new_k % 12]))
+    elif tag == "planet":
+        out.append((t, "planet_sign", body, SIGNS[old_k % 12], SIGNS[new_k % 12]))
+        if body == "Rahu":
+            # Ketu is exactly opposite, so it changes sign at the same instant
+            out.append((t, "planet_sign", "Ketu", SIGNS[(old_k + 6) % 12], SIGNS[(new_k + 6) % 12]))
+    else:
+        def pada_label(p: int) -> str:
+            p %= 108
+            return f"{NAKSHATRAS[p // 4]} {p % 4 + 1}"
+
+        out.append((t, "moon_pada", body, pada_label(old_k), pada_label(new_k)))
+        if k % 4 == 0:
+            out.append((t, "moon_nakshatra", body, NAKSHATRAS[(old_k % 108) // 4], NAKSHATRAS[(new_k % 108) // 4]))
+        if k % 9 == 0:
+            out.append((t, "planet_sign", body, SIGNS[(old_k % 108) // 9], SIGNS[(new_k % 108) // 9]))
+    return out
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from .dasha import DashaTimeline, vimshottari
+
 
 @dataclass(frozen=True)
 class BirthInput:
@@ -13,6 +15,8 @@ class BirthInput:
     time: HH:MM (24h)
     tz: IANA timezone like "Asia/Kolkata"
     lat/lon: decimal degrees
+    fold: 0/1 picks the earlier/later instant when a DST change makes the
+          local time occur twice; None rejects such times
     """
     date: str
     time: str
@@ -20,9 +24,10 @@ class BirthInput:
     lat: float
     lon: float
     name: str = ""
+    fold: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PlanetPosition:
     name: str
     lon: float                # 0..360 sidereal longitude
@@ -33,11 +38,18 @@ class PlanetPosition:
     retrograde: bool
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-        return d
+        return {
+            "name": self.name,
+            "lon": self.lon,
+            "sign": self.sign,
+            "sign_index": self.sign_index,
+            "degree_in_sign": self.degree_in_sign,
+            "house_whole_sign": self.house_whole_sign,
+            "retrograde": self.retrograde,
+        }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Ascendant:
     lon_sidereal: float
     sign: str
@@ -46,10 +58,57 @@ class Ascendant:
     lon_tropical: float  # for debugging / transparency
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "lon_sidereal": self.lon_sidereal,
+            "sign": self.sign,
+            "sign_index": self.sign_index,
+            "degree_in_sign": self.degree_in_sign,
+            "lon_tropical": self.lon_tropical,
+        }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class ChartFeatures:
+    """
+    The small integers the matchers read, derived once per chart.
+    Signs 0..11, houses 1..12 (Whole Sign), nakshatra 0..26, pada 1..4;
+    seventh_lord_house is 0 when the lord is missing from the chart.
+    Persisted as typed columns of birth_charts (see supabase_schema.sql).
+    """
+    asc_sign: int
+    moon_sign: int
+    moon_nakshatra: int
+    moon_pada: int
+    mercury_sign: int
+    venus_sign: int
+    mars_sign: int
+    saturn_house: int
+    mars_house: int
+    seventh_lord_house: int
+    manglik: bool             # simplified: Mars in 1/2/4/7/8/12 from Lagna
+
+    @property
+    def moon_pada_index(self) -> int:
+        """0..107, the Guna table / match index key."""
+        return self.moon_nakshatra * 4 + self.moon_pada - 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "asc_sign": self.asc_sign,
+            "moon_sign": self.moon_sign,
+            "moon_nakshatra": self.moon_nakshatra,
+            "moon_pada": self.moon_pada,
+            "mercury_sign": self.mercury_sign,
+            "venus_sign": self.venus_sign,
+            "mars_sign": self.mars_sign,
+            "saturn_house": self.saturn_house,
+            "mars_house": self.mars_house,
+            "seventh_lord_house": self.seventh_lord_house,
+            "manglik": self.manglik,
+        }
+
+
+@dataclass(frozen=True, slots=True)
 class VedicChart:
     name: str
     utc_time: str
@@ -60,6 +119,13 @@ class VedicChart:
     moon_nakshatra: str
     moon_pada: int
     planets: List[PlanetPosition]
+    features: Optional[ChartFeatures] = None   # set by the chart engine; not serialized
+
+    @property
+    def dasha(self) -> DashaTimeline:
+        """Vimshottari timeline from the Moon longitude (memoized per chart)."""
+        moon = next(p for p in self.planets if p.name == "Moon")
+        return vimshottari(self.utc_time, moon.lon)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -76,10 +142,11 @@ class VedicChart:
                 "pada": self.moon_pada,
             },
             "planets": [p.to_dict() for p in self.planets],
+            "dasha": self.dasha.to_dict(),
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CompatibilityResult:
     """
     Deterministic indicator-based matching.
@@ -92,4 +159,11 @@ class CompatibilityResult:
     explainers: List[str]
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # nested containers are shared with the result, not deep-copied
+        return {
+            "overall_score_100": self.overall_score_100,
+            "label": self.label,
+            "dimensions": self.dimensions,
+            "signals": self.signals,
+            "explainers": self.explainers,
+        }
@@ -0,0 +1,54 @@
+"""
+Fused pair scoring
+Compatibility indicators and Guna Milan for a pair in one call, both read
+from each chart's precomputed ChartFeatures: no planet-list scans or
+sign-name lookups per result. score_pairs is the batch form (one
+indicator kernel pass for all pairs).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .schemas import ChartFeatures, CompatibilityResult, VedicChart
+from .chart import features_for_chart
+from .match import features_matrix, indicator_results
+from .guna import GunaResult, _calculate_guna_milan_direct, guna_for_padas
+
+
+@dataclass(frozen=True, slots=True)
+class PairScore:
+    compatibility: CompatibilityResult
+    guna: GunaResult
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"compatibility": self.compatibility.to_dict(), "guna": self.guna.to_dict()}
+
+
+def _guna(fa: ChartFeatures, fb: ChartFeatures, chart_a: VedicChart, chart_b: VedicChart) -> GunaResult:
+    """calculate_guna_milan from features: table lookup unless a pada can't be indexed."""
+    if 1 <= fa.moon_pada <= 4 and 1 <= fb.moon_pada <= 4:
+        pa, pb = fa.moon_pada_index, fb.moon_pada_index
+        # Same guard as chart_pada_index: the pada must lie in the Moon's sign
+        if pa // 9 == fa.moon_sign and pb // 9 == fb.moon_sign:
+            return guna_for_padas(pa, pb)
+    return _calculate_guna_milan_direct(chart_a, chart_b)
+
+
+def score_pairs(pairs: Sequence[Tuple[VedicChart, VedicChart]]) -> List[PairScore]:
+    """
+    Batch form of score_pair, same output element for element.
+    (chart_a, chart_b) = (partner A / boy, partner B / girl).
+    """
+    feats_a = [features_for_chart(a) for a, _ in pairs]
+    feats_b = [features_for_chart(b) for _, b in pairs]
+    indicators = indicator_results(features_matrix(feats_a), features_matrix(feats_b))
+    return [
+        PairScore(ind, _guna(fa, fb, a, b))
+        for ind, fa, fb, (a, b) in zip(indicators, feats_a, feats_b, pairs)
+    ]
+
+
+def score_pair(chart_a: VedicChart, chart_b: VedicChart) -> PairScore:
+    """compatibility_indicators(a, b) and calculate_guna_milan(a, b) in one pass."""
+    return score_pairs([(chart_a, chart_b)])[0]
@@ -0,0 +1,69 @@
+"""
+Single-flight request coalescing
+Identical computations that overlap in time (a double click, a proxy retry)
+share one run: the first caller starts it and every concurrent duplicate
+awaits the same future. Nothing is kept after the run finishes; remembering
+results is the chart cache's job.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+def request_key(kind: str, body: Any, version: str = "") -> str:
+    """
+    Canonical hash of a request: endpoint kind, version (e.g. the prompt
+    version for LLM endpoints) and the JSON body with sorted keys, so field
+    order and whitespace don't matter.
+    """
+    canonical = json.dumps([kind, version, body], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    In-flight calls by key, for one event loop.
+    Callers must treat the shared result as read-only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """fn() once per key at a time; duplicates arriving meanwhile get its result (or exception)."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        # Shielded: one caller disconnecting must not cancel the run for the others
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller went away
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._inflight), "calls": self.calls, "coalesced": self.coalesced}
+
+
+# Chart computations (keyed like the chart cache) and whole API responses
+chart_flights = SingleFlight("charts")
+request_flights = SingleFlight("requests")
+
+
+def coalescing_stats() -> Dict[str, Any]:
+    return {f.name: f.stats() for f in (chart_flights, request_flights)}
@@ -49,6 +49,28 @@ CREATE INDEX IF NOT EXISTS idx_birth_charts_session ON birth_charts(session_id);
 CREATE INDEX IF NOT EXISTS idx_birth_charts_created ON birth_charts(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_birth_charts_user ON birth_charts(user_id) WHERE user_id IS NOT NULL;
 
+-- Chart features (ChartFeatures in backend/schemas.py) as typed columns so
+-- matching and analytics never parse chart_data. Signs 0..11, houses 1..12
+-- (Whole Sign), nakshatra 0..26, pada 1..4. Added with ALTER so existing
+-- databases pick them up; older rows stay NULL until backfilled with
+-- `python -m backend.database backfill` (run from the repo root).
+ALTER TABLE birth_charts
+  ADD COLUMN IF NOT EXISTS asc_sign SMALLINT CHECK (asc_sign BETWEEN 0 AND 11),
+  ADD COLUMN IF NOT EXISTS moon_sign SMALLINT CHECK (moon_sign BETWEEN 0 AND 11),
+  ADD COLUMN IF NOT EXISTS moon_nakshatra SMALLINT CHECK (moon_nakshatra BETWEEN 0 AND 26),
+  ADD COLUMN IF NOT EXISTS moon_pada SMALLINT CHECK (moon_pada BETWEEN 1 AND 4),
+  ADD COLUMN IF NOT EXISTS moon_pada_index SMALLINT GENERATED ALWAYS AS (moon_nakshatra * 4 + moon_pada - 1) STORED,
+  ADD COLUMN IF NOT EXISTS mercury_sign SMALLINT CHECK (mercury_sign BETWEEN 0 AND 11),
+  ADD COLUMN IF NOT EXISTS venus_sign SMALLINT CHECK (venus_sign BETWEEN 0 AND 11),
+  ADD COLUMN IF NOT EXISTS mars_sign SMALLINT CHECK (mars_sign BETWEEN 0 AND 11),
+  ADD COLUMN IF NOT EXISTS saturn_house SMALLINT CHECK (saturn_house BETWEEN 1 AND 12),
+  ADD COLUMN IF NOT EXISTS mars_house SMALLINT CHECK (mars_house BETWEEN 1 AND 12),
+  ADD COLUMN IF NOT EXISTS seventh_lord_house SMALLINT CHECK (seventh_lord_house BETWEEN 0 AND 12),
+  ADD COLUMN IF NOT EXISTS manglik BOOLEAN;
+
+CREATE INDEX IF NOT EXISTS idx_birth_charts_moon_pada ON birth_charts(moon_pada_index) WHERE moon_pada_index IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_birth_charts_moon_sign ON birth_charts(moon_sign);
+
 -- ============================================================================
 -- TABLE: compatibility_queries
 -- Store compatibility calculations
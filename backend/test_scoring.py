@@ -0,0 +1,273 @@
+"""
+Differential test: fused scorer vs reference implementations
+Scores a large random pair corpus with score_pair / score_pairs and checks the
+JSON is identical to the original string-based compatibility_indicators
+(kept below as the reference) and the koota-by-koota Guna Milan.
+pytest runs a few hundred pairs; the script runs 20000 and adds timings.
+Run from the repo root: python -m backend.test_scoring [N_PAIRS]
+"""
+import json
+import random
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.bench_chart import random_births
+from backend.schemas import CompatibilityResult, PlanetPosition, VedicChart
+from backend.chart import calculate_vedic_charts
+from backend.match import SIGN_RULER, SIGNS, compatibility_indicators
+from backend.guna import _calculate_guna_milan_direct, calculate_guna_milan
+from backend.scoring import score_pair, score_pairs
+
+
+# ============================================================================
+# REFERENCE: original indicator implementation
+# ============================================================================
+
+def _planet_map(chart: VedicChart) -> Dict[str, PlanetPosition]:
+    return {p.name: p for p in chart.planets}
+
+
+def _sign_distance(a: str, b: str) -> int:
+    ia, ib = SIGNS.index(a), SIGNS.index(b)
+    d = (ib - ia) % 12
+    return min(d, 12 - d)
+
+
+def _manglik_from_lagna(mars_house: int) -> bool:
+    # Common simplified Manglik positions from Lagna
+    return mars_house in (1, 2, 4, 7, 8, 12)
+
+
+def _seventh_house_sign(asc_sign_idx: int) -> str:
+    # Whole Sign Houses: 7th sign from asc
+    return SIGNS[(asc_sign_idx + 6) % 12]
+
+
+def _score_bucket(distance: int, same: int, near: int, mid: int, far: int) -> int:
+    """
+    distance: 0..6
+    """
+    if distance == 0:
+        return same
+    if distance in (1, 2):
+        return near
+    if distance in (3, 4):
+        return mid
+    return far
+
+
+def reference_indicators(chart_a: VedicChart, chart_b: VedicChart) -> CompatibilityResult:
+    """compatibility_indicators as it was before the kernel (planet map + sign names)."""
+    pa = _planet_map(chart_a)
+    pb = _planet_map(chart_b)
+
+    # Core placements
+    moon_a, moon_b = pa["Moon"].sign, pb["Moon"].sign
+    merc_a, merc_b = pa["Mercury"].sign, pb["Mercury"].sign
+    ven_a, ven_b = pa["Venus"].sign, pb["Venus"].sign
+    mar_a, mar_b = pa["Mars"].sign, pb["Mars"].sign
+
+    sat_a_h, sat_b_h = pa["Saturn"].house_whole_sign, pb["Saturn"].house_whole_sign
+    mars_a_h, mars_b_h = pa["Mars"].house_whole_sign, pb["Mars"].house_whole_sign
+
+    # Distances
+    moon_d = _sign_distance(moon_a, moon_b)
+    merc_d = _sign_distance(merc_a, merc_b)
+    vm_d1 = _sign_distance(ven_a, mar_b)
+    vm_d2 = _sign_distance(ven_b, mar_a)
+
+    # Scores (heuristic buckets)
+    emotional = _score_bucket(moon_d, same=88, near=78, mid=65, far=55)
+    communication = _score_bucket(merc_d, same=85, near=80, mid=70, far=58)
+    attraction = int((_score_bucket(vm_d1, 85, 80, 70, 62) + _score_bucket(vm_d2, 85, 80, 70, 62)) / 2)
+
+    # Stability: Saturn "pressure zones" (heuristic)
+    sat_pressure = (sat_a_h in (6, 8, 12)) or (sat_b_h in (6, 8, 12))
+    stability = 62 if sat_pressure else 78
+
+    # Two more deterministic, useful flags
+    manglik_a = _manglik_from_lagna(mars_a_h)
+    manglik_b = _manglik_from_lagna(mars_b_h)
+
+    # 7th house / lord indicators (Whole Sign)
+    asc_a_idx = chart_a.ascendant.sign_index
+    asc_b_idx = chart_b.ascendant.sign_index
+    seventh_a = _seventh_house_sign(asc_a_idx)
+    seventh_b = _seventh_house_sign(asc_b_idx)
+    lord_a = SIGN_RULER[seventh_a]
+    lord_b = SIGN_RULER[seventh_b]
+
+    lord_a_house = pa[lord_a].house_whole_sign if lord_a in pa else None
+    lord_b_house = pb[lord_b].house_whole_sign if lord_b in pb else None
+
+    lord_pressure = False
+    if lord_a_house in (6, 8, 12) or lord_b_house in (6, 8, 12):
+        lord_pressure = True
+
+    # Overall weighted indicator score
+    overall_100 = round(
+        emotional * 0.35 +
+        communication * 0.25 +
+        attraction * 0.20 +
+        stability * 0.20
+    )
+
+    # Label (explicitly "indicator label")
+    label = "Strong indicators" if overall_100 >= 78 else "Mixed indicators" if overall_100 >= 62 else "Challenging indicators"
+
+    signals: List[str] = []
+    explainers: List[str] = []
+
+    if moon_d <= 2:
+        signals.append("moon_harmony")
+        explainers.append(f"Moon signs are close ({moon_a} ↔ {moon_b}), which tends to support emotional attunement.")
+    else:
+        signals.append("moon_distance")
+        explainers.append(f"Moon signs are farther apart ({moon_a} ↔ {moon_b}); emotional needs may be expressed differently.")
+
+    if merc_d <= 2:
+        signals.append("mercury_support")
+        explainers.append(f"Mercury signs are close ({merc_a} ↔ {merc_b}), which usually helps communication style.")
+    else:
+        signals.append("mercury_distance")
+        explainers.append(f"Mercury signs are farther apart ({merc_a} ↔ {merc_b}); communication may need more structure.")
+
+    if attraction >= 78:
+        signals.append("venus_mars_pull")
+        explainers.append("Venus↔Mars sign interplay is relatively supportive, indicating stronger attraction/chemistry indicators.")
+    else:
+        signals.append("venus_mars_mixed")
+        explainers.append("Venus↔Mars sign interplay is mixed; attraction may vary by circumstances and timing.")
+
+    if sat_pressure:
+        signals.append("saturn_pressure")
+        explainers.append("Saturn falls in a pressure house (6/8/12) for at least one chart (Whole Sign), suggesting higher responsibility/friction themes.")
+    else:
+        signals.append("saturn_support")
+        explainers.append("Saturn is not in 6/8/12 for either chart (Whole Sign), supporting steadier long-term patterns.")
+
+    if manglik_a or manglik_b:
+        signals.append("manglik_flag_simple")
+        explainers.append("Simplified Manglik flag detected (Mars in 1/2/4/7/8/12 from Lagna for at least one chart). Treat as a signal to manage conflict/impulsivity, not a verdict.")
+
+    if lord_pressure:
+        signals.append("7th_lord_pressure")
+        explainers.append("7th house lord falls in a pressure house (6/8/12) for at least one chart (Whole Sign). This can correlate with relationship effort themes.")
+    else:
+        signals.append("7th_lord_ok")
+        explainers.append("7th house lord is not in 6/8/12 (Whole Sign) for both charts, which is a cleaner partnership-effort indicator.")
+
+    dimensions = {
+        "emotional": {
+            "score_100": emotional,
+            "basis": {"moon_sign_distance": moon_d, "moon_signs": [moon_a, moon_b]},
+        },
+        "communication": {
+            "score_100": communication,
+            "basis": {"mercury_sign_distance": merc_d, "mercury_signs": [merc_a, merc_b]},
+        },
+        "attraction": {
+            "score_100": attraction,
+            "basis": {"venus_mars_distances": [vm_d1, vm_d2], "pairs": [(ven_a, mar_b), (ven_b, mar_a)]},
+        },
+        "stability": {
+            "score_100": stability,
+            "basis": {"saturn_house_whole_sign": [sat_a_h, sat_b_h], "saturn_pressure": sat_pressure},
+        },
+        "additional": {
+            "manglik_simple": {"a": manglik_a, "b": manglik_b, "mars_houses": [mars_a_h, mars_b_h]},
+            "seventh_house": {
+                "a": {"sign": seventh_a, "lord": lord_a, "lord_house": lord_a_house},
+                "b": {"sign": seventh_b, "lord": lord_b, "lord_house": lord_b_house},
+            },
+        },
+    }
+
+    return CompatibilityResult(
+        overall_score_100=int(overall_100),
+        label=label,
+        dimensions=dimensions,
+        signals=signals,
+        explainers=explainers,
+    )
+
+
+# ============================================================================
+# TEST
+# ============================================================================
+
+def _corpus(n_pairs: int, seed: int = 7) -> List[tuple]:
+    """Random pairs, including self-pairs, swapped pairs and charts without precomputed features."""
+    charts = list(calculate_vedic_charts(random_births(2 * n_pairs, seed=seed)).charts())
+    rng = random.Random(seed)
+    pairs = list(zip(charts[::2], charts[1::2]))
+    pairs += [(b, a) for a, b in pairs[: n_pairs // 10]]
+    pairs += [(a, a) for a, _ in pairs[: n_pairs // 50]]
+    pairs += [(replace(a, features=None), b) for a, b in rng.sample(pairs, n_pairs // 20)]
+    return pairs
+
+
+def _reference(a: VedicChart, b: VedicChart) -> Dict:
+    return {"compatibility": reference_indicators(a, b).to_dict(), "guna": _calculate_guna_milan_direct(a, b).to_dict()}
+
+
+def test_scoring(n_pairs: int = 300, timing: bool = False) -> None:
+    print(f"\n🔍 Fused scorer differential test ({n_pairs} random pairs + edge cases)\n")
+    pairs = _corpus(n_pairs)
+
+    expected = [json.dumps(_reference(a, b)) for a, b in pairs]
+    checks = {
+        "score_pair": [json.dumps(score_pair(a, b).to_dict()) for a, b in pairs],
+        "score_pairs (batch)": [json.dumps(s.to_dict()) for s in score_pairs(pairs)],
+        "separate calls": [
+            json.dumps({"compatibility": compatibility_indicators(a, b).to_dict(), "guna": calculate_guna_milan(a, b).to_dict()})
+            for a, b in pairs
+        ],
+    }
+
+    failed = []
+    for label, got in checks.items():
+        bad = [i for i, (g, e) in enumerate(zip(got, expected)) if g != e]
+        if bad:
+            failed.append(label)
+            print(f"   ❌ {label}: {len(bad)} of {len(pairs)} differ (first at pair {bad[0]})")
+        else:
+            print(f"   ✅ {label}: identical for all {len(pairs)} pairs")
+
+    if timing:
+        _report_timing(pairs)
+    assert not failed, f"differs from the reference: {', '.join(failed)}"
+
+
+def _report_timing(pairs: List[tuple]) -> None:
+    # Every path keeps its results, so all pay the same allocation / GC cost
+    t0 = time.perf_counter()
+    kept = [(reference_indicators(a, b), _calculate_guna_milan_direct(a, b)) for a, b in pairs]
+    t_ref = time.perf_counter() - t0
+    del kept
+    t0 = time.perf_counter()
+    kept = [score_pair(a, b) for a, b in pairs]
+    t_pair = time.perf_counter() - t0
+    del kept
+    t0 = time.perf_counter()
+    kept = score_pairs(pairs)
+    t_batch = time.perf_counter() - t0
+    del kept
+    n = len(pairs)
+    print(
+        f"\n   reference {t_ref / n * 1e6:6.1f} us/pair   score_pair {t_pair / n * 1e6:6.1f} us/pair   "
+        f"score_pairs {t_batch / n * 1e6:6.1f} us/pair\n"
+    )
+
+
+if __name__ == "__main__":
+    try:
+        test_scoring(int(sys.argv[1]) if len(sys.argv) > 1 else 20000, timing=True)
+    except AssertionError as e:
+        print(f"   ❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,247 @@
+"""
+Timezone service
+Validated zone cache plus compiled UTC-offset transition tables for the zones
+we see most, so local -> UTC conversion is a binary search. DST folds
+(ambiguous wall times) and gaps (nonexistent wall times) are reported
+explicitly instead of being silently resolved.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+UTC = timezone.utc
+
+# Zones compiled eagerly by warm_timezones(); others compile on first bulk use
+HOT_ZONES = (
+    "Asia/Kolkata",
+    "Asia/Kathmandu",
+    "Asia/Karachi",
+    "Asia/Dhaka",
+    "Asia/Colombo",
+    "Asia/Dubai",
+    "Europe/London",
+    "America/New_York",
+)
+
+# Compiled range [1900-01-01, 2101-01-01) UTC; outside it the zoneinfo path is used
+TABLE_START = int(datetime(1900, 1, 1, tzinfo=UTC).timestamp())
+TABLE_END = int(datetime(2101, 1, 1, tzinfo=UTC).timestamp())
+
+_EPOCH = datetime(1970, 1, 1)
+_DAY = 86400
+
+# Vectorized status codes
+STATUS_OK = 0
+STATUS_AMBIGUOUS = 1
+STATUS_NONEXISTENT = 2
+
+
+class AmbiguousLocalTimeError(ValueError):
+    """Wall time occurs twice (DST fold); caller must pass fold=0/1."""
+
+
+class NonexistentLocalTimeError(ValueError):
+    """Wall time was skipped by a DST gap."""
+
+
+@dataclass(frozen=True)
+class LocalTimeResolution:
+    """
+    status: "ok" | "ambiguous" | "nonexistent"
+    candidates: UTC instants the wall time maps to (2 when ambiguous,
+    earlier first = fold 0; empty when nonexistent).
+    """
+    status: str
+    candidates: Tuple[datetime, ...]
+
+
+class TransitionTable:
+    """
+    UTC-offset history of one zone as sorted arrays.
+    Period j has offset offsets[j] and is valid for UTC seconds
+    [trans[j-1], trans[j]); wall_start/wall_end are the same bounds in
+    local wall-clock seconds.
+    """
+
+    def __init__(self, name: str, trans: List[int], offsets: List[int]):
+        self.name = name
+        self.trans = trans
+        self.offsets = offsets
+        bounds = [TABLE_START] + trans + [TABLE_END]
+        self.wall_start = [bounds[j] + offsets[j] for j in range(len(offsets))]
+        self.wall_end = [bounds[j + 1] + offsets[j] for j in range(len(offsets))]
+        self._wall_start = np.array(self.wall_start, dtype=np.int64)
+        self._wall_end = np.array(self.wall_end, dtype=np.int64)
+        self._offsets = np.array(offsets, dtype=np.int64)
+
+    def covers(self, local_seconds: int) -> bool:
+        return self.wall_start[0] <= local_seconds < self.wall_end[-1]
+
+    def resolve(self, local_seconds: int) -> Tuple[int, ...]:
+        """UTC seconds candidates for a wall time (0, 1 or 2 of them)."""
+        j = bisect_right(self.wall_start, local_seconds) - 1
+        out: List[int] = []
+        if j > 0 and local_seconds < self.wall_end[j - 1]:
+            out.append(local_seconds - self.offsets[j - 1])
+        if j >= 0 and local_seconds < self.wall_end[j]:
+            out.append(local_seconds - self.offsets[j])
+        return tuple(out)
+
+    def resolve_array(self, local_seconds: np.ndarray, fold: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized resolve. Returns (utc_seconds, status); ambiguous rows take
+        the candidate selected by fold, nonexistent rows get utc_seconds = 0.
+        """
+        local = np.asarray(local_seconds, dtype=np.int64)
+        j = np.searchsorted(self._wall_start, local, side="right") - 1
+        j_safe = np.clip(j, 0, len(self._offsets) - 1)
+        prev = np.clip(j - 1, 0, len(self._offsets) - 1)
+
+        in_cur = (j >= 0) & (local < self._wall_end[j_safe])
+        in_prev = (j > 0) & (local < self._wall_end[prev])
+
+        status = np.full(local.shape, STATUS_NONEXISTENT, dtype=np.int8)
+        status[in_cur | in_prev] = STATUS_OK
+        status[in_cur & in_prev] = STATUS_AMBIGUOUS
+
+        use_prev = in_prev & (~in_cur | (fold == 0))
+        offset = np.where(use_prev, self._offsets[prev], self._offsets[j_safe])
+        utc = np.where(status == STATUS_NONEXISTENT, 0, local - offset)
+        return utc, status
+
+
+_zones: Dict[str, tzinfo] = {"UTC": UTC}
+_tables: Dict[str, TransitionTable] = {}
+_lock = threading.Lock()
+
+
+def get_zone(name: str) -> tzinfo:
+    """Validated, cached zone object. Raises ValueError for unknown names."""
+    zone = _zones.get(name)
+    if zone is not None:
+        return zone
+    try:
+        zone = ZoneInfo(name)
+    except Exception as e:
+        raise ValueError(f"Invalid timezone '{name}'. Expected IANA tz like 'Asia/Kolkata'.") from e
+    with _lock:
+        _zones[name] = zone
+    return zone
+
+
+def compile_zone(name: str) -> TransitionTable:
+    """
+    Build (or return) the transition table for a zone by scanning its UTC
+    offset day by day and bisecting each change to the second.
+    """
+    table = _tables.get(name)
+    if table is not None:
+        return table
+
+    zone = get_zone(name)
+
+    def offset_at(ts: int) -> int:
+        return int(datetime.fromtimestamp(ts, zone).utcoffset().total_seconds())
+
+    trans: List[int] = []
+    offsets = [offset_at(TABLE_START)]
+    lo = TABLE_START
+    while lo < TABLE_END:
+        hi = min(lo + _DAY, TABLE_END)
+        off_hi = offset_at(hi)
+        if off_hi != offsets[-1]:
+            a, b = lo, hi  # offset changes in (a, b]
+            while b - a > 1:
+                mid = (a + b) // 2
+                if offset_at(mid) == offsets[-1]:
+                    a = mid
+                else:
+                    b = mid
+            trans.append(b)
+            offsets.append(off_hi)
+        lo = hi
+
+    table = TransitionTable(name, trans, offsets)
+    with _lock:
+        _tables[name] = table
+    return table
+
+
+def warm_timezones() -> None:
+    """Validate and compile HOT_ZONES (call once at startup)."""
+    for name in HOT_ZONES:
+        compile_zone(name)
+
+
+def _local_seconds(local_naive: datetime) -> int:
+    # birth times carry no sub-second part
+    return (local_naive - _EPOCH) // timedelta(seconds=1)
+
+
+def resolve_local(local_naive: datetime, tz_name: str) -> LocalTimeResolution:
+    """Map a naive wall time in tz_name to its UTC candidates."""
+    zone = get_zone(tz_name)
+
+    table = _tables.get(tz_name)
+    local_s = _local_seconds(local_naive)
+    if table is not None and table.covers(local_s):
+        candidates = tuple(datetime.fromtimestamp(s, UTC) for s in table.resolve(local_s))
+    else:
+        # zoneinfo path: a wall time is valid under an offset iff it round-trips
+        candidates_set = []
+        for fold in (0, 1):
+            off = local_naive.replace(tzinfo=zone, fold=fold).utcoffset()
+            utc = (local_naive - off).replace(tzinfo=UTC)
+            if utc.astimezone(zone).replace(tzinfo=None) == local_naive and utc not in candidates_set:
+                candidates_set.append(utc)
+        candidates = tuple(sorted(candidates_set))
+
+    if len(candidates) == 1:
+        return LocalTimeResolution("ok", candidates)
+    if len(candidates) == 2:
+        return LocalTimeResolution("ambiguous", candidates)
+    return LocalTimeResolution("nonexistent", ())
+
+
+def local_to_utc(local_naive: datetime, tz_name: str, fold: Optional[int] = None) -> datetime:
+    """
+    Convert a naive wall time to an aware UTC datetime.
+    Raises AmbiguousLocalTimeError (unless fold is given) for DST folds and
+    NonexistentLocalTimeError for DST gaps.
+    """
+    res = resolve_local(local_naive, tz_name)
+    if res.status == "ok":
+        return res.candidates[0]
+    if res.status == "ambiguous":
+        if fold in (0, 1):
+            return res.candidates[fold]
+        a, b = res.candidates
+        raise AmbiguousLocalTimeError(
+            f"Ambiguous local time {local_naive.isoformat()} in '{tz_name}' (DST fold): "
+            f"it occurs at {a.isoformat()} and {b.isoformat()}. Pass fold=0 for the earlier or fold=1 for the later."
+        )
+    raise NonexistentLocalTimeError(
+        f"Nonexistent local time {local_naive.isoformat()} in '{tz_name}': "
+        f"skipped by a DST transition. Check the birth time."
+    )
+
+
+def local_to_utc_seconds(
+    local_naive: np.ndarray, tz_name: str, fold: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bulk form: datetime64 wall times (or int64 local epoch seconds) in one
+    zone -> (UTC epoch seconds, status codes). Compiles the zone if needed;
+    rows outside the compiled range are reported nonexistent.
+    """
+    arr = np.asarray(local_naive)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        arr = arr.astype("datetime64[s]").astype(np.int64)
+    return compile_zone(tz_name).resolve_array(arr, fold=fold)
@@ -0,0 +1,164 @@
+"""
+Divisional charts (vargas)
+Pure functions of sidereal longitudes: no Swiss Ephemeris calls. Every varga
+is a (12 signs x N parts) lookup table built once at import (Parashari
+rules), so any set of vargas for any number of bodies/charts is one
+vectorized gather per varga.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from .schemas import VedicChart
+from .chart import PLANET_COLUMNS, SIGNS, ChartBatch
+
+VARGA_NAMES: Dict[int, str] = {
+    1: "Rasi",
+    2: "Hora",
+    3: "Drekkana",
+    4: "Chaturthamsa",
+    7: "Saptamsa",
+    9: "Navamsa",
+    10: "Dasamsa",
+    12: "Dwadasamsa",
+    16: "Shodasamsa",
+    20: "Vimsamsa",
+    24: "Chaturvimsamsa",
+    27: "Bhamsa",
+    30: "Trimsamsa",
+    40: "Khavedamsa",
+    45: "Akshavedamsa",
+    60: "Shashtiamsa",
+}
+DEFAULT_VARGAS = (9, 10)
+# Attached to both charts in compatibility responses
+COMPATIBILITY_VARGAS = (9,)
+
+# Column order of bulk results: Ascendant first, then the chart planets
+VARGA_BODIES = ("Ascendant",) + tuple(PLANET_COLUMNS)
+
+# Trimsamsa (D30) is unequal: (end degree, sign index) per part. All its
+# boundaries are whole degrees, so it is tabulated on a 1-degree grid.
+_TRIMSAMSA_ODD = ((5, 0), (10, 10), (18, 8), (25, 2), (30, 6))    # Ar, Aq, Sg, Ge, Li
+_TRIMSAMSA_EVEN = ((5, 1), (12, 5), (20, 11), (25, 9), (30, 7))   # Ta, Vi, Pi, Cp, Sc
+
+
+def _first_part_sign(n: int, s: int) -> int:
+    """Sign of part 0 of sign s in the D-n chart (parts then advance one sign each)."""
+    odd = s % 2 == 0          # Aries (index 0) is an odd sign
+    modality = s % 3          # 0 movable, 1 fixed, 2 dual
+    if n == 1:
+        return s
+    if n in (9, 27):
+        return (s * n) % 12   # continuous count from Aries
+    if n == 7:
+        return s if odd else (s + 6) % 12   # even signs start from the 7th
+    if n == 10:
+        return s if odd else (s + 8) % 12   # even signs start from the 9th
+    if n in (12, 60):
+        return s
+    if n == 40:
+        return 0 if odd else 6              # Aries / Libra
+    if n in (16, 45):
+        return (0, 4, 8)[modality]     # Aries / Leo / Sagittarius
+    if n == 20:
+        return (0, 8, 4)[modality]     # Aries / Sagittarius / Leo
+    if n == 24:
+        return 4 if odd else 3         # Leo / Cancer
+    raise ValueError(f"Unsupported varga D{n}")
+
+
+def _build_table(n: int) -> np.ndarray:
+    """(12, parts) int8 table: varga sign index for (rasi sign, part)."""
+    if n == 30:
+        table = np.empty((12, 30), dtype=np.int8)
+        for s in range(12):
+            rules = _TRIMSAMSA_ODD if s % 2 == 0 else _TRIMSAMSA_EVEN
+            for deg in range(30):
+                table[s, deg] = next(sign for end, sign in rules if deg < end)
+        return table
+
+    table = np.empty((12, n), dtype=np.int8)
+    for s in range(12):
+        for part in range(n):
+            if n == 2:
+                # Hora: odd signs Sun (Leo) then Moon (Cancer), even signs the reverse
+                table[s, part] = (4, 3)[part] if s % 2 == 0 else (3, 4)[part]
+            elif n == 3:
+                table[s, part] = (s + 4 * part) % 12   # 1st, 5th, 9th
+            elif n == 4:
+                table[s, part] = (s + 3 * part) % 12   # 1st, 4th, 7th, 10th
+            else:
+                table[s, part] = (_first_part_sign(n, s) + part) % 12
+    return table
+
+
+VARGA_TABLES: Dict[int, np.ndarray] = {n: _build_table(n) for n in VARGA_NAMES}
+
+
+def _check_divisions(divisions: Sequence[int]) -> List[int]:
+    divisions = list(divisions)
+    for n in divisions:
+        if n not in VARGA_TABLES:
+            raise ValueError(
+                f"Unsupported varga D{n}. Expected one of {', '.join(f'D{k}' for k in VARGA_NAMES)}"
+            )
+    return divisions
+
+
+def varga_signs(lons: np.ndarray, divisions: Sequence[int] = DEFAULT_VARGAS) -> np.ndarray:
+    """
+    Varga sign indexes (0..11) for sidereal longitudes of any shape.
+    Returns int8 array of shape lons.shape + (len(divisions),).
+    """
+    divisions = _check_divisions(divisions)
+    lon = np.asarray(lons, dtype=np.float64) % 360.0
+    sign = np.minimum(lon // 30.0, 11).astype(np.intp)
+    deg = lon - sign * 30.0
+
+    out = np.empty(lon.shape + (len(divisions),), dtype=np.int8)
+    for j, n in enumerate(divisions):
+        table = VARGA_TABLES[n]
+        parts = table.shape[1]
+        part = np.minimum((deg * (parts / 30.0)).astype(np.intp), parts - 1)
+        out[..., j] = table[sign, part]
+    return out
+
+
+def _labelled(signs: np.ndarray, divisions: Sequence[int]) -> Dict[str, Dict[str, Any]]:
+    """(n_bodies, k) sign indexes for VARGA_BODIES -> {"D9": {...}, ...}."""
+    idx = signs.tolist()
+    return {
+        f"D{n}": {
+            "name": VARGA_NAMES[n],
+            "ascendant": SIGNS[idx[0][j]],
+            "planets": {body: SIGNS[row[j]] for body, row in zip(VARGA_BODIES[1:], idx[1:])},
+        }
+        for j, n in enumerate(divisions)
+    }
+
+
+def chart_vargas(chart: VedicChart, divisions: Sequence[int] = DEFAULT_VARGAS) -> Dict[str, Dict[str, Any]]:
+    """Requested vargas of one chart: {"D9": {"name", "ascendant", "planets": {name: sign}}}."""
+    lons = [chart.ascendant.lon_sidereal] + [p.lon for p in chart.planets]
+    return _labelled(varga_signs(np.array(lons), divisions), divisions)
+
+
+def batch_vargas(batch: ChartBatch, divisions: Sequence[int] = DEFAULT_VARGAS) -> np.ndarray:
+    """(n_charts, len(VARGA_BODIES), len(divisions)) sign indexes for a ChartBatch."""
+    lons = np.concatenate([batch.asc_lon[:, None], batch.lon], axis=1)
+    return varga_signs(lons, divisions)
+
+
+def stored_chart_vargas(
+    charts: Sequence[Dict[str, Any]], divisions: Sequence[int] = DEFAULT_VARGAS
+) -> List[Dict[str, Dict[str, Any]]]:
+    """Vargas for serialized charts (VedicChart.to_dict(), e.g. birth_charts.chart_data) in one pass."""
+    lons = np.array([
+        [c["ascendant"]["lon_sidereal"]] + [p["lon"] for p in c["planets"]]
+        for c in charts
+    ], dtype=np.float64).reshape(len(charts), len(VARGA_BODIES))
+    signs = varga_signs(lons, divisions)
+    return [_labelled(signs[i], divisions) for i in range(len(charts))]
@@ -35,7 +35,8 @@ export function getForwardHeaders(request: NextRequest) {
     const keysToForward = [
         "authorization",
         "x-vercel-protection-bypass",
-        "x-vercel-auth"
+        "x-vercel-auth",
+        "if-none-match" // lets the backend answer a repeat /chart or /compatibility with 304
     ];
 
     keysToForward.forEach(key => {
@@ -61,3 +62,18 @@ export function getForwardHeaders(request: NextRequest) {
 
     return headers;
 }
+
+/**
+ * Caching headers of a backend response (ETag, Cache-Control, Server-Timing)
+ * to pass through the proxy, so browsers and the edge can revalidate.
+ */
+export function getCacheHeaders(response: Response) {
+    const headers: Record<string, string> = {};
+    ["etag", "cache-control", "server-timing"].forEach(key => {
+        const val = response.headers.get(key);
+        if (val) {
+            headers[key] = val;
+        }
+    });
+    return headers;
+}
@@ -9,6 +9,7 @@ export interface BirthInput {
     lat: number; // Latitude
     lon: number; // Longitude
     city?: string; // Optional display name
+    fold?: 0 | 1; // Earlier/later instant when a DST change repeats the local time
 }
 
 // Planet position in chart
@@ -31,6 +32,21 @@ export interface Ascendant {
     lon_tropical: number;
 }
 
+// Vimshottari dasha period (dates are YYYY-MM-DD, UTC)
+export interface DashaPeriod {
+    level: 'mahadasha' | 'antardasha' | 'pratyantardasha';
+    lord: string;
+    start: string;
+    end: string;
+}
+
+// Divisional chart (sign per body)
+export interface VargaChart {
+    name: string;
+    ascendant: string;
+    planets: Record<string, string>;
+}
+
 // Full Vedic chart
 export interface VedicChart {
     name: string;
@@ -46,6 +62,12 @@ export interface VedicChart {
         pada: number;
     };
     planets: PlanetPosition[];
+    dasha?: {
+        system: 'vimshottari';
+        balance_at_birth_years: number;
+        mahadashas: DashaPeriod[];
+    };
+    vargas?: Record<string, VargaChart>; // keyed "D9", "D10", ...
     insights?: string; // AI-generated summary
 }
 
@@ -116,6 +138,7 @@ export interface ChartRequest {
     birth: BirthInput;
     high_precision?: boolean;
     use_true_node?: boolean;
+    vargas?: number[]; // divisional charts to include (default [9, 10])
 }
 
 // Health check response